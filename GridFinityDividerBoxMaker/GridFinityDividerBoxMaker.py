@@ -2,32 +2,38 @@
 #Description- Make gridfinity divider boxes
 
 import math
+import os
+import time
+from collections import namedtuple
 from typing import Tuple
 import adsk.core, adsk.fusion, adsk.cam, traceback
 
-# Foot is 6mm high
-#
-defaultBoxName = "Box"
-defaultSlotsWide = 2
-defaultSlotsDeep = 2
-
-# Miles'
-#
-defaultSlotsHigh = 1.31
-
-# 52" Husky case 
-#
-defaultSlotsHigh = 1.45
-
-# 62" Husky case 
-#
-# defaultSlotsHigh = 1.25
-
-defaultDividerCount = 0
-defaultBaseOnly = False
-defaultIncludeScoop = True
-defaultIncludeLedge = True
-defaultIncludeMagnets = False
+from .boxspec import (SCALE, magnetDiameter, magnetThickness, baseCornerRadius, baseLip, slotDimension, nestingDepth,
+                      nestingRimWidth, nestingClearance, wallThickness, holeOffset, ledgeOffset, ledgeDepth, ledgeAngle,
+                      nestingVerticalClearance, cornerVerticalOffset, innerWallInset, floorHeight, dividerPositions,
+                      defaultBoxName, defaultSlotsWide, defaultSlotsDeep, defaultSlotsHigh, defaultDividerCount,
+                      defaultDividerCountDeep, defaultBaseOnly, defaultIncludeScoop, defaultIncludeLedge, defaultIncludeMagnets,
+                      minSlotsHigh, maxSlotsHigh)
+from .boxplan import (PATTERN_BASE, SLAB_BASE, Line, Arc, Circle, Rectangle, Sketch, Extrude, Sweep, Pattern, Fillet, RenameBody,
+                      FootCell, HighestEdge, EdgeAtHeight, boxPlan, draftPlan, footCellPlan, footCellSettings, stepName)
+from .boxcheck import boxProblems
+from .buildlog import BuildLog
+from .fusionutil import (createComponent, parameterHash, shapeHash, tagComponent, reuseComponent, close, TopologyIndex,
+                         StaleBuild, InputDebouncer)
+
+# NumPy isn't part of Fusion's own Python; without it previews fall back to a B-Rep draft
+try:
+    from .boxmesh import boxMesh
+    from .meshbuild import flatBuffers
+except ImportError:
+    boxMesh = None
+
+defaultBaseBuilder = 'pattern'
+defaultEngine = 'features'
+defaultFullPreview = False
+defaultMeshPreview = True
+defaultFastBuild = False
+defaultProfileBuild = False
 
 # global set of event handlers to keep them referenced for the duration of the command
 handlers = []
@@ -37,38 +43,52 @@ if app:
 
 newComp = None
 
-# Why?
-SCALE = 0.1
+# Set while building in fast mode, see createSketch
+deferSketchCompute = False
+
+patternBaseLabel = 'Pattern and Combine'
+slabBaseLabel = 'Tapered Cells (no pattern)'
+featureEngineLabel = 'Timeline Features'
+transientEngineLabel = 'Transient B-Rep (batch)'
 
-magnetDiameter = 6.5 * SCALE * 0.75
-magnetThickness = 2.5 * SCALE * 0.75
+# Every build is logged here, one JSON object per line; profiles go in the directory below it
+buildLogPath = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'build-log.jsonl')
+profileDirectory = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'profiles')
 
-# Sizes!
-baseCornerRadius = 4 * SCALE
-baseLip = .8 * SCALE
-slotDimension = 42 * SCALE
-nestingDepth = 5 * SCALE
-nestingRimWidth = 2.4 * SCALE
-nestingClearance = .25 * SCALE
-wallThickness = 1.2 * SCALE
-holeOffset = 8 * SCALE
-ledgeOffset = 0.2 * SCALE
+# Spinner drags fire a preview per step; only rebuild once the inputs have been quiet this long
+debounceDelay = 0.3
+debounceEventId = 'GridfinityDividerBoxDebounce'
 
-# Derived sizes
-nestingVerticalClearance = nestingClearance * 1.416  # Empirically determined from original sketch
+# Ways of building the whole box
+FEATURE_ENGINE = 'features'
+TRANSIENT_ENGINE = 'transient'
 
 # Consts
 CUT = adsk.fusion.FeatureOperations.CutFeatureOperation
 JOIN = adsk.fusion.FeatureOperations.JoinFeatureOperation
 NEW_BODY = adsk.fusion.FeatureOperations.NewBodyFeatureOperation
 
-def createComponent(design: adsk.fusion.Design, name: str) -> adsk.fusion.Component:
-    rootComp = design.rootComponent
-    allOccs = rootComp.occurrences
-    newOcc = allOccs.addNewComponent(adsk.core.Matrix3D.create())
-    comp = newOcc.component
-    comp.name = name
-    return comp
+# The attribute group boxes are tagged in; see tagComponent()
+attributeGroup = 'GridFinityDividerBoxMaker'
+
+# The foot cell body from the design's hidden library component, built the first time it's wanted.
+# Building it adds features of its own, so it can't happen while a base feature is being edited.
+footCellAttribute = 'footCell'
+
+def libraryFootCell(design: adsk.fusion.Design, includeMagnets: bool) -> adsk.fusion.BRepBody:
+    hash = parameterHash(footCellSettings(includeMagnets))
+    for attribute in design.findAttributes(attributeGroup, footCellAttribute):
+        comp = adsk.fusion.Component.cast(attribute.parent)
+        if attribute.value == hash and comp and comp.bRepBodies.count > 0:
+            return comp.bRepBodies.item(0)
+
+    occurrence = design.rootComponent.occurrences.addNewComponent(adsk.core.Matrix3D.create())
+    occurrence.isLightBulbOn = False
+    comp = occurrence.component
+    comp.name = 'Gridfinity Foot (Magnets)' if includeMagnets else 'Gridfinity Foot'
+    body = PlanExecutor(comp, lambda name='', body=None: None).run(footCellPlan(includeMagnets))
+    comp.attributes.add(attributeGroup, footCellAttribute, hash)
+    return body
 
 def createPoint(x: float, y: float, z: float) -> adsk.core.Point3D:
     return adsk.core.Point3D.create(x, y, z)
@@ -82,92 +102,20 @@ def createDistance(d) -> adsk.core.ValueInput:
 def createReal(r) -> adsk.core.ValueInput:
     return adsk.core.ValueInput.createByReal(r)
 
-def close(a, b):
-    return abs(a - b) < 1e-5 * SCALE
-
-
-def createBaseRectSketch(component: adsk.fusion.Component) -> adsk.fusion.Profile:
-    base_sketch = component.sketches.add(component.xZConstructionPlane)
-    base_sketch.name = "Base Sketch"
-    p0 = create2DPoint(0, 0)
-    p1 = create2DPoint(slotDimension, slotDimension)
-    base_rect = base_sketch.sketchCurves.sketchLines.addTwoPointRectangle(p0, p1)
-    # FIXME: there must be a better way!
-    base_rect_profile = base_sketch.profiles.item(0)
-    return base_rect_profile
-
-def createMagnetHolesSketch(component: adsk.fusion.Component) -> adsk.core.ObjectCollection:
-    sketch: adsk.fusion.Sketch = component.sketches.add(component.xZConstructionPlane)
-    sketch.name = "Magnet Holes Sketch"
-    sketch.sketchCurves.sketchCircles.addByCenterRadius(createPoint(holeOffset, holeOffset, 0), magnetDiameter / 2.)
-    sketch.sketchCurves.sketchCircles.addByCenterRadius(createPoint(slotDimension - holeOffset, holeOffset, 0), magnetDiameter / 2.)
-    sketch.sketchCurves.sketchCircles.addByCenterRadius(createPoint(slotDimension - holeOffset, slotDimension - holeOffset, 0), magnetDiameter / 2.)
-    sketch.sketchCurves.sketchCircles.addByCenterRadius(createPoint(holeOffset, slotDimension - holeOffset, 0), magnetDiameter / 2.)
-
-    circles = adsk.core.ObjectCollection.create()
-    for n in range(4):
-        circles.add(sketch.profiles.item(n))
-
-    return circles
-
-def createCurvedRect(component: adsk.fusion.Component, name, width: float, depth: float, radius: float, z: float) -> Tuple[adsk.core.ObjectCollection, adsk.fusion.Profile]:
-    path = adsk.core.ObjectCollection.create()
-    sketch: adsk.fusion.Sketch = component.sketches.add(component.xZConstructionPlane)
+
+# Curves added to a sketch made here don't trigger a solve until its profiles are needed
+def createSketch(component: adsk.fusion.Component, plane, name: str) -> adsk.fusion.Sketch:
+    sketch = component.sketches.add(plane)
     sketch.name = name
-    lines = sketch.sketchCurves.sketchLines
-    p = lambda x, y: createPoint(x, y , z)
-
-    p0 = p(radius, 0)
-    p1 = p(width - radius, 0)
-    l0 = lines.addByTwoPoints(p0, p1)
-    p2 = p(width, radius)
-    p3 = p(width, depth - radius)
-    l1 = lines.addByTwoPoints(p2, p3)
-    p4 = p(width - radius, depth)
-    p5 = p(radius, depth)
-    l2 = lines.addByTwoPoints(p4, p5)
-    p6 = p(0, depth - radius)
-    p7 = p(0, radius)
-    l3 = lines.addByTwoPoints(p6, p7)
-
-    arcs = sketch.sketchCurves.sketchArcs
-
-    p7c = p(radius, radius)
-    a0 = arcs.addByCenterStartSweep(p7c, p7, math.pi / 2)
-    # FIXME: you'd've thought all these merges made a single thing. You'd be wrong.
-    # The arcs end up joined to the lines they were started on but the merges do nothing.
-    #a0.endSketchPoint.merge(l0.startSketchPoint)
-    #path.add(a0)
-    p1c = p(width - radius, radius)
-    a1 = arcs.addByCenterStartSweep(p1c, p1, math.pi / 2)
-    #a1.endSketchPoint.merge(l1.startSketchPoint)
-    #path.add(a1)
-    p3c = p(width - radius, depth - radius)
-    a2 = arcs.addByCenterStartSweep(p3c, p3, math.pi / 2)
-    #a2.endSketchPoint.merge(l2.startSketchPoint)
-    #path.add(a2)
-    p5c = p(radius, depth - radius)
-    a3 = arcs.addByCenterStartSweep(p5c, p5, math.pi / 2)
-    #a3.endSketchPoint.merge(l3.startSketchPoint)
-    #path.add(a3)
-
-    # These have to be in exactly the right order
-    path.add(l3)
-    path.add(a3)
-    path.add(l2)
-    path.add(a2)
-    path.add(l1)
-    path.add(a1)
-    path.add(l0)
-    path.add(a0)
-
-    # FIXME: not actually a path
-    return path, sketch.profiles.item(0)
-
-
-def createBaseSweepSketch(component: adsk.fusion.Component) -> adsk.core.ObjectCollection:
-    b, _ = createCurvedRect(component,  "Base Sweep Sketch", slotDimension, slotDimension, baseCornerRadius, 0)
-    return b
+    if deferSketchCompute:
+        sketch.isComputeDeferred = True
+    return sketch
+
+# Profiles only exist once the sketch has been computed
+def computedProfiles(sketch: adsk.fusion.Sketch) -> adsk.fusion.Profiles:
+    if deferSketchCompute:
+        sketch.isComputeDeferred = False
+    return sketch.profiles
 
 # Note that this attempts to combins the new bodies with the original to give a single body - this only works if they touch
 def rectPattern(body: adsk.fusion.BRepBody, wide: int, deep: int, dim: float) -> adsk.fusion.RectangularPatternFeature:
@@ -198,119 +146,432 @@ def rectPattern(body: adsk.fusion.BRepBody, wide: int, deep: int, dim: float) ->
 
     return pattern
 
-def createRimSketch(component: adsk.fusion.Component, slotsHigh) -> adsk.fusion.Profile:
-    cornerVerticalOffset = nestingClearance * .416  # Empirically determined from existing sketch
-    sketch = component.sketches.add(component.xYConstructionPlane)
-    sketch.name = "Rim Sketch"
-    lines = sketch.sketchCurves.sketchLines
-    h = -slotDimension / 2
-    p = lambda x, y: createPoint(x, y , h)
-
-    p0 = p(0, slotsHigh * slotDimension)
-    p1 = p(0, slotsHigh * slotDimension + nestingDepth - nestingVerticalClearance)
-    lines.addByTwoPoints(p0, p1)
-    p2 = p(nestingRimWidth - nestingVerticalClearance, slotsHigh * slotDimension + nestingDepth - nestingRimWidth - cornerVerticalOffset)
-    lines.addByTwoPoints(p1, p2)
-    p3 = p(nestingRimWidth - nestingVerticalClearance, slotsHigh * slotDimension + baseLip - cornerVerticalOffset)
-    lines.addByTwoPoints(p2, p3)
-    p4 = p(nestingRimWidth + baseLip - nestingVerticalClearance, slotsHigh * slotDimension)
-    lines.addByTwoPoints(p3, p4)
-    lines.addByTwoPoints(p4, p0)
-
-    return sketch.profiles.item(0)
-
-def createIndentSketch(component: adsk.fusion.Component, slotsHigh) -> adsk.fusion.Profile:
-    sketch = component.sketches.add(component.xYConstructionPlane)
-    sketch.name = "Indent Sketch"
-    lines = sketch.sketchCurves.sketchLines
-    h = -slotDimension / 2
-    p = lambda x, y: createPoint(x, y , h)
-
-    # Note that this is wallThickness below p4 in createRimSketch
-    x = nestingRimWidth + baseLip - nestingVerticalClearance
-    p0 = p(x, slotsHigh * slotDimension - wallThickness)
-    p1 = p(x - wallThickness, slotsHigh * slotDimension - 2 * wallThickness)
-    lines.addByTwoPoints(p0, p1)
-    p2 = p(x - wallThickness, nestingDepth + wallThickness + 1 * SCALE)
-    # FIXME: fillet this edge
-    lines.addByTwoPoints(p1, p2)
-    p3 = p(x, nestingDepth + wallThickness + 1 * SCALE)
-    lines.addByTwoPoints(p2, p3)
-    lines.addByTwoPoints(p3, p0)
-
-    return sketch.profiles.item(0)
-
-def createLedgeSketch(component: adsk.fusion.Component, slotsHigh) -> adsk.fusion.Profile:
-    angle = 54
-
-    sketch: adsk.fusion.Sketch = component.sketches.add(component.yZConstructionPlane)
-    sketch.name = "Ledge Sketch"
-    lines = sketch.sketchCurves.sketchLines
-    h = wallThickness
-    p = lambda x, y: createPoint(x, y , h)
-
-    y = slotDimension * slotsHigh - ledgeOffset
-    p0 = p(wallThickness, y)
-    p1 = p(wallThickness + 16 * SCALE, y)
-    lines.addByTwoPoints(p0, p1)
-    d = math.sin(angle * math.pi / 180) * 16 * SCALE
-    p2 = p(wallThickness, y - d)
-    lines.addByTwoPoints(p1, p2)
-    lines.addByTwoPoints(p2, p0)
-
-    return sketch.profiles.item(0)
-    
-def createDividerSketch(component: adsk.fusion.Component, pos: float, slotsHigh, slotsDeep) -> adsk.fusion.Profile:
-    sketch: adsk.fusion.Sketch = component.sketches.add(component.yZConstructionPlane)
-    lines = sketch.sketchCurves.sketchLines
-    p = lambda x, y: createPoint(x, y, pos)
-
-    p0 = p(0, nestingDepth)
-    p1 = p(slotsDeep * slotDimension, nestingDepth)
-    lines.addByTwoPoints(p0, p1)
-    p2 = p(slotsDeep * slotDimension, slotsHigh * slotDimension - ledgeOffset)
-    lines.addByTwoPoints(p1, p2)
-    p3 = p(0, slotsHigh * slotDimension - ledgeOffset)
-    lines.addByTwoPoints(p2, p3)
-    lines.addByTwoPoints(p3, p0)
-
-    return sketch.profiles.item(0)    
+# Some of a body's faces and their edges, for a TopologyIndex that only looks at those. Edges
+# two of the faces share are there twice.
+MadeFaces = namedtuple('MadeFaces', 'faces edges')
+
+# Replays a build plan (see boxplan.py) against a component. Each sketch's curves are drawn a kind
+# at a time. Queries look at the faces of the features they name, dropped between stages, and then
+# only at the edges of the faces that reach the height they want, so the cost of a query doesn't
+# grow with the number of feet.
+
+# A TopologyIndex of the edges of some faces
+def edgeIndex(faces: list) -> 'TopologyIndex':
+    return TopologyIndex(MadeFaces(faces, [edge for face in faces for edge in face.edges]))
+
+class PlanExecutor:
+    def __init__(self, component: adsk.fusion.Component, stageDone, baseFeature: adsk.fusion.BaseFeature = None):
+        self.component = component
+        self.features = component.features
+        self.stageDone = stageDone
+        self.baseFeature = baseFeature
+        self.planes = {}
+        self.curves = {}
+        self.profiles = {}
+        self.paths = {}
+        self.body = None
+        self.bodyName = None
+        self.lastFeature = None
+        # Features by the sketch they were made from, and indexes of their faces
+        self.made = {}
+        self.madeIndexes = {}
+
+    def run(self, plan) -> adsk.fusion.BRepBody:
+        for step in plan:
+            if isinstance(step, Sketch):
+                self.drawSketch(step)
+                continue
+            if isinstance(step, RenameBody):
+                self.body.name = step.name
+                continue
+
+            if isinstance(step, FootCell):
+                self.footCell(step)
+            elif isinstance(step, Extrude):
+                self.lastFeature = self.extrude(step)
+                if isinstance(step.profiles, str):
+                    self.made[step.profiles] = self.lastFeature
+            elif isinstance(step, Sweep):
+                self.lastFeature = self.sweep(step)
+                self.made[step.profile] = self.lastFeature
+            elif isinstance(step, Pattern):
+                self.lastFeature = rectPattern(self.body, step.wide, step.deep, step.spacing)
+            elif isinstance(step, Fillet):
+                self.lastFeature = self.fillet(step)
+            else:
+                raise ValueError('Unknown plan step {}'.format(step))
+
+            self.madeIndexes.clear()
+            self.stageDone(stepName(step), self.body)
+
+        return self.body
+
+    def plane(self, name: str):
+        if name not in self.planes:
+            self.planes[name] = getattr(self.component, name + 'ConstructionPlane')
+        return self.planes[name]
+
+    def drawSketch(self, step: Sketch):
+        sketch = createSketch(self.component, self.plane(step.plane), step.name)
+        curves = sketch.sketchCurves
+        drawn = [None] * len(step.curves)
+        kinds = {}
+        for n, curve in enumerate(step.curves):
+            kinds.setdefault(type(curve), []).append(n)
+
+        # Neighbouring curves share their ends, and so can share the points made for them
+        points = {}
+        def point(x: float, y: float, z: float) -> adsk.core.Point3D:
+            if (x, y, z) not in points:
+                points[(x, y, z)] = adsk.core.Point3D.create(x, y, z)
+            return points[(x, y, z)]
+
+        if Line in kinds or Rectangle in kinds:
+            lines = curves.sketchLines
+            for n in kinds.get(Line, []):
+                drawn[n] = lines.addByTwoPoints(point(*step.curves[n].start), point(*step.curves[n].end))
+            for n in kinds.get(Rectangle, []):
+                drawn[n] = lines.addTwoPointRectangle(point(*step.curves[n].corner), point(*step.curves[n].opposite))
+        if Arc in kinds:
+            arcs = curves.sketchArcs
+            for n in kinds[Arc]:
+                arc = step.curves[n]
+                drawn[n] = arcs.addByCenterStartSweep(point(*arc.centre), point(*arc.start), arc.sweep)
+        if Circle in kinds:
+            circles = curves.sketchCircles
+            for n in kinds[Circle]:
+                drawn[n] = circles.addByCenterRadius(point(*step.curves[n].centre), step.curves[n].radius)
+
+        profiles = adsk.core.ObjectCollection.create()
+        for profile in computedProfiles(sketch):
+            profiles.add(profile)
+
+        self.curves[step.name] = drawn
+        self.profiles[step.name] = profiles
+
+    def path(self, name: str) -> adsk.fusion.Path:
+        if name not in self.paths:
+            curves = adsk.core.ObjectCollection.create()
+            for curve in self.curves[name]:
+                curves.add(curve)
+            self.paths[name] = self.features.createPath(curves)
+        return self.paths[name]
+
+    def extrude(self, step: Extrude) -> adsk.fusion.ExtrudeFeature:
+        profiles = self.profiles[step.profiles]
+
+        operation = getattr(adsk.fusion.FeatureOperations, step.operation)
+        extrudes = self.features.extrudeFeatures
+        if step.taper is None:
+            feature = extrudes.addSimple(profiles, createDistance(step.distance), operation)
+        else:
+            extrude_input = extrudes.createInput(profiles, operation)
+            extent = adsk.fusion.DistanceExtentDefinition.create(createDistance(step.distance))
+            extrude_input.setOneSideExtent(extent, adsk.fusion.ExtentDirections.NegativeExtentDirection, createReal(step.taper))
+            feature = extrudes.add(extrude_input)
+
+        if operation == NEW_BODY and self.body is None:
+            self.body = feature.bodies.item(0)
+            self.bodyName = step.bodyName
+            if step.bodyName:
+                self.body.name = step.bodyName
+        # The slab base's top layer makes a body per cell, and the box's join merges them into
+        # whichever one Fusion keeps
+        elif operation == JOIN and not self.body.isValid:
+            self.body = feature.bodies.item(0)
+            if self.bodyName:
+                self.body.name = self.bodyName
+        return feature
+
+    # The foot is copied in as one body, so none of its features are repeated
+    def footCell(self, step: FootCell):
+        foot = adsk.fusion.TemporaryBRepManager.get().copy(libraryFootCell(self.component.parentDesign, step.includeMagnets))
+        self.body = commitTransientBody(self.component, foot, 'Base', self.baseFeature)
+
+    def sweep(self, step: Sweep) -> adsk.fusion.SweepFeature:
+        sweeps = self.features.sweepFeatures
+        operation = getattr(adsk.fusion.FeatureOperations, step.operation)
+        # A sketch with more than one profile sweeps them all at once
+        profiles = self.profiles[step.profile]
+        sweep_input = sweeps.createInput(profiles.item(0) if profiles.count == 1 else profiles, self.path(step.path), operation)
+        return sweeps.add(sweep_input)
+
+    def edges(self, query) -> adsk.core.ObjectCollection:
+        edges = adsk.core.ObjectCollection.create()
+        if isinstance(query, HighestEdge):
+            # It runs along the top of a wall, not across a flat face
+            made = self.madeIndex(query.among).faceExtents()
+            top = max(high[1] for _, _, high in made)
+            edges.add(edgeIndex([face for face, low, high in made if close(high[1], top) and not close(low[1], top)]).highestEdge())
+            return edges
+        if isinstance(query, EdgeAtHeight):
+            # It runs along the bottom of a wall, not across the floor
+            faces = [face for face, low, high in self.madeIndex(query.among).faceExtents()
+                     if close(low[1], query.y) and not close(high[1], query.y) and close(low[2], query.minZ)]
+            for edge in edgeIndex(faces).edgesAtHeight(query.y, minX=query.minX, maxX=query.maxX, minZ=query.minZ):
+                if edges.find(edge) < 0:
+                    edges.add(edge)
+            assert edges.count == 1
+            return edges
+
+        # Only the dividers' own faces need looking at, not the whole body
+        divider_faces = TopologyIndex(self.lastFeature)
+        found = []
+        for pos in query.widthPositions:
+            found += divider_faces.facesAtX(pos) + divider_faces.facesAtX(pos + wallThickness)
+        for pos in query.deepPositions:
+            found += divider_faces.facesAtZ(-pos) + divider_faces.facesAtZ(-(pos + wallThickness))
+        for f in found:
+            for edge in f.edges:
+                # Where dividers cross, neighbouring faces share an edge
+                if edges.find(edge) < 0:
+                    edges.add(edge)
+        return edges
+
+    # A TopologyIndex of the faces the features made from the named sketches
+    def madeIndex(self, names) -> 'TopologyIndex':
+        if names not in self.madeIndexes:
+            self.madeIndexes[names] = TopologyIndex(MadeFaces([face for name in names for face in self.made[name].faces], []))
+        return self.madeIndexes[names]
+
+    # Every edge set in one feature
+    def fillet(self, step: Fillet) -> adsk.fusion.FilletFeature:
+        fillets = self.features.filletFeatures
+        fillet_input = fillets.createInput()
+        for edgeSet in step.edgeSets:
+            fillet_input.addConstantRadiusEdgeSet(self.edges(edgeSet.edges), createDistance(edgeSet.radius), edgeSet.tangentChain)
+        fillet_input.isG2 = False
+        fillet_input.isRollingBallCorner = True
+        return fillets.add(fillet_input)
+
+
+# Transient B-Rep engine: builds the same solid as the feature recipe out of temporary bodies,
+# with the booleans done in memory, and commits it as one body. The cosmetic 0.6mm fillets are
+# left off, so the result matches buildFull() to within that.
+
+def transientBox(x0: float, x1: float, y0: float, y1: float, z0: float, z1: float) -> adsk.fusion.BRepBody:
+    center = createPoint((x0 + x1) / 2, (y0 + y1) / 2, (z0 + z1) / 2)
+    obb = adsk.core.OrientedBoundingBox3D.create(center, adsk.core.Vector3D.create(1, 0, 0), adsk.core.Vector3D.create(0, 1, 0),
+                                                 x1 - x0, y1 - y0, z1 - z0)
+    return adsk.fusion.TemporaryBRepManager.get().createBox(obb)
+
+# A block big enough to stand in for everything on one side of a plane; normal points into it
+def transientHalfSpace(point: Tuple[float, float, float], normal: Tuple[float, float, float], size: float) -> adsk.fusion.BRepBody:
+    length = math.sqrt(sum(c * c for c in normal))
+    n = [c / length for c in normal]
+    a = (0, 0, 1) if abs(n[2]) < 0.9 else (1, 0, 0)
+    u = [n[1] * a[2] - n[2] * a[1], n[2] * a[0] - n[0] * a[2], n[0] * a[1] - n[1] * a[0]]
+    length = math.sqrt(sum(c * c for c in u))
+    u = [c / length for c in u]
+    v = [n[1] * u[2] - n[2] * u[1], n[2] * u[0] - n[0] * u[2], n[0] * u[1] - n[1] * u[0]]
+    center = createPoint(*[point[i] + n[i] * size / 2 for i in range(3)])
+    obb = adsk.core.OrientedBoundingBox3D.create(center, adsk.core.Vector3D.create(*u), adsk.core.Vector3D.create(*v), size, size, size)
+    return adsk.fusion.TemporaryBRepManager.get().createBox(obb)
+
+def transientBoolean(target: adsk.fusion.BRepBody, tool: adsk.fusion.BRepBody, operation) -> adsk.fusion.BRepBody:
+    if not adsk.fusion.TemporaryBRepManager.get().booleanOperation(target, tool, operation):
+        raise Exception('Transient boolean failed')
+    return target
+
+def transientUnion(target: adsk.fusion.BRepBody, tool: adsk.fusion.BRepBody) -> adsk.fusion.BRepBody:
+    return transientBoolean(target, tool, adsk.fusion.BooleanTypes.UnionBooleanType)
+
+def transientDifference(target: adsk.fusion.BRepBody, tool: adsk.fusion.BRepBody) -> adsk.fusion.BRepBody:
+    return transientBoolean(target, tool, adsk.fusion.BooleanTypes.DifferenceBooleanType)
+
+def transientIntersection(target: adsk.fusion.BRepBody, tool: adsk.fusion.BRepBody) -> adsk.fusion.BRepBody:
+    return transientBoolean(target, tool, adsk.fusion.BooleanTypes.IntersectionBooleanType)
+
+def transientTranslate(body: adsk.fusion.BRepBody, x: float, y: float, z: float) -> adsk.fusion.BRepBody:
+    matrix = adsk.core.Matrix3D.create()
+    matrix.translation = adsk.core.Vector3D.create(x, y, z)
+    adsk.fusion.TemporaryBRepManager.get().transform(body, matrix)
+    return body
+
+# The rounded rect of the given footprint (as createCurvedRect draws it at x, with depth running
+# towards -z from z) inset by inset0 at y0 and inset1 at y1, straight or tapered in between. It's
+# what a profile swept around the footprint, or a tapered extrude of it, would leave.
+def transientFrustum(x: float, z: float, width: float, depth: float, y0: float, inset0: float, y1: float, inset1: float) -> adsk.fusion.BRepBody:
+    tbm = adsk.fusion.TemporaryBRepManager.get()
+    r = baseCornerRadius
+    outer = min(inset0, inset1)
+    size = 4 * (width + depth + y1 - y0)
+
+    # The straight sides as two crossing slabs, cut back to the taper if there is one
+    across = transientBox(x + outer, x + width - outer, y0, y1, z - depth + r, z - r)
+    along = transientBox(x + r, x + width - r, y0, y1, z - depth + outer, z - outer)
+    if not close(inset0, inset1):
+        t = (inset1 - inset0) / (y1 - y0)
+        transientIntersection(across, transientHalfSpace((x + inset0, y0, 0), (1, -t, 0), size))
+        transientIntersection(across, transientHalfSpace((x + width - inset0, y0, 0), (-1, -t, 0), size))
+        transientIntersection(along, transientHalfSpace((0, y0, z - depth + inset0), (0, -t, 1), size))
+        transientIntersection(along, transientHalfSpace((0, y0, z - inset0), (0, -t, -1), size))
+    transientUnion(across, along)
+
+    # And a cone (or cylinder) at each corner
+    for cx, cz in [(x + r, z - r), (x + width - r, z - r), (x + width - r, z - depth + r), (x + r, z - depth + r)]:
+        corner = tbm.createCylinderOrCone(createPoint(cx, y0, cz), r - inset0, createPoint(cx, y1, cz), r - inset1)
+        transientUnion(across, corner)
+
+    return across
+
+# Material that rounds a concave edge running along x, in the corner between a floor at y and a
+# wall at z (the wall on the -z side)
+def transientConcaveRound(x0: float, x1: float, y: float, z: float, radius: float) -> adsk.fusion.BRepBody:
+    tbm = adsk.fusion.TemporaryBRepManager.get()
+    fill = transientBox(x0, x1, y, y + radius, z, z + radius)
+    axis = tbm.createCylinderOrCone(createPoint(x0, y + radius, z + radius), radius, createPoint(x1, y + radius, z + radius), radius)
+    return transientDifference(fill, axis)
+
+# Commit a transient body to the component in one step, as a single base feature in parametric designs
+# (or into baseFeature, if one is already being edited)
+def commitTransientBody(component: adsk.fusion.Component, body: adsk.fusion.BRepBody, name: str,
+                        baseFeature: adsk.fusion.BaseFeature = None) -> adsk.fusion.BRepBody:
+    design = component.parentDesign
+    if baseFeature:
+        committed = component.bRepBodies.add(body, baseFeature)
+    elif design.designType == adsk.fusion.DesignTypes.ParametricDesignType:
+        baseFeature = component.features.baseFeatures.add()
+        baseFeature.startEdit()
+        try:
+            committed = component.bRepBodies.add(body, baseFeature)
+        finally:
+            baseFeature.finishEdit()
+    else:
+        committed = component.bRepBodies.add(body)
+    committed.name = name
+    return committed
+
+# Raised at a stage boundary when newer inputs have made the build in progress pointless
+debouncer = InputDebouncer(debounceDelay, debounceEventId)
+
+class BoxCommandInputChangedHandler(adsk.core.InputChangedEventHandler):
+    def __init__(self):
+        super().__init__()
+    def notify(self, args):
+        try:
+            debouncer.touch()
+        except:
+            if ui:
+                ui.messageBox('Failed:\n{}'.format(traceback.format_exc()))
 
-class BoxCommandExecuteHandler(adsk.core.CommandEventHandler):
+class BoxDebounceEventHandler(adsk.core.CustomEventHandler):
+    def __init__(self):
+        super().__init__()
+    def notify(self, args):
+        try:
+            # Anything older than the latest change will be followed by another timer
+            if debouncer.command and args.additionalInfo == str(debouncer.generation):
+                debouncer.command.doExecutePreview()
+        except:
+            if ui:
+                ui.messageBox('Failed:\n{}'.format(traceback.format_exc()))
+
+# Problems with the settings are listed under the inputs as they're made, and OK stays greyed out
+class BoxCommandValidateInputsHandler(adsk.core.ValidateInputsEventHandler):
     def __init__(self):
         super().__init__()
+    def notify(self, args):
+        try:
+            problems = boxFromInputs(args.inputs).problems()
+            message = args.inputs.itemById('problems')
+            message.formattedText = '<br>'.join(problems)
+            message.isVisible = bool(problems)
+            args.areInputsValid = not problems
+        except:
+            if ui:
+                ui.messageBox('Failed:\n{}'.format(traceback.format_exc()))
+
+# The box the dialog describes
+def boxFromInputs(inputs) -> 'Box':
+    box = Box()
+    for input in inputs:
+        if input.id == 'boxName':
+            box.boxName = input.value
+        elif input.id == 'slotsWide':
+            box.slotsWide = input.value
+        elif input.id == 'slotsDeep':
+            box.slotsDeep = input.value
+        elif input.id == 'slotsHigh':
+            box.slotsHigh = input.value
+        elif input.id == 'dividerCount':
+            box.dividerCount = input.value
+        elif input.id == 'dividerCountDeep':
+            box.dividerCountDeep = input.value
+        elif input.id == 'includeScoop':
+            box.includeScoop = input.value
+        elif input.id == 'baseOnly':
+            box.baseOnly = input.value
+        elif input.id == 'includeLedge':
+            box.includeLedge = input.value
+        elif input.id == 'includeMagnets':
+            box.includeMagnets = input.value
+        elif input.id == 'baseBuilder':
+            box.baseBuilder = SLAB_BASE if input.selectedItem.name == slabBaseLabel else PATTERN_BASE
+        elif input.id == 'engine':
+            box.engine = TRANSIENT_ENGINE if input.selectedItem.name == transientEngineLabel else FEATURE_ENGINE
+        elif input.id == 'fastBuild':
+            box.fastBuild = input.value
+    return box
+
+class BoxCommandExecuteHandler(adsk.core.CommandEventHandler):
+    def __init__(self, preview: bool = False):
+        super().__init__()
+        self.preview = preview
     def notify(self, args):
         try:
             unitsMgr = app.activeProduct.unitsManager
             command = args.firingEvent.sender
             inputs = command.commandInputs
 
-            box = Box()
+            if self.preview and not debouncer.settled():
+                debouncer.schedule()
+                args.isValidResult = False
+                return
+
+            box = boxFromInputs(inputs)
+            fullPreview = defaultFullPreview
+            meshPreview = defaultMeshPreview
+            profileBuild = defaultProfileBuild
             for input in inputs:
-                if input.id == 'boxName':
-                    box.boxName = input.value
-                elif input.id == 'slotsWide':
-                    box.slotsWide = input.value
-                elif input.id == 'slotsDeep':
-                    box.slotsDeep = input.value
-                elif input.id == 'slotsHigh':
-                    box.slotsHigh = input.value
-                    # ui.messageBox(str(box.slotsHigh))
-                elif input.id == 'dividerCount':
-                    box.dividerCount = input.value
-                elif input.id == 'includeScoop':
-                    box.includeScoop = input.value
-                elif input.id == 'baseOnly':
-                    box.baseOnly = input.value
-                elif input.id == 'includeLedge':
-                    box.includeLedge = input.value
-                elif input.id == 'includeMagnets':
-                    box.includeMagnets = input.value
-
-            box.buildBox();
-            
-            args.isValidResult = True
+                if input.id == 'fullPreview':
+                    fullPreview = input.value
+                elif input.id == 'meshPreview':
+                    meshPreview = input.value
+                elif input.id == 'profileBuild':
+                    profileBuild = input.value
+
+            # Nothing is previewed of settings that can't be built; OK turns them away in buildBox
+            if self.preview and box.problems():
+                args.isValidResult = False
+                return
 
+            # A mesh preview creates no features at all, so there is nothing for Fusion to keep
+            if self.preview and meshPreview and not fullPreview and boxMesh:
+                box.showMesh(adsk.fusion.Design.cast(app.activeProduct))
+                args.isValidResult = False
+                return
+
+            # Previews are drafts unless asked otherwise; a draft must never become the final result
+            box.draft = self.preview and not fullPreview
+            if self.preview:
+                generation = debouncer.generation
+                box.checkpoint = lambda: debouncer.checkpoint(generation)
+            # Only builds that are kept get profiled
+            profilePath = None
+            if profileBuild and not self.preview:
+                profilePath = os.path.join(profileDirectory, time.strftime('%Y%m%d-%H%M%S') + '.prof')
+            box.buildLog = BuildLog(buildLogPath, 'GridFinityDividerBoxMaker', box.settings(), os.path.dirname(os.path.abspath(adsk.__file__)),
+                                    profilePath, self.preview)
+            built = box.buildBox()
+
+            # A successful full preview is adopted as-is: Fusion keeps it and doesn't fire execute,
+            # so OK doesn't build the same box again
+            if self.preview:
+                args.isValidResult = built and not box.draft
+
+        except StaleBuild:
+            args.isValidResult = False
         except:
             if ui:
                 ui.messageBox('Failed:\n{}'.format(traceback.format_exc()))
@@ -320,6 +581,10 @@ class BoxCommandDestroyHandler(adsk.core.CommandEventHandler):
         super().__init__()
     def notify(self, args):
         try:
+            debouncer.cancel()
+            debouncer.command = None
+            app.unregisterCustomEvent(debounceEventId)
+
             # when the command is done, terminate the script
             # this will release all globals which will remove all event handlers
             adsk.terminate()
@@ -336,14 +601,28 @@ class BoxCommandCreatedHandler(adsk.core.CommandCreatedEventHandler):
             cmd.isRepeatable = False
             onExecute = BoxCommandExecuteHandler()
             cmd.execute.add(onExecute)
-            onExecutePreview = BoxCommandExecuteHandler()
+            onExecutePreview = BoxCommandExecuteHandler(preview=True)
             cmd.executePreview.add(onExecutePreview)
             onDestroy = BoxCommandDestroyHandler()
             cmd.destroy.add(onDestroy)
+            onInputChanged = BoxCommandInputChangedHandler()
+            cmd.inputChanged.add(onInputChanged)
+            onValidateInputs = BoxCommandValidateInputsHandler()
+            cmd.validateInputs.add(onValidateInputs)
+
+            # The debounce timer runs on another thread, so it comes back to us through a custom event
+            app.unregisterCustomEvent(debounceEventId)
+            onDebounce = BoxDebounceEventHandler()
+            app.registerCustomEvent(debounceEventId).add(onDebounce)
+            debouncer.command = cmd
+
             # keep the handler referenced beyond this function
             handlers.append(onExecute)
             handlers.append(onExecutePreview)
             handlers.append(onDestroy)
+            handlers.append(onInputChanged)
+            handlers.append(onValidateInputs)
+            handlers.append(onDebounce)
 
             #define the inputs
             inputs = cmd.commandInputs
@@ -357,10 +636,11 @@ class BoxCommandCreatedHandler(adsk.core.CommandCreatedEventHandler):
             
             # I'd love to make this just MMs
             initSlotsHigh = adsk.core.ValueInput.createByReal(defaultSlotsHigh)
-            inputs.addFloatSpinnerCommandInput('slotsHigh', 'Slots High', '', 0.25, 10.0, 0.01, defaultSlotsHigh)
+            inputs.addFloatSpinnerCommandInput('slotsHigh', 'Slots High', '', minSlotsHigh, maxSlotsHigh, 0.01, defaultSlotsHigh)
 
             initDividerCount = adsk.core.ValueInput.createByReal(defaultDividerCount)
             inputs.addIntegerSpinnerCommandInput('dividerCount', 'Divider Count', 0, 10, 1, defaultDividerCount)
+            inputs.addIntegerSpinnerCommandInput('dividerCountDeep', 'Cross Divider Count', 0, 10, 1, defaultDividerCountDeep)
 
             initIncludeScoop = adsk.core.ValueInput.createByReal(defaultIncludeScoop)
             inputs.addBoolValueInput('includeScoop', 'Include Scoop?', True, '', defaultIncludeScoop)
@@ -374,6 +654,30 @@ class BoxCommandCreatedHandler(adsk.core.CommandCreatedEventHandler):
             initIncludeMagnets = adsk.core.ValueInput.createByReal(defaultIncludeMagnets)
             inputs.addBoolValueInput('includeMagnets', 'Include Magnets?', True, '', defaultIncludeMagnets)
 
+            baseBuilder = inputs.addDropDownCommandInput('baseBuilder', 'Base Builder', adsk.core.DropDownStyles.TextListDropDownStyle)
+            baseBuilder.listItems.add(patternBaseLabel, defaultBaseBuilder == PATTERN_BASE, '')
+            baseBuilder.listItems.add(slabBaseLabel, defaultBaseBuilder == SLAB_BASE, '')
+
+            engine = inputs.addDropDownCommandInput('engine', 'Build Engine', adsk.core.DropDownStyles.TextListDropDownStyle)
+            engine.listItems.add(featureEngineLabel, defaultEngine == FEATURE_ENGINE, '')
+            engine.listItems.add(transientEngineLabel, defaultEngine == TRANSIENT_ENGINE, '')
+
+            # For batches and big grids where nobody will edit the timeline afterwards
+            inputs.addBoolValueInput('fastBuild', 'Fast Build (no timeline)?', True, '', defaultFastBuild)
+
+            # Full previews are slow on big grids, so by default only a draft is shown until OK
+            inputs.addBoolValueInput('fullPreview', 'Full Preview?', True, '', defaultFullPreview)
+
+            # Otherwise the preview is drawn as a mesh, if NumPy is there to build it
+            inputs.addBoolValueInput('meshPreview', 'Mesh Preview?', True, '', defaultMeshPreview)
+
+            # Every build's stages are timed into build-log.jsonl; this also saves a cProfile of the final build
+            inputs.addBoolValueInput('profileBuild', 'Profile Build?', True, '', defaultProfileBuild)
+
+            # Why the box can't be built, when it can't
+            problems = inputs.addTextBoxCommandInput('problems', '', '', 4, True)
+            problems.isVisible = False
+
         except:
             if ui:
                 ui.messageBox('Failed:\n{}'.format(traceback.format_exc()))
@@ -385,10 +689,17 @@ class Box:
         self._slotsDeep = defaultSlotsDeep
         self._slotsHigh = defaultSlotsHigh
         self._dividerCount = defaultDividerCount
+        self._dividerCountDeep = defaultDividerCountDeep
         self._includeScoop = defaultIncludeScoop
         self._baseOnly = defaultBaseOnly
         self._includeLedge = defaultIncludeLedge
         self._includeMagnets = defaultIncludeMagnets
+        self._baseBuilder = defaultBaseBuilder
+        self._engine = defaultEngine
+        self._draft = False
+        self._fastBuild = defaultFastBuild
+        self._checkpoint = None
+        self._buildLog = None
 
     #properties
     @property
@@ -425,6 +736,13 @@ class Box:
     @dividerCount.setter
     def dividerCount(self, value):
         self._dividerCount = value
+
+    @property
+    def dividerCountDeep(self):
+        return self._dividerCountDeep
+    @dividerCountDeep.setter
+    def dividerCountDeep(self, value):
+        self._dividerCountDeep = value
         
     @property
     def includeScoop(self):
@@ -453,8 +771,168 @@ class Box:
     @includeMagnets.setter
     def includeMagnets(self, value):
         self._includeMagnets = value
-        
+
+    # PATTERN_BASE or SLAB_BASE
+    @property
+    def baseBuilder(self):
+        return self._baseBuilder
+    @baseBuilder.setter
+    def baseBuilder(self, value):
+        self._baseBuilder = value
+
+    # FEATURE_ENGINE or TRANSIENT_ENGINE
+    @property
+    def engine(self):
+        return self._engine
+    @engine.setter
+    def engine(self, value):
+        self._engine = value
+
+    # A draft is only the coarse solid: footprint, outer wall and the hole.
+    @property
+    def draft(self):
+        return self._draft
+    @draft.setter
+    def draft(self, value):
+        self._draft = value
+
+    # Defer sketch solves and keep the build out of the timeline
+    @property
+    def fastBuild(self):
+        return self._fastBuild
+    @fastBuild.setter
+    def fastBuild(self, value):
+        self._fastBuild = value
+
+    # Called between build stages, e.g. so a preview can abandon itself when the inputs move on
+    @property
+    def checkpoint(self):
+        return self._checkpoint
+    @checkpoint.setter
+    def checkpoint(self, value):
+        self._checkpoint = value
+
+    # Where the build's stages are timed, if anywhere
+    @property
+    def buildLog(self):
+        return self._buildLog
+    @buildLog.setter
+    def buildLog(self, value):
+        self._buildLog = value
+
+    def stageDone(self, name: str = '', body: adsk.fusion.BRepBody = None):
+        if self.buildLog:
+            self.buildLog.stage(name, body)
+        if self.checkpoint:
+            self.checkpoint()
+
+    # Everything that affects what gets built, by name
+    def settings(self) -> dict:
+        return {'boxName': self.boxName, 'slotsWide': self.slotsWide, 'slotsDeep': self.slotsDeep, 'slotsHigh': self.slotsHigh,
+                'dividerCount': self.dividerCount, 'dividerCountDeep': self.dividerCountDeep, 'includeScoop': self.includeScoop,
+                'baseOnly': self.baseOnly, 'includeLedge': self.includeLedge, 'includeMagnets': self.includeMagnets,
+                'baseBuilder': self.baseBuilder, 'engine': self.engine, 'fastBuild': self.fastBuild}
+
+    # Why the box can't be built, or nothing if it can; see boxProblems()
+    def problems(self) -> list:
+        return boxProblems(self.slotsWide, self.slotsDeep, self.slotsHigh, self.dividerCount, self.dividerCountDeep,
+                           self.includeScoop, self.baseOnly, self.includeLedge)
+
+    # Only what shapes the box: the engine and fast build make the same solid
+    def shapeHash(self) -> str:
+        return shapeHash(self.settings(), 'engine', 'fastBuild')
+
+    # The box as custom graphics, which Fusion throws away with the rest of the preview
+    def showMesh(self, design: adsk.fusion.Design) -> adsk.fusion.CustomGraphicsGroup:
+        mesh = boxMesh(self.slotsWide, self.slotsDeep, self.slotsHigh, self.dividerCount, self.dividerCountDeep,
+                       self.includeScoop, self.baseOnly, self.includeLedge, self.includeMagnets)
+        coordinates, indices, normals = flatBuffers(mesh)
+        group = design.rootComponent.customGraphicsGroups.add()
+        group.addMesh(adsk.fusion.CustomGraphicsCoordinates.create(coordinates.tolist()), indices.tolist(), normals.tolist(), indices.tolist())
+        return group
+
+    # Everything buildFull() makes, as a plan that needs no Fusion to work out
+    def plan(self) -> tuple:
+        return boxPlan(self.boxName, self.slotsWide, self.slotsDeep, self.slotsHigh, self.dividerCount, self.dividerCountDeep,
+                       self.includeScoop, self.baseOnly, self.includeLedge, self.includeMagnets, self.baseBuilder)
+
+    def buildDraft(self, component: adsk.fusion.Component):
+        PlanExecutor(component, self.stageDone).run(draftPlan(self.boxName, self.slotsWide, self.slotsDeep, self.slotsHigh, self.baseOnly))
+
+    def buildFull(self, component: adsk.fusion.Component, baseFeature: adsk.fusion.BaseFeature = None):
+        PlanExecutor(component, self.stageDone, baseFeature).run(self.plan())
+
+    # Same solid as buildFull(), from temporary bodies, committed in one go
+    def buildTransient(self, component: adsk.fusion.Component):
+        tbm = adsk.fusion.TemporaryBRepManager.get()
+        width = self.slotsWide * slotDimension
+        depth = self.slotsDeep * slotDimension
+        height = self.slotsHigh * slotDimension
+
+        # One foot, with the same cross-section as the swept edge profile
+        chamferTop = nestingDepth - nestingRimWidth
+        foot = transientFrustum(0, 0, slotDimension, slotDimension, 0, nestingRimWidth + baseLip, baseLip, nestingRimWidth)
+        transientUnion(foot, transientFrustum(0, 0, slotDimension, slotDimension, baseLip, nestingRimWidth, chamferTop, nestingRimWidth))
+        transientUnion(foot, transientFrustum(0, 0, slotDimension, slotDimension, chamferTop, nestingRimWidth, nestingDepth, 0))
+        if self.includeMagnets:
+            for hx, hz in [(holeOffset, holeOffset), (slotDimension - holeOffset, holeOffset),
+                           (slotDimension - holeOffset, slotDimension - holeOffset), (holeOffset, slotDimension - holeOffset)]:
+                hole = tbm.createCylinderOrCone(createPoint(hx, 0, -hz), magnetDiameter / 2., createPoint(hx, magnetThickness, -hz), magnetDiameter / 2.)
+                transientDifference(foot, hole)
+
+        # The box itself, then a copy of the foot in every cell
+        if self.baseOnly:
+            body = transientFrustum(0, 0, width, depth, nestingDepth, 0, nestingDepth + 1*SCALE, 0)
+        else:
+            body = transientFrustum(0, 0, width, depth, nestingDepth, 0, height, 0)
+        for i in range(self.slotsWide):
+            for j in range(self.slotsDeep):
+                transientUnion(body, transientTranslate(tbm.copy(foot), i * slotDimension, 0, -j * slotDimension))
+        self.stageDone('Transient Base')
+
+        if not self.baseOnly:
+            # Rim, then everything the hole, indent and rim profile take out of the middle, bottom up
+            rimTop = height + nestingDepth - nestingVerticalClearance
+            rimInset = nestingRimWidth - nestingVerticalClearance
+            lipInset = nestingRimWidth + baseLip - nestingVerticalClearance
+            rimChamfer = height + nestingDepth - nestingRimWidth - cornerVerticalOffset
+            lipChamfer = height + baseLip - cornerVerticalOffset
+            transientUnion(body, transientFrustum(0, 0, width, depth, height, 0, rimTop, 0))
+            cavities = [
+                (floorHeight, innerWallInset, height - 2 * wallThickness, innerWallInset),
+                (height - 2 * wallThickness, innerWallInset, height - wallThickness, lipInset),
+                (height - wallThickness, lipInset, height, lipInset),
+                (height, lipInset, lipChamfer, rimInset),
+                (lipChamfer, rimInset, rimChamfer, rimInset),
+                (rimChamfer, rimInset, rimTop, 0),
+            ]
+            for y0, inset0, y1, inset1 in cavities:
+                transientDifference(body, transientFrustum(0, 0, width, depth, y0, inset0, y1, inset1))
+            self.stageDone('Transient Walls')
+
+            if self.includeLedge:
+                # Triangular prism along the front wall, as createLedgeSketch draws it
+                ledgeTop = height - ledgeOffset
+                ledgeDrop = math.sin(ledgeAngle * math.pi / 180) * ledgeDepth
+                ledge = transientBox(wallThickness, width - wallThickness, ledgeTop - ledgeDrop, ledgeTop, -(wallThickness + ledgeDepth), -wallThickness)
+                transientIntersection(ledge, transientHalfSpace((0, ledgeTop, -(wallThickness + ledgeDepth)), (0, ledgeDepth, ledgeDrop), 4 * (width + depth)))
+                transientUnion(body, ledge)
+
+            if self.includeScoop:
+                transientUnion(body, transientConcaveRound(baseCornerRadius, width - baseCornerRadius, floorHeight, -(depth - innerWallInset), height / 2))
+
+            for pos in dividerPositions(self.dividerCount, width):
+                transientUnion(body, transientBox(pos, pos + wallThickness, nestingDepth, height - ledgeOffset, -depth, 0))
+            for pos in dividerPositions(self.dividerCountDeep, depth):
+                transientUnion(body, transientBox(0, width, nestingDepth, height - ledgeOffset, -(pos + wallThickness), -pos))
+
+        self.stageDone('Transient Details')
+        self.stageDone('Commit', commitTransientBody(component, body, self.boxName))
+
     def buildBox(self):
+        if self.buildLog:
+            self.buildLog.start()
+        outcome = 'failed'
         try:
             # Get the active design.
             app = adsk.core.Application.get()
@@ -462,196 +940,74 @@ class Box:
             design = adsk.fusion.Design.cast(product)
             ui = app.userInterface
 
-            global component
+            # Settings that can't be built are turned away before anything is made
+            problems = self.problems()
+            if problems:
+                if ui:
+                    ui.messageBox('This box can\'t be built:\n\n' + '\n'.join(problems))
+                outcome = 'invalid'
+                return False
+
+            global component, deferSketchCompute
+            deferSketchCompute = self.fastBuild
             
             # Units
             design.fusionUnitsManager.distanceDisplayUnits = adsk.fusion.DistanceUnits.MillimeterDistanceUnits
 
+            # An identical box already in the design is reused; drafts are never kept, so never tagged
+            shape = None
+            if not self.draft:
+                shape = self.shapeHash()
+                component = reuseComponent(design, attributeGroup, shape)
+                if component:
+                    outcome = 'reused'
+                    return True
+
             # Main component
             component = createComponent(design, self.boxName)
             if component is None:
                 ui.messageBox('New component failed to create', 'New Component Failed')
-                return
-
-            # Sketch base
-            base_rect_profile = createBaseRectSketch(component)
-            # Extrude
-            distance = createDistance(nestingDepth)
-            base = component.features.extrudeFeatures.addSimple(base_rect_profile, distance, NEW_BODY)
-            base_body = base.bodies.item(0)
-            base_body.name = "Base"
-
-            if self.includeMagnets:
-                # Magnet hole sketch
-                magnet_holes_profile = createMagnetHolesSketch(component)
-
-                # Extrude for magnets
-                distance = createDistance(magnetThickness)
-                component.features.extrudeFeatures.addSimple(magnet_holes_profile, distance, CUT)
-
-            # Profile for the edge
-            edge_sketch = component.sketches.add(component.xYConstructionPlane)
-            edge_sketch.name = "Edge Profile Sketch"
-            lines = edge_sketch.sketchCurves.sketchLines
-            h = -slotDimension / 2
-            p0 = createPoint(-1, 0, h)
-            p1a = createPoint(-1, nestingDepth, h)
-            lines.addByTwoPoints(p0, p1a)
-            p1 = createPoint(0, nestingDepth, h)
-            lines.addByTwoPoints(p1a, p1)
-            p2 = createPoint(nestingRimWidth + baseLip, 0, h)
-            lines.addByTwoPoints(p0, p2)
-            p3 = createPoint(nestingRimWidth, baseLip, h)
-            lines.addByTwoPoints(p2, p3)
-            p4 = createPoint(nestingRimWidth, nestingDepth - nestingRimWidth, h)
-            lines.addByTwoPoints(p1, p4)
-            lines.addByTwoPoints(p4, p3)
-
-            # FIXME: this really offends me!
-            edge_profile = edge_sketch.profiles.item(0)
-
-            # Path to sweep profile along (derived from baserect)
-            sweep_path_objects = createBaseSweepSketch(component)
-            sweep_path = component.features.createPath(sweep_path_objects)
-
-            # Do the sweeps
-            sweeps = component.features.sweepFeatures
-            sweep_input = sweeps.createInput(edge_profile, sweep_path, CUT)
-            sweep = sweeps.add(sweep_input)
-
-            # Copy for the whole base
-            if self.slotsWide > 1 or self.slotsDeep > 1:
-                rectPattern(base_body, self.slotsWide, self.slotsDeep, slotDimension)
-
-            # Now the box
-            box_path_objects, box_profile = createCurvedRect(component, "Box Profile", self.slotsWide * slotDimension, self.slotsDeep * slotDimension, baseCornerRadius, nestingDepth)
-            if self.baseOnly:
-                distance = createDistance(1*SCALE)
-                base = component.features.extrudeFeatures.addSimple(box_profile, distance, JOIN)
-                return
-                
-            distance = createDistance(self.slotsHigh * slotDimension - nestingDepth)
-            base = component.features.extrudeFeatures.addSimple(box_profile, distance, JOIN)
-
-            # Rim
-            rim_profile = createRimSketch(component, self.slotsHigh)
-            box_path = component.features.createPath(box_path_objects)
-            sweep_input = sweeps.createInput(rim_profile, box_path, JOIN)
-            sweep = sweeps.add(sweep_input)
-
-            # Put a fillet on the top edge
-            e = base_body.edges
-            top_edge = e.item(0)
-            for n in range(e.count):
-                edge = e.item(n)
-                bb = edge.boundingBox
-                mx = bb.maxPoint
-                mn = bb.minPoint
-                if mn.y > top_edge.boundingBox.minPoint.y:
-                    #print(f'[{mn.x}, {mn.y}, {mn.z}] -> [{mx.x}, {mx.y}, {mx.z}]')
-                    top_edge = edge
-            fillet_edges = adsk.core.ObjectCollection.create()
-            fillet_edges.add(top_edge)
-
-            fillets = component.features.filletFeatures
-            fillet_input = fillets.createInput()
-            fillet_radius = createDistance(.6 * SCALE)
-            fillet_input.addConstantRadiusEdgeSet(fillet_edges, fillet_radius, True)
-            fillet_input.isG2 = False
-            fillet_input.isRollingBallCorner = True
-            top_fillet = fillets.add(fillet_input)
-
-            # Make the hole in the box
-            # Find the profile to extrude
-            f = base_body.faces
-            extrude_face = None
-            count = 0
-            for n in range(f.count):
-                bb = f.item(n).boundingBox
-                mx = bb.maxPoint
-                mn = bb.minPoint
-                if close(mn.y, self.slotsHigh * slotDimension) and close(mx.y, self.slotsHigh * slotDimension):
-                    #print(f'[{mn.x}, {mn.y}, {mn.z}] -> [{mx.x}, {mx.y}, {mx.z}]')
-                    count += 1
-                    extrude_face = f.item(n)
-            assert count == 1
-
-            # And extrude it
-            # FIXME: the + 1 * SCALE is ad hoc (but copied from the original)
-            distance = createDistance(-(self.slotsHigh * slotDimension - (nestingDepth + wallThickness + 1 * SCALE)))
-            component.features.extrudeFeatures.addSimple(extrude_face, distance, CUT)
-
-            # Indent the lower part of the box to leave a rim around the top
-            indent_profile = createIndentSketch(component, self.slotsHigh)
-            sweep_input = sweeps.createInput(indent_profile, box_path, CUT)
-            sweep = sweeps.add(sweep_input)
-
-            if self.includeLedge and self.slotsHigh >= 0.43 :
-                # Add the ledge
-                ledge_profile = createLedgeSketch(component, self.slotsHigh)
-                distance = createDistance(self.slotsWide * slotDimension - wallThickness * 2)
-                component.features.extrudeFeatures.addSimple(ledge_profile, distance, JOIN)
-
-            if self.includeScoop:
-                # Add the curved scoop
-                edges = base_body.edges
-                ty = nestingDepth + wallThickness + 1 * SCALE
-                #print(ty)
-                fillet_edge = None
-                count = 0
-                for n in range(edges.count):
-                    edge = edges.item(n)
-                    bb = edge.boundingBox
-                    mx = bb.maxPoint
-                    mn = bb.minPoint
-                    # FIXME: where does -8.2354 come from?
-                    if close(mn.y, ty) and close(mx.y, ty) and close(mn.x, baseCornerRadius) and close(mx.x, self.slotsWide * slotDimension - baseCornerRadius) and close(mn.z, -(self.slotsDeep * slotDimension - .1646)):
-                        #print(f'[{mn.x}, {mn.y}, {mn.z}] -> [{mx.x}, {mx.y}, {mx.z}]')
-                        fillet_edge = edge
-                        count += 1
-                assert count == 1
-
-                fillet_input = fillets.createInput()
-                fillet_radius = createDistance(slotDimension * self.slotsHigh / 2)
-                edges = adsk.core.ObjectCollection.create()
-                edges.add(fillet_edge)
-                fillet_input.addConstantRadiusEdgeSet(edges, fillet_radius, False)
-                fillet_input.isG2 = False
-                fillet_input.isRollingBallCorner = True
-                fillets.add(fillet_input)
-
-            # # Now we're a box. :-)
-            base_body.name = self.boxName
-
-            # Finally, dividers
-            # FIXME: these end up not *quite* the same size
-            l = self.slotsWide * slotDimension - 2 * wallThickness
-            for n in range(self.dividerCount):
-                y = (n + 1) * l / (self.dividerCount + 1) + wallThickness / 2
-                divider_profile = createDividerSketch(component, y, slotsHigh=self.slotsHigh, slotsDeep=self.slotsDeep)
-                distance = createDistance(wallThickness)
-                divider = component.features.extrudeFeatures.addSimple(divider_profile, distance, JOIN)
-
-                edges = adsk.core.ObjectCollection.create()
-                #print(y)
-                for n in range(divider.faces.count):
-                    f = divider.faces.item(n)
-                    bb = f.boundingBox
-                    mx = bb.maxPoint
-                    mn = bb.minPoint
-                    if (close(mn.x, y) and close(mx.x, y)) or (close(mn.x, y +  wallThickness) and close(mx.x, y + wallThickness)):
-                        #print(f'[{mn.x}, {mn.y}, {mn.z}] -> [{mx.x}, {mx.y}, {mx.z}]')
-                        for e in range(f.edges.count):
-                            edges.add(f.edges.item(e))
-                fillet_input = fillets.createInput()
-                fillet_radius = createDistance(.6 * SCALE)
-                fillet_input.addConstantRadiusEdgeSet(edges, fillet_radius, True)
-                fillet_input.isG2 = False
-                fillet_input.isRollingBallCorner = True
-                fillets.add(fillet_input)        
+                return False
+
+            # The transient engine commits its own single base feature
+            if self.engine == TRANSIENT_ENGINE and not self.draft:
+                self.buildTransient(component)
+                tagComponent(component, attributeGroup, shape)
+                outcome = 'built'
+                return True
+
+            # The library foot, if it's needed, has to be there before any base feature is edited
+            if not self.draft and self.baseBuilder == PATTERN_BASE:
+                libraryFootCell(design, self.includeMagnets)
+
+            # Fast builds go into a single base feature, so none of it is captured in the timeline
+            baseFeature = None
+            if self.fastBuild and design.designType == adsk.fusion.DesignTypes.ParametricDesignType:
+                baseFeature = component.features.baseFeatures.add()
+                baseFeature.startEdit()
+            try:
+                if self.draft:
+                    self.buildDraft(component)
+                else:
+                    self.buildFull(component, baseFeature)
+            finally:
+                if baseFeature:
+                    baseFeature.finishEdit()
+
+            if shape:
+                tagComponent(component, attributeGroup, shape)
+            outcome = 'built'
+            return True
+        except StaleBuild:
+            outcome = 'stale'
+            raise
         except:
             if ui:
                 ui.messageBox('Failed to compute the box. This is most likely because the input values define an invalid box.')
+            return False
+        finally:
+            if self.buildLog:
+                self.buildLog.finish(outcome)
             
             
 def run(context):
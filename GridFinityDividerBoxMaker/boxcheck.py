@@ -0,0 +1,58 @@
+#Author- Ben Laurie <ben@links.org>
+#Description- Checks that a box can be built, from the gridfinity sizes alone, before Fusion is asked for anything
+
+from .boxspec import (SCALE, slotDimension, wallThickness, innerWallInset, floorHeight, ledgeMinSlotsHigh, edgeFilletRadius,
+                      dividerPositions, defaultSlotsWide, defaultSlotsDeep, defaultSlotsHigh, defaultDividerCount,
+                      defaultDividerCountDeep, defaultIncludeScoop, defaultBaseOnly, defaultIncludeLedge)
+
+# In mm, for messages
+def mm(size: float) -> str:
+    return '{:.4g}mm'.format(size / SCALE)
+
+# Why the settings can't be built, one sentence each, or nothing if they can. It's only arithmetic
+# on the sizes boxPlan() works from, so it can run on every change in the dialog.
+def boxProblems(slotsWide: int = defaultSlotsWide, slotsDeep: int = defaultSlotsDeep, slotsHigh: float = defaultSlotsHigh,
+                dividerCount: int = defaultDividerCount, dividerCountDeep: int = defaultDividerCountDeep,
+                includeScoop: bool = defaultIncludeScoop, baseOnly: bool = defaultBaseOnly,
+                includeLedge: bool = defaultIncludeLedge) -> list:
+    problems = []
+    if slotsWide < 1 or slotsDeep < 1:
+        problems.append('A box is at least 1 slot wide and 1 deep, not {} by {}.'.format(slotsWide, slotsDeep))
+    if slotsHigh <= 0:
+        problems.append('Slots High has to be more than 0, not {:g}.'.format(slotsHigh))
+    if dividerCount < 0 or dividerCountDeep < 0:
+        problems.append('Divider counts can\'t be negative.')
+    if problems or baseOnly:
+        return problems
+
+    width = slotsWide * slotDimension
+    depth = slotsDeep * slotDimension
+    height = slotsHigh * slotDimension
+
+    if includeLedge and slotsHigh < ledgeMinSlotsHigh:
+        problems.append('The ledge needs Slots High of at least {:g}, not {:g}; turn Include Ledge off for a box this low.'.format(
+            ledgeMinSlotsHigh, slotsHigh))
+
+    # The scoop is a fillet half the height of the box, between the floor and the back wall
+    if includeScoop:
+        radius = height / 2
+        inside = depth - 2 * innerWallInset
+        wall = height - 2 * wallThickness - floorHeight
+        if radius > inside:
+            problems.append('The scoop ({} radius, half the height) is deeper than the inside of the box ({}); make it lower or deeper, or turn Include Scoop off.'.format(
+                mm(radius), mm(inside)))
+        if radius > wall:
+            problems.append('The scoop ({} radius, half the height) is taller than the straight part of the back wall ({}); make the box taller or turn Include Scoop off.'.format(
+                mm(radius), mm(wall)))
+
+    # Each divider's edges are rounded, so there has to be room for a round either side of the gaps
+    # between them; the gaps at the walls are always wider
+    for count, length, name in ((dividerCount, width, 'Divider Count'), (dividerCountDeep, depth, 'Cross Divider Count')):
+        positions = dividerPositions(count, length)
+        if len(positions) < 2:
+            continue
+        gap = min(b - a - wallThickness for a, b in zip(positions, positions[1:]))
+        if gap < 2 * edgeFilletRadius:
+            problems.append('{} dividers leave gaps of {}, less than the {} their fillets need; lower the {}.'.format(
+                count, mm(gap), mm(2 * edgeFilletRadius), name))
+    return problems
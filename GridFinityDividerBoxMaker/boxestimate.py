@@ -0,0 +1,239 @@
+#Author- Ben Laurie <ben@links.org>
+#Description- Volume, surface area, size and material of divider boxes, worked out from their sizes without a mesh
+
+import math
+import numpy as np
+
+from .boxspec import (SCALE, magnetDiameter, magnetThickness, baseCornerRadius, baseLip, slotDimension, nestingDepth,
+                      nestingRimWidth, wallThickness, ledgeOffset, ledgeDepth, ledgeAngle, nestingVerticalClearance,
+                      cornerVerticalOffset, innerWallInset, floorHeight)
+
+# Every size is an array, one entry per box, so thousands of boxes cost about what one does. The
+# outside (feet, the gaps between them and the outer wall) is worked out exactly. Inside, the
+# cavity less the dividers, ledge and scoop is cut into horizontal slices: each slice's open area
+# and the length round it are exact, and Gauss-Legendre quadrature adds them up between the
+# heights where anything changes. Fillets are left out, as in boxMesh().
+
+# Quadrature points between each pair of heights where the inside changes
+quadraturePoints = 8
+# How far either side of such a height the open area is looked at, to find flat faces there
+stepHeight = 1e-7
+
+# Filament and printing, for rough costs: PLA on 1.75mm filament, at an overall 10mm³/s
+filamentDiameter = 1.75 * SCALE
+filamentDensity = 1.24
+printRate = 10 * SCALE ** 3 * 3600
+
+# Area and perimeter of a rounded rect inset by inset, with corners of radius baseCornerRadius less it
+def roundedRect(width, depth, inset):
+    r = baseCornerRadius - inset
+    area = (width - 2 * inset) * (depth - 2 * inset) - (4 - math.pi) * r ** 2
+    perimeter = 2 * (width - 2 * inset) + 2 * (depth - 2 * inset) - (8 - 2 * math.pi) * r
+    return area, perimeter
+
+# Volume and side area of a loft between two rounded rects
+def loftSection(width, depth, y0, inset0, y1, inset1):
+    h = y1 - y0
+    a0, p0 = roundedRect(width, depth, inset0)
+    am, _ = roundedRect(width, depth, (inset0 + inset1) / 2)
+    a1, p1 = roundedRect(width, depth, inset1)
+    return h / 6 * (a0 + 4 * am + a1), math.hypot(h, inset1 - inset0) * (p0 + p1) / 2
+
+# One foot: volume, area less its top, and the area of its top
+def footEstimate(includeMagnets):
+    sections = [(0, nestingRimWidth + baseLip), (baseLip, nestingRimWidth), (nestingDepth - nestingRimWidth, nestingRimWidth), (nestingDepth, 0)]
+    volume = area = 0
+    for (y0, i0), (y1, i1) in zip(sections, sections[1:]):
+        v, a = loftSection(slotDimension, slotDimension, y0, i0, y1, i1)
+        volume += v
+        area += a
+    area += roundedRect(slotDimension, slotDimension, sections[0][1])[0]
+    top = roundedRect(slotDimension, slotDimension, 0)[0]
+    # Each of the four magnet holes takes its volume and adds its wall
+    radius = magnetDiameter / 2
+    volume = volume - np.where(includeMagnets, 4 * math.pi * radius ** 2 * magnetThickness, 0)
+    area = area + np.where(includeMagnets, 4 * 2 * math.pi * radius * magnetThickness, 0)
+    return volume, area, top
+
+# Where count evenly spaced dividers start, as dividerPositions() has them, for each box. Returns
+# (boxes, most dividers) positions and which of them are real.
+def dividerStarts(count, length):
+    slots = np.arange(max(int(np.max(count, initial=0)), 1))
+    real = slots[None, :] < count[:, None]
+    l = length - 2 * wallThickness
+    return (slots[None, :] + 1) * l[:, None] / (count[:, None] + 1) + wallThickness / 2, real
+
+# A corner of radius r, cut off u in from its side: the area the arc takes from the square corner
+# beyond the cut, the length of arc there, and how far in the arc is at the cut
+def cornerCut(u, r):
+    v = np.clip(r - u, 0, r)
+    angle = np.arcsin(v / np.where(r > 0, r, 1))
+    arcArea = (v * np.sqrt(r ** 2 - v ** 2) + r ** 2 * angle) / 2
+    return r * v - arcArea, r * angle, r - np.sqrt(r ** 2 - v ** 2)
+
+# The open part of the cavity at each height y (boxes, ...), where q runs from the back outside
+# face forwards. Returns the open area, and the lengths round it of wall, divider, ledge and scoop.
+class Slices:
+    def __init__(self, width, depth, height, dividerCount, dividerCountDeep, includeScoop, includeLedge):
+        self.width, self.depth, self.height = width, depth, height
+        self.ledgeTop = height - ledgeOffset
+        self.rimTop = height + nestingDepth - nestingVerticalClearance
+        self.scoopRadius = np.where(includeScoop, height / 2, 0)
+        self.includeLedge = includeLedge
+        self.ledgeDrop = math.sin(ledgeAngle * math.pi / 180) * ledgeDepth
+        self.xStarts, self.xReal = dividerStarts(dividerCount, width)
+        self.qStarts, self.qReal = dividerStarts(dividerCountDeep, depth)
+        self.xCount = dividerCount
+
+        # The inside of the wall, bottom up, as in cavityFaces()
+        rimInset = nestingRimWidth - nestingVerticalClearance
+        lipInset = nestingRimWidth + baseLip - nestingVerticalClearance
+        self.profileHeights = np.stack([np.full_like(height, floorHeight), height - 2 * wallThickness, height - wallThickness, height,
+                                        height + baseLip - cornerVerticalOffset, height + nestingDepth - nestingRimWidth - cornerVerticalOffset,
+                                        self.rimTop], axis=1)
+        self.profileHeights[:, 1:] = np.maximum(self.profileHeights[:, 1:], floorHeight)
+        # The inset at floorHeight, for walls that start below it
+        lowest = np.array([innerWallInset, innerWallInset, lipInset, lipInset, rimInset, rimInset, 0])
+        unclipped = np.stack([np.full_like(height, floorHeight), height - 2 * wallThickness, height - wallThickness, height,
+                              height + baseLip - cornerVerticalOffset, height + nestingDepth - nestingRimWidth - cornerVerticalOffset,
+                              self.rimTop], axis=1)
+        floorInset = np.array([np.interp(floorHeight, h, lowest) for h in unclipped])
+        self.profileInsets = np.where(unclipped < floorHeight, floorInset[:, None], lowest[None, :])
+
+    # Heights where anything inside changes, (boxes, n), in no particular order
+    def breaks(self) -> np.ndarray:
+        # Where the ledge's front edge meets the wall at each inset, and the corners
+        rise = self.ledgeDrop / ledgeDepth
+        ledge = [self.ledgeTop + (q - wallThickness - ledgeDepth) * rise for q in np.unique(self.profileInsets)]
+        ledge += [self.ledgeTop + (baseCornerRadius - wallThickness - ledgeDepth) * rise]
+        scoop = [floorHeight + self.scoopRadius]
+
+        # And where the ledge and scoop pass the faces of the dividers across the depth
+        faces = np.concatenate([self.qStarts, self.qStarts + wallThickness], axis=1)
+        radius = self.scoopRadius[:, None]
+        rise = radius - np.clip(self.depth[:, None] - innerWallInset - faces, 0, radius)
+        crossings = [self.ledgeTop[:, None] + (faces - wallThickness - ledgeDepth) * self.ledgeDrop / ledgeDepth,
+                     floorHeight + radius - np.sqrt(np.maximum(radius ** 2 - rise ** 2, 0))]
+        return np.concatenate([self.profileHeights, np.stack([self.ledgeTop] + ledge + scoop, axis=1)] + crossings, axis=1)
+
+    def inset(self, y):
+        h, i = self.profileHeights, self.profileInsets
+        inset = np.zeros_like(y)
+        slope = np.zeros_like(y)
+        for j in range(h.shape[1] - 1):
+            h0, h1, i0, i1 = [a[:, j + k].reshape((-1,) + (1,) * (y.ndim - 1)) for a, k in ((h, 0), (h, 1), (i, 0), (i, 1))]
+            band = (y >= h0) & (y < h1)
+            s = (i1 - i0) / np.where(h1 > h0, h1 - h0, 1)
+            inset = np.where(band, i0 + (y - h0) * s, inset)
+            slope = np.where(band, s, slope)
+        return inset, slope
+
+    def __call__(self, y):
+        shape = (-1,) + (1,) * (y.ndim - 1)
+        column = lambda a: np.asarray(a).reshape(shape)
+        width, depth = column(self.width), column(self.depth)
+        inset, slope = self.inset(y)
+        r = baseCornerRadius - inset
+        inside = (y >= floorHeight) & (y < column(self.rimTop))
+
+        # The ledge cuts off the back, and the scoop the front
+        ledgeEdge = wallThickness + ledgeDepth + (y - column(self.ledgeTop)) * ledgeDepth / self.ledgeDrop
+        ledgeCuts = column(self.includeLedge) & (y <= column(self.ledgeTop)) & (ledgeEdge > inset)
+        radius = column(self.scoopRadius)
+        rise = np.clip(y - floorHeight - radius, -radius, 0)
+        scoopEdge = innerWallInset + radius - np.sqrt(np.maximum(radius ** 2 - rise ** 2, 0))
+        scoopCuts = (y <= floorHeight + radius) & (scoopEdge > inset)
+        q0 = np.where(ledgeCuts, ledgeEdge, inset)
+        q1 = depth - np.where(scoopCuts, scoopEdge, inset)
+        length = np.maximum(q1 - q0, 0)
+        open = length > 0
+
+        # The rounded rect between q0 and q1, and its outline there
+        backCut, backArc, backWidth = cornerCut(q0 - inset, r)
+        frontCut, frontArc, frontWidth = cornerCut(depth - inset - q1, r)
+        across = width - 2 * inset
+        area = across * length - 2 * (backCut + frontCut)
+        sides = 2 * np.maximum(np.minimum(q1, depth - inset - r) - np.maximum(q0, inset + r), 0)
+        backEdge = across - 2 * backWidth
+        frontEdge = across - 2 * frontWidth
+
+        # Dividers stop at the top of the ledge
+        dividers = y < column(self.ledgeTop)
+        xCount = np.where(dividers, column(self.xCount), 0)
+        qs = self.qStarts.reshape(self.qStarts.shape[:1] + (1,) * (y.ndim - 1) + self.qStarts.shape[1:])
+        qReal = self.qReal.reshape(qs.shape) & dividers[..., None]
+        overlap = np.where(qReal, np.clip(np.minimum(qs + wallThickness, q1[..., None]) - np.maximum(qs, q0[..., None]), 0, None), 0)
+        faces = np.where(qReal, ((qs > q0[..., None]) & (qs < q1[..., None])).astype(int)
+                         + ((qs + wallThickness > q0[..., None]) & (qs + wallThickness < q1[..., None])), 0)
+        covered = overlap.sum(axis=-1)
+        area = area - xCount * wallThickness * length - covered * across + xCount * wallThickness * covered
+        dividerLength = 2 * xCount * (length - covered) + faces.sum(axis=-1) * (across - xCount * wallThickness)
+        backEdge = backEdge - xCount * wallThickness
+        frontEdge = frontEdge - xCount * wallThickness
+        wall = sides - 2 * covered + 2 * (backArc + frontArc) + np.where(ledgeCuts, 0, backEdge) + np.where(scoopCuts, 0, frontEdge)
+
+        zero = lambda a: np.where(inside & open, a, 0)
+        return (zero(area), zero(wall) * np.sqrt(1 + slope ** 2), zero(dividerLength),
+                zero(np.where(ledgeCuts, backEdge, 0)), zero(np.where(scoopCuts, frontEdge, 0)))
+
+# Solid volume (cm³), surface area (cm²) and the size of the box as it prints (cm), for each box.
+# Takes what boxMesh() takes, as arrays or numbers.
+def boxEstimate(slotsWide, slotsDeep, slotsHigh, dividerCount=0, dividerCountDeep=0, includeScoop=True, baseOnly=False,
+                includeLedge=True, includeMagnets=False) -> dict:
+    slotsWide, slotsDeep, slotsHigh, dividerCount, dividerCountDeep, includeScoop, baseOnly, includeLedge, includeMagnets = np.broadcast_arrays(
+        *[np.atleast_1d(np.asarray(a)) for a in (slotsWide, slotsDeep, slotsHigh, dividerCount, dividerCountDeep, includeScoop, baseOnly, includeLedge, includeMagnets)])
+    width = slotsWide * slotDimension
+    depth = slotsDeep * slotDimension
+    height = slotsHigh * slotDimension
+    dividerCount = dividerCount.astype(int)
+    dividerCountDeep = dividerCountDeep.astype(int)
+    top = np.where(baseOnly, nestingDepth + 1 * SCALE, height + nestingDepth - nestingVerticalClearance)
+
+    # Feet, the gaps between them, and a solid block up to the top
+    feet = slotsWide * slotsDeep
+    footVolume, footArea, footTop = footEstimate(includeMagnets)
+    outerArea, outerPerimeter = roundedRect(width, depth, 0)
+    volume = feet * footVolume + outerArea * (top - nestingDepth)
+    area = feet * footArea + (outerArea - feet * footTop) + outerPerimeter * (top - nestingDepth)
+    area = area + np.where(baseOnly, outerArea, 0)
+
+    # Less the open part of the cavity. Each slice's open area goes from the volume; round it are
+    # the walls, with the slope of the wall where it's leaning, the ledge and the scoop.
+    slices = Slices(width, depth, height, dividerCount, dividerCountDeep, includeScoop & ~baseOnly, includeLedge)
+    breaks = np.sort(np.clip(slices.breaks(), floorHeight, slices.rimTop[:, None]), axis=1)
+    y0, y1 = breaks[:, :-1], breaks[:, 1:]
+    nodes, weights = np.polynomial.legendre.leggauss(quadraturePoints)
+    nodes, weights = (nodes + 1) / 2, weights / 2
+
+    # Below the top of the scoop, slices are spaced evenly round its arc instead, so its steep
+    # bottom is followed closely
+    radius = slices.scoopRadius[:, None]
+    onArc = (radius > 0) & ((y0 + y1) / 2 < floorHeight + radius)
+    angle = lambda y: np.arccos(np.clip(1 - (y - floorHeight) / np.where(radius > 0, radius, 1), -1, 1))
+    a0, a1 = angle(y0), angle(y1)
+    arcAngle = a0[..., None] + (a1 - a0)[..., None] * nodes
+    arcY = floorHeight + radius[..., None] * (1 - np.cos(arcAngle))
+    y = np.where(onArc[..., None], arcY, y0[..., None] + (y1 - y0)[..., None] * nodes)
+    dy = np.where(onArc[..., None], radius[..., None] * np.sin(arcAngle) * (a1 - a0)[..., None], (y1 - y0)[..., None]) * weights
+    arcStep = np.where(onArc[..., None], radius[..., None] * (a1 - a0)[..., None], 0) * weights
+
+    openArea, wall, divider, ledge, scoop = slices(y)
+    ledgeSlope = math.hypot(1, ledgeDepth / slices.ledgeDrop)
+    cavity = ~baseOnly
+    volume = volume - np.where(cavity, (openArea * dy).sum(axis=(1, 2)), 0)
+    area = area + np.where(cavity, ((wall + divider + ledge * ledgeSlope) * dy + scoop * arcStep).sum(axis=(1, 2)), 0)
+
+    # Flat faces, where the open area steps at a height: the floor, the tops of the dividers and ledge
+    below, _, _, _, _ = slices(breaks - stepHeight)
+    above, _, _, _, _ = slices(breaks + stepHeight)
+    steps = np.abs(above - below)
+    steps[:, 1:][breaks[:, 1:] - breaks[:, :-1] < stepHeight] = 0
+    steps[breaks >= slices.rimTop[:, None] - stepHeight] = 0
+    area = area + np.where(cavity, steps.sum(axis=1), 0)
+
+    return {'volume': volume, 'area': area, 'width': width, 'depth': depth, 'height': top}
+
+# Filament length (m), weight (g) and print time (hours) for volumes in cm³
+def materialEstimate(volume) -> dict:
+    filamentArea = math.pi * (filamentDiameter / 2) ** 2
+    return {'filament': volume / filamentArea / 100, 'mass': volume * filamentDensity, 'hours': volume / printRate}
@@ -0,0 +1,374 @@
+#Author- Ben Laurie <ben@links.org>
+#Description- Watertight triangle mesh of a divider box, built with NumPy from the same sizes as the B-Rep
+
+import math
+import numpy as np
+
+from .boxspec import (SCALE, magnetDiameter, magnetThickness, baseCornerRadius, baseLip, slotDimension, nestingDepth,
+                      nestingRimWidth, wallThickness, holeOffset, ledgeOffset, ledgeDepth, ledgeAngle,
+                      nestingVerticalClearance, cornerVerticalOffset, innerWallInset, floorHeight, dividerPositions)
+from .meshbuild import Mesh, weld, facing, weldTolerance
+
+# One closed surface, both for previews and for printing: every edge is shared by exactly two
+# triangles, which face out. The outside (feet, the gaps between them and the outer wall) is built
+# directly; the cavity is cut into convex cells by the dividers, ledge and profile changes, and the
+# faces cells share cancel, leaving the inside of the box.
+
+# Points along each rounded corner of an outline
+cornerSegments = 6
+# How far off a plane a point can be and still be on it
+planeTolerance = 1e-9
+
+# Points along each magnet hole
+holeSegments = 4 * cornerSegments
+
+# Outline of a rounded rect at height y, as createCurvedRect draws it at x with depth running
+# towards -z from z, inset by inset. Outlines always have the same number of points, so any two
+# can be joined up, and run clockwise seen from above.
+def outline(x: float, z: float, width: float, depth: float, inset: float, y: float) -> np.ndarray:
+    r = baseCornerRadius
+    centres = [(x + width - r, z - r), (x + r, z - r), (x + r, z - depth + r), (x + width - r, z - depth + r)]
+    angles = np.linspace(0, math.pi / 2, cornerSegments + 1)
+    points = []
+    for n, (cx, cz) in enumerate(centres):
+        a = angles + n * math.pi / 2
+        points.append(np.stack([cx + (r - inset) * np.cos(a), np.full(len(a), y), cz + (r - inset) * np.sin(a)], axis=1))
+    return np.concatenate(points)
+
+# Quads joining each ring to the next, facing out when the rings run clockwise seen from above
+def loft(rings: list):
+    n = len(rings[0])
+    j = np.arange(n)
+    a = j[None, :] + n * np.arange(len(rings) - 1)[:, None]
+    b = (j[None, :] + 1) % n + n * np.arange(len(rings) - 1)[:, None]
+    quads = np.stack([a, b + n, b, a, a + n, b + n], axis=-1).reshape(-1, 3)
+    return np.concatenate(rings), quads
+
+# Triangles joining two closed loops that run once round centre (x, z) without doubling back, in
+# angle order. The loops can be at any heights and have any numbers of points; facing is left to
+# the caller. In loops in one plane, a next triangle that would fold over gives way to the other.
+def stitch(outer: np.ndarray, inner: np.ndarray, centre) -> tuple:
+    angle = lambda loop: np.arctan2(loop[:, 2] - centre[1], loop[:, 0] - centre[0])
+    def byAngle(loop, start):
+        angles = (angle(loop) - start) % (2 * math.pi)
+        order = np.argsort(angles, kind='stable')
+        return loop[order], np.append(angles[order], angles[order][0] + 2 * math.pi)
+
+    # Both start from the outer loop's first point, which is at angle 0
+    start = angle(outer).min()
+    outer, a = byAngle(outer, start)
+    inner, b = byAngle(inner, start)
+    n, m = len(outer), len(inner)
+    flat = np.ptp(np.concatenate([outer[:, 1], inner[:, 1]])) < weldTolerance
+    turn = lambda p, q, r: (q[0] - p[0]) * (r[2] - p[2]) - (q[2] - p[2]) * (r[0] - p[0])
+    triangles = []
+    i = j = 0
+    while i < n or j < m:
+        nextOuter = j == m or (i < n and a[i + 1] <= b[j + 1])
+        if i < n and j < m and flat:
+            o0, o1, i0, i1 = outer[i], outer[(i + 1) % n], inner[j % m], inner[(j + 1) % m]
+            outerFolds, innerFolds = turn(o0, o1, i0) <= 0, turn(o0, i1, i0) <= 0
+            if (outerFolds if nextOuter else innerFolds) and not (innerFolds if nextOuter else outerFolds):
+                nextOuter = not nextOuter
+        if nextOuter:
+            triangles.append((i, (i + 1) % n, n + j % m))
+            i += 1
+        else:
+            triangles.append((i % n, n + (j + 1) % m, n + j))
+            j += 1
+    return np.concatenate([outer, inner]), np.array(triangles, dtype=np.int64)
+
+# Outline of one cell, as outline() draws it, with the middle of each side added so the bottom
+# can be cut into quarters around the magnet holes
+def footRing(inset: float, y: float) -> np.ndarray:
+    arcs = outline(0, 0, slotDimension, slotDimension, inset, y).reshape(4, cornerSegments + 1, 3)
+    mids = (arcs[:, -1] + arcs[[1, 2, 3, 0], 0]) / 2
+    return np.concatenate([np.concatenate([arcs[n], mids[n][None, :]]) for n in range(4)])
+
+def circle(cx: float, cz: float, radius: float, y: float) -> np.ndarray:
+    a = np.linspace(0, 2 * math.pi, holeSegments, endpoint=False)
+    return np.stack([cx + radius * np.cos(a), np.full(holeSegments, y), cz + radius * np.sin(a)], axis=1)
+
+# One foot with its corner at the origin, open at the top where it joins the box
+def footMesh(includeMagnets: bool) -> Mesh:
+    mesh = Mesh()
+    sections = [(0, nestingRimWidth + baseLip), (baseLip, nestingRimWidth), (nestingDepth - nestingRimWidth, nestingRimWidth), (nestingDepth, 0)]
+    rings = [footRing(inset, y) for y, inset in sections]
+    mesh.add(*loft(rings))
+
+    down = np.array([0.0, -1.0, 0.0])
+    centre = np.array([[slotDimension / 2, 0, -slotDimension / 2]])
+    if not includeMagnets:
+        vertices = np.concatenate([rings[0], centre])
+        n = len(rings[0])
+        j = np.arange(n)
+        mesh.add(vertices, facing(vertices, np.stack([np.full(n, n), j, (j + 1) % n], axis=1), down))
+        return mesh
+
+    # The bottom in quarters, each round one hole, which goes up to a flat top
+    side = cornerSegments + 2
+    holes = [(slotDimension - holeOffset, -holeOffset), (holeOffset, -holeOffset),
+             (holeOffset, -(slotDimension - holeOffset)), (slotDimension - holeOffset, -(slotDimension - holeOffset))]
+    for n, (hx, hz) in enumerate(holes):
+        quarter = np.concatenate([rings[0][[(n * side - 1) % len(rings[0])]], rings[0][n * side:(n + 1) * side], centre])
+        bottom, top = circle(hx, hz, magnetDiameter / 2, 0), circle(hx, hz, magnetDiameter / 2, magnetThickness)
+        vertices, triangles = stitch(quarter, bottom, (hx, hz))
+        mesh.add(vertices, facing(vertices, triangles, down))
+        vertices, triangles = loft([bottom, top])
+        mesh.add(vertices, triangles[:, ::-1])
+        vertices = np.concatenate([top, [[hx, magnetThickness, hz]]])
+        j = np.arange(holeSegments)
+        mesh.add(vertices, facing(vertices, np.stack([np.full(holeSegments, holeSegments), j, (j + 1) % holeSegments], axis=1), down))
+    return mesh
+
+# The underside of the box between the feet, round one grid point. Each foot's corner arc runs
+# round the point; with fewer than four feet (at the edge of the grid) the gap closes through the
+# point itself, which lies on the outer wall.
+def gapMesh(present: tuple) -> Mesh:
+    mesh = Mesh()
+    ring = footRing(0, nestingDepth)
+    side = cornerSegments + 2
+    # Cells round the point in turn, as (i, j) offsets with the corner of each that touches it
+    cells = [((0, 0), 1), ((-1, 0), 0), ((-1, -1), 3), ((0, -1), 2)]
+    arcs = []
+    for ((di, dj), corner), here in zip(cells, present):
+        arc = ring[corner * side:corner * side + cornerSegments + 1] + np.array([di * slotDimension, 0, -dj * slotDimension])
+        arcs.append(arc if here else None)
+    if sum(a is not None for a in arcs) < 2:
+        return mesh
+
+    # Start just after a missing foot, so the chain of arcs never wraps through one
+    closed = all(a is not None for a in arcs)
+    start = 0 if closed else next((n + 1) % 4 for n in range(4) if arcs[n] is None)
+    chain = []
+    for n in range(4):
+        arc = arcs[(start + n) % 4]
+        if arc is not None:
+            # Each arc starts where the one before it ended
+            chain.append(arc[1:] if chain else arc)
+    points = np.concatenate(chain)
+    if closed:
+        points = points[:-1]
+    k = len(points)
+    j = np.arange(k if closed else k - 1)
+    vertices = np.concatenate([points, [[0, nestingDepth, 0]]])
+    mesh.add(vertices, facing(vertices, np.stack([np.full(len(j), k), j, (j + 1) % k], axis=1), np.array([0.0, -1.0, 0.0])))
+    return mesh
+
+# Convex cells are kept as lists of faces, each an (n, 3) array of points running anticlockwise
+# seen from outside. Cutting one by a plane keeps the part where normal . p <= offset.
+def boxCell(x0: float, x1: float, y0: float, y1: float, z0: float, z1: float) -> list:
+    c = np.array([[x, y, z] for x in (x0, x1) for y in (y0, y1) for z in (z0, z1)])
+    return [c[[0, 1, 3, 2]], c[[4, 6, 7, 5]], c[[0, 4, 5, 1]], c[[2, 3, 7, 6]], c[[0, 2, 6, 4]], c[[1, 5, 7, 3]]]
+
+def cutCell(faces: list, normal: np.ndarray, offset: float) -> list:
+    distances = [face @ normal - offset for face in faces]
+    if all((d <= planeTolerance).all() for d in distances):
+        return faces
+    if all((d >= -planeTolerance).all() for d in distances):
+        return []
+
+    kept = []
+    onPlane = []
+    for face, d in zip(faces, distances):
+        points = []
+        for i in range(len(face)):
+            j = (i + 1) % len(face)
+            if d[i] <= planeTolerance:
+                points.append(face[i])
+                if d[i] >= -planeTolerance:
+                    onPlane.append(face[i])
+            if (d[i] < -planeTolerance and d[j] > planeTolerance) or (d[i] > planeTolerance and d[j] < -planeTolerance):
+                crossing = face[i] + d[i] / (d[i] - d[j]) * (face[j] - face[i])
+                points.append(crossing)
+                onPlane.append(crossing)
+        if len(points) >= 3:
+            kept.append(np.array(points))
+
+    # The new face, round its middle
+    cap = np.array(list({tuple(np.round(p / weldTolerance)): p for p in onPlane}.values()))
+    if len(cap) >= 3:
+        nx, ny, nz = normal
+        u = np.array([0, nz, -ny]) if abs(nx) < 0.9 else np.array([-nz, 0, nx])
+        v = np.array([ny * u[2] - nz * u[1], nz * u[0] - nx * u[2], nx * u[1] - ny * u[0]])
+        middle = cap.mean(axis=0)
+        kept.append(cap[np.argsort(np.arctan2((cap - middle) @ v, (cap - middle) @ u))])
+    return kept
+
+# Planes (normals and offsets) round a cavity that goes from inset0 at y0 to inset1 at y1, one per
+# side of the outline
+def outlinePlanes(width: float, depth: float, y0: float, inset0: float, y1: float, inset1: float):
+    bottom = outline(0, 0, width, depth, inset0, y0)
+    top = outline(0, 0, width, depth, inset1, y1)
+    normals = np.cross(np.roll(bottom, -1, axis=0) - bottom, top - bottom)
+    normals /= np.linalg.norm(normals, axis=1)[:, None]
+    outwards = np.einsum('ij,ij->i', normals[:, [0, 2]], bottom[:, [0, 2]] - [width / 2, -depth / 2]) > 0
+    normals[~outwards] *= -1
+    return normals, np.einsum('ij,ij->i', normals, bottom)
+
+# Inside of the box, as a list of faces: the cavity's convex cells, less the faces they share.
+# Faces across the open top are left out too.
+def cavityFaces(slotsWide: int, slotsDeep: int, slotsHigh: float, dividerCount: int, dividerCountDeep: int,
+                includeScoop: bool, includeLedge: bool) -> list:
+    width = slotsWide * slotDimension
+    depth = slotsDeep * slotDimension
+    height = slotsHigh * slotDimension
+    rimTop = height + nestingDepth - nestingVerticalClearance
+    ledgeTop = height - ledgeOffset
+
+    # The inside of the wall, bottom up
+    rimInset = nestingRimWidth - nestingVerticalClearance
+    lipInset = nestingRimWidth + baseLip - nestingVerticalClearance
+    profile = [(floorHeight, innerWallInset), (height - 2 * wallThickness, innerWallInset), (height - wallThickness, lipInset),
+               (height, lipInset), (height + baseLip - cornerVerticalOffset, rimInset),
+               (height + nestingDepth - nestingRimWidth - cornerVerticalOffset, rimInset), (rimTop, 0)]
+    heights = np.array([y for y, _ in profile])
+    insets = np.array([inset for _, inset in profile])
+    profile = [(y, float(np.interp(y, heights, insets))) for y in np.maximum(heights, floorHeight)]
+    bands = [(y0, i0, y1, i1) for (y0, i0), (y1, i1) in zip(profile, profile[1:]) if y1 > y0]
+
+    # The cavity is cut into cells at every divider face and height where the profile changes.
+    # Dividers fill their strips below the ledge's top; the ledge and scoop are extra planes for
+    # the cells below their tops, as (top, normals, offsets).
+    widthStrips = [(pos, pos + wallThickness) for pos in dividerPositions(dividerCount, width)]
+    deepStrips = [(-(pos + wallThickness), -pos) for pos in dividerPositions(dividerCountDeep, depth)]
+    extras = []
+    xs = [x for strip in widthStrips for x in strip]
+    zs = [z for strip in deepStrips for z in strip]
+    ys = [y for y, _ in profile]
+    if widthStrips or deepStrips:
+        ys.append(ledgeTop)
+    if includeLedge:
+        # Under the slope from the top of the ledge at the back to its tip against the front wall
+        drop = math.sin(ledgeAngle * math.pi / 180) * ledgeDepth
+        normal = np.array([0, 1, drop / ledgeDepth])
+        offset = ledgeTop - drop * (wallThickness + ledgeDepth) / ledgeDepth
+        extras.append((ledgeTop, normal[None, :] / np.linalg.norm(normal), np.array([offset / np.linalg.norm(normal)])))
+        zs.append(-(wallThickness + ledgeDepth))
+        ys.append(ledgeTop)
+    if includeScoop:
+        # Chords of the quarter round in the corner between the floor and the back wall
+        radius = height / 2
+        wall = -(depth - innerWallInset)
+        a = np.linspace(0, math.pi / 2, 4 * cornerSegments + 1)
+        arc = np.column_stack([floorHeight + radius - radius * np.cos(a), wall + radius - radius * np.sin(a)])
+        chords = np.diff(arc, axis=0)
+        normals = np.column_stack([np.zeros(len(chords)), -chords[:, 1], chords[:, 0]])
+        normals /= np.linalg.norm(normals, axis=1)[:, None]
+        offsets = np.einsum('ij,ij->i', normals[:, 1:], arc[:-1])
+        towardsCentre = np.einsum('ij,ij->i', normals[:, 1:], [floorHeight + radius, wall + radius] - arc[:-1]) > 0
+        normals[towardsCentre] *= -1
+        offsets[towardsCentre] *= -1
+        extras.append((floorHeight + radius, normals, offsets))
+        ys.append(floorHeight + radius)
+
+    edges = lambda values, low, high: [low] + sorted(set(values)) + [high]
+    xs = edges(xs, -1, width + 1)
+    zs = edges(zs, -depth - 1, 1)
+    ys = sorted(set(y for y in ys if floorHeight <= y <= rimTop))
+
+    faces = []
+    for (y0, i0, y1, i1) in bands:
+        normals, offsets = outlinePlanes(width, depth, y0, i0, y1, i1)
+        levels = [y for y in ys if y0 <= y <= y1]
+        for ya, yb in zip(levels, levels[1:]):
+            planes = [(normals, offsets)] + [(n, o) for top, n, o in extras if yb <= top + planeTolerance]
+            cellNormals = np.concatenate([n for n, _ in planes])
+            cellOffsets = np.concatenate([o for _, o in planes])
+            for xa, xb in zip(xs, xs[1:]):
+                for za, zb in zip(zs, zs[1:]):
+                    if yb <= ledgeTop + planeTolerance and ((xa, xb) in widthStrips or (za, zb) in deepStrips):
+                        continue
+                    cell = boxCell(xa, xb, ya, yb, za, zb)
+                    corners = np.concatenate([cell[0], cell[1]])
+                    cutting = ((corners @ cellNormals.T - cellOffsets) > planeTolerance).any(axis=0)
+                    for normal, offset in zip(cellNormals[cutting], cellOffsets[cutting]):
+                        cell = cutCell(cell, normal, offset)
+                        if not cell:
+                            break
+                    faces += cell
+
+    # Faces two cells share are inside the cavity, and so are the ones across the top
+    points, inverse = weld(np.concatenate(faces))
+    ids = np.split(inverse, np.cumsum([len(face) for face in faces])[:-1])
+    keys = [tuple(sorted(set(i.tolist()))) for i in ids]
+    counts = {}
+    for key in keys:
+        counts[key] = counts.get(key, 0) + 1
+    return [face for face, key in zip(faces, keys)
+            if counts[key] == 1 and len(key) >= 3 and not (np.abs(face[:, 1] - rimTop) < weldTolerance).all()]
+
+# Triangles of convex faces, each fanned from its middle
+def fanFaces(faces: list, mesh: Mesh, flip: bool = False):
+    for face in faces:
+        n = len(face)
+        j = np.arange(n)
+        triangles = np.stack([np.full(n, n), j, (j + 1) % n], axis=1)
+        mesh.add(np.concatenate([face, face.mean(axis=0)[None, :]]), triangles[:, ::-1] if flip else triangles)
+
+# Points of loops that lie on the outline of a width x depth box
+def onOutline(points: np.ndarray, width: float, depth: float) -> np.ndarray:
+    r = baseCornerRadius
+    q = np.abs(points[:, [0, 2]] - [width / 2, -depth / 2]) - [width / 2 - r, depth / 2 - r]
+    distance = np.linalg.norm(np.maximum(q, 0), axis=1) + np.minimum(q.max(axis=1), 0) - r
+    return np.abs(distance) < weldTolerance * 10
+
+# The box as buildFull() makes it, less the fillets, as one watertight solid: feet copied into every
+# cell, the floor and walls, and the dividers, ledge and scoop inside
+def boxMesh(slotsWide: int, slotsDeep: int, slotsHigh: float, dividerCount: int = 0, dividerCountDeep: int = 0,
+            includeScoop: bool = True, baseOnly: bool = False, includeLedge: bool = True, includeMagnets: bool = False) -> Mesh:
+    width = slotsWide * slotDimension
+    depth = slotsDeep * slotDimension
+    height = slotsHigh * slotDimension
+    parts = Mesh()
+
+    # One foot, copied into every cell at once
+    footVertices, footTriangles = footMesh(includeMagnets).arrays()
+    offsets = np.stack(np.meshgrid(np.arange(slotsWide) * slotDimension, [0.0], -np.arange(slotsDeep) * slotDimension, indexing='ij'), axis=-1).reshape(-1, 3)
+    feet = len(offsets)
+    parts.add((footVertices[None, :, :] + offsets[:, None, :]).reshape(-1, 3),
+              (footTriangles[None, :, :] + (np.arange(feet) * len(footVertices))[:, None, None]).reshape(-1, 3))
+
+    # The gaps between feet are the same at every inside grid point, and along each side
+    gaps = {}
+    for i in range(slotsWide + 1):
+        for j in range(slotsDeep + 1):
+            present = (i < slotsWide and j < slotsDeep, 0 < i and j < slotsDeep, 0 < i and 0 < j, i < slotsWide and 0 < j)
+            if present not in gaps:
+                gaps[present] = gapMesh(present).arrays()
+            gapVertices, gapTriangles = gaps[present]
+            if len(gapTriangles):
+                parts.add(gapVertices + [i * slotDimension, 0, -j * slotDimension], gapTriangles)
+
+    # Inside, and round the top
+    inside = Mesh()
+    if baseOnly:
+        top = outline(0, 0, width, depth, 0, nestingDepth + 1 * SCALE)
+        fanFaces([top[::-1]], inside)
+    else:
+        fanFaces(cavityFaces(slotsWide, slotsDeep, slotsHigh, dividerCount, dividerCountDeep, includeScoop, includeLedge), inside, True)
+        top = None
+
+    # The outer wall joins every point of the feet and gaps on the outline at the bottom to every
+    # point of the inside on it at the top
+    vertices, _ = weld(parts.arrays()[0])
+    bottom = vertices[(np.abs(vertices[:, 1] - nestingDepth) < weldTolerance) & onOutline(vertices, width, depth)]
+    if top is None:
+        vertices, _ = weld(inside.arrays()[0])
+        rimTop = height + nestingDepth - nestingVerticalClearance
+        top = vertices[np.abs(vertices[:, 1] - rimTop) < weldTolerance]
+    centre = (width / 2, -depth / 2)
+    vertices, triangles = stitch(bottom, top, centre)
+    corners = vertices[triangles].mean(axis=1)
+    outwards = np.column_stack([corners[:, 0] - centre[0], np.zeros(len(corners)), corners[:, 2] - centre[1]])
+    parts.add(vertices, facing(vertices, triangles, outwards))
+
+    # All one surface
+    vertexArrays, triangleArrays = parts.arrays()
+    insideVertices, insideTriangles = inside.arrays()
+    vertices, inverse = weld(np.concatenate([vertexArrays, insideVertices]))
+    triangles = inverse[np.concatenate([triangleArrays, insideTriangles + len(vertexArrays)])]
+    triangles = triangles[(triangles[:, 0] != triangles[:, 1]) & (triangles[:, 1] != triangles[:, 2]) & (triangles[:, 0] != triangles[:, 2])]
+    mesh = Mesh()
+    mesh.add(vertices, triangles)
+    return mesh
@@ -0,0 +1,274 @@
+#Author- Ben Laurie <ben@links.org>
+#Description- Build plans for gridfinity boxes: every sketch and feature, worked out without Fusion
+
+import math
+from collections import namedtuple
+
+from .boxspec import (SCALE, magnetDiameter, magnetThickness, baseCornerRadius, baseLip, slotDimension, nestingDepth,
+                      nestingRimWidth, wallThickness, holeOffset, ledgeOffset, ledgeDepth, ledgeAngle, edgeFilletRadius,
+                      nestingVerticalClearance, cornerVerticalOffset, innerWallInset, floorHeight, dividerPositions)
+
+# Ways of building the feet
+PATTERN_BASE = 'pattern'
+SLAB_BASE = 'slab'
+
+# Feature operations, named as in adsk.fusion.FeatureOperations
+JOIN = 'JoinFeatureOperation'
+CUT = 'CutFeatureOperation'
+NEW_BODY = 'NewBodyFeatureOperation'
+
+FOOT_TAPER = math.pi / 4  # Positive tapers narrow along the extrude
+# How far in the slab base's cells start at the top, to keep neighbours apart. The box's floor
+# covers the gap, and it's far too narrow to print.
+footSeam = 0.005
+
+# Sketch curves, in the sketch's own coordinates
+Line = namedtuple('Line', 'start end')
+Arc = namedtuple('Arc', 'centre start sweep')
+Circle = namedtuple('Circle', 'centre radius')
+Rectangle = namedtuple('Rectangle', 'corner opposite')
+
+# A sketch on the 'xY', 'xZ' or 'yZ' construction plane
+Sketch = namedtuple('Sketch', 'name plane curves')
+
+# Features. profiles and path name a sketch, or are a query for faces of the body. Extrudes with a
+# taper go the negative way; bodyName names the body a NEW_BODY extrude makes.
+Extrude = namedtuple('Extrude', 'profiles distance operation taper bodyName')
+Sweep = namedtuple('Sweep', 'profile path operation')
+Pattern = namedtuple('Pattern', 'wide deep spacing')
+Fillet = namedtuple('Fillet', 'edgeSets')
+EdgeSet = namedtuple('EdgeSet', 'edges radius tangentChain')
+RenameBody = namedtuple('RenameBody', 'name')
+
+# A copy of the design's library foot cell (see footCellPlan), which becomes the body
+FootCell = namedtuple('FootCell', 'includeMagnets')
+
+# Queries, only answerable once the body exists. among names the sketches whose features made the
+# faces to look at, so the rest of the body, feet and all, never has to be.
+HighestEdge = namedtuple('HighestEdge', 'among')
+EdgeAtHeight = namedtuple('EdgeAtHeight', 'among y minX maxX minZ')
+DividerEdges = namedtuple('DividerEdges', 'widthPositions deepPositions')
+
+def extrude(profiles, distance: float, operation: str, taper: float = None, bodyName: str = None) -> Extrude:
+    return Extrude(profiles, distance, operation, taper, bodyName)
+
+# What a step is called in build logs
+def stepName(step) -> str:
+    if isinstance(step, Pattern):
+        return 'Pattern {}x{}'.format(step.wide, step.deep)
+    if isinstance(step, FootCell):
+        return 'Foot Cell with magnets' if step.includeMagnets else 'Foot Cell'
+    if isinstance(step, Fillet):
+        return 'Fillet ' + ' '.join(type(edgeSet.edges).__name__ for edgeSet in step.edgeSets)
+    return '{} {}'.format(type(step).__name__, step[0])
+
+# The curves of a rounded rect with its corner at (x, y), in path order
+def curvedRect(x: float, y: float, width: float, depth: float, radius: float, z: float) -> list:
+    p = lambda px, py: (x + px, y + py, z)
+    l0 = Line(p(radius, 0), p(width - radius, 0))
+    l1 = Line(p(width, radius), p(width, depth - radius))
+    l2 = Line(p(width - radius, depth), p(radius, depth))
+    l3 = Line(p(0, depth - radius), p(0, radius))
+    a0 = Arc(p(radius, radius), p(0, radius), math.pi / 2)
+    a1 = Arc(p(width - radius, radius), p(width - radius, 0), math.pi / 2)
+    a2 = Arc(p(width - radius, depth - radius), p(width, depth - radius), math.pi / 2)
+    a3 = Arc(p(radius, depth - radius), p(radius, depth), math.pi / 2)
+
+    # These have to be in exactly the right order
+    return [l3, a3, l2, a2, l1, a1, l0, a0]
+
+# inset shrinks the rect (and its corner radius) by the same amount on every side
+def curvedRectSketch(name: str, width: float, depth: float, radius: float, z: float, inset: float = 0) -> Sketch:
+    return Sketch(name, 'xZ', tuple(curvedRect(inset, inset, width - 2 * inset, depth - 2 * inset, radius - inset, z)))
+
+def baseRectSketch() -> Sketch:
+    return Sketch("Base Sketch", 'xZ', (Rectangle((0, 0, 0), (slotDimension, slotDimension, 0)),))
+
+def magnetHolesSketch(slotsWide: int = 1, slotsDeep: int = 1) -> Sketch:
+    curves = []
+    for i in range(slotsWide):
+        for j in range(slotsDeep):
+            x = i * slotDimension
+            y = j * slotDimension
+            for cx, cy in [(holeOffset, holeOffset), (slotDimension - holeOffset, holeOffset),
+                           (slotDimension - holeOffset, slotDimension - holeOffset), (holeOffset, slotDimension - holeOffset)]:
+                curves.append(Circle((x + cx, y + cy, 0), magnetDiameter / 2.))
+    return Sketch("Magnet Holes Sketch", 'xZ', tuple(curves))
+
+# One rounded rect per grid cell, each inset from the cell edges. Every inset is at least
+# footSeam, so no two cells touch: cells that did would share lines and make one region, which
+# the taper would only slope around the outside of.
+def footCellsSketch(name: str, slotsWide: int, slotsDeep: int, inset: float, z: float) -> Sketch:
+    curves = []
+    for i in range(slotsWide):
+        for j in range(slotsDeep):
+            curves += curvedRect(i * slotDimension + inset, j * slotDimension + inset, slotDimension - 2 * inset, slotDimension - 2 * inset,
+                                 baseCornerRadius - inset, z)
+    return Sketch(name, 'xZ', tuple(curves))
+
+def edgeProfileSketch() -> Sketch:
+    h = -slotDimension / 2
+    p0 = (-1, 0, h)
+    p1a = (-1, nestingDepth, h)
+    p1 = (0, nestingDepth, h)
+    p2 = (nestingRimWidth + baseLip, 0, h)
+    p3 = (nestingRimWidth, baseLip, h)
+    p4 = (nestingRimWidth, nestingDepth - nestingRimWidth, h)
+    return Sketch("Edge Profile Sketch", 'xY', (Line(p0, p1a), Line(p1a, p1), Line(p0, p2), Line(p2, p3), Line(p1, p4), Line(p4, p3)))
+
+# Top of the rim, and how far in from the outside it starts on top of the wall
+def rimTop(slotsHigh: float) -> float:
+    return slotsHigh * slotDimension + nestingDepth - nestingVerticalClearance
+
+rimInset = nestingRimWidth + baseLip - nestingVerticalClearance
+
+# What comes off a wall extruded right up to the top of the rim, to leave the rim and the indent
+# in the lower part of the wall: two profiles, swept round together
+def wallSketch(slotsHigh: float) -> Sketch:
+    h = -slotDimension / 2
+    top = slotsHigh * slotDimension
+    # Above the rim's profile
+    p0 = (rimInset, rimTop(slotsHigh), h)
+    p1 = (0, rimTop(slotsHigh), h)
+    p2 = (nestingRimWidth - nestingVerticalClearance, top + nestingDepth - nestingRimWidth - cornerVerticalOffset, h)
+    p3 = (nestingRimWidth - nestingVerticalClearance, top + baseLip - cornerVerticalOffset, h)
+    p4 = (rimInset, top, h)
+    # The indent. Note that this is wallThickness below p4
+    q0 = (rimInset, top - wallThickness, h)
+    q1 = (rimInset - wallThickness, top - 2 * wallThickness, h)
+    # FIXME: fillet this edge
+    q2 = (rimInset - wallThickness, floorHeight, h)
+    q3 = (rimInset, floorHeight, h)
+    return Sketch("Wall Sketch", 'xY', (Line(p0, p1), Line(p1, p2), Line(p2, p3), Line(p3, p4), Line(p4, p0),
+                                        Line(q0, q1), Line(q1, q2), Line(q2, q3), Line(q3, q0)))
+
+def ledgeSketch(slotsHigh: float) -> Sketch:
+    h = wallThickness
+    y = slotDimension * slotsHigh - ledgeOffset
+    d = math.sin(ledgeAngle * math.pi / 180) * ledgeDepth
+    p0 = (wallThickness, y, h)
+    p1 = (wallThickness + ledgeDepth, y, h)
+    p2 = (wallThickness, y - d, h)
+    return Sketch("Ledge Sketch", 'yZ', (Line(p0, p1), Line(p1, p2), Line(p2, p0)))
+
+# Footprints of all the dividers at floor level, so they can be extruded together.
+# widthPositions split the width (dividers run front to back), deepPositions split the depth.
+def dividersSketch(widthPositions: list, deepPositions: list, slotsWide: int, slotsDeep: int) -> Sketch:
+    curves = []
+    for pos in widthPositions:
+        curves.append(Rectangle((pos, 0, nestingDepth), (pos + wallThickness, slotsDeep * slotDimension, nestingDepth)))
+    for pos in deepPositions:
+        curves.append(Rectangle((0, pos, nestingDepth), (slotsWide * slotDimension, pos + wallThickness, nestingDepth)))
+    return Sketch("Dividers Sketch", 'xZ', tuple(curves))
+
+# One foot, which depends on nothing but the magnets and the constants in boxspec. It's built once
+# per design into a hidden library component, and every pattern base starts from a copy of it.
+def footCellPlan(includeMagnets: bool) -> tuple:
+    plan = [baseRectSketch(), extrude("Base Sketch", nestingDepth, NEW_BODY, bodyName="Base")]
+    if includeMagnets:
+        plan += [magnetHolesSketch(), extrude("Magnet Holes Sketch", magnetThickness, CUT)]
+    plan += [edgeProfileSketch(), curvedRectSketch("Base Sweep Sketch", slotDimension, slotDimension, baseCornerRadius, 0),
+             Sweep("Edge Profile Sketch", "Base Sweep Sketch", CUT)]
+    return tuple(plan)
+
+# What footCellPlan() builds from, so a library foot from different constants is never used
+def footCellSettings(includeMagnets: bool) -> dict:
+    return {'includeMagnets': includeMagnets, 'slotDimension': slotDimension, 'nestingDepth': nestingDepth,
+            'nestingRimWidth': nestingRimWidth, 'baseLip': baseLip, 'baseCornerRadius': baseCornerRadius,
+            'magnetDiameter': magnetDiameter, 'magnetThickness': magnetThickness, 'holeOffset': holeOffset}
+
+def patternBasePlan(slotsWide: int, slotsDeep: int, includeMagnets: bool) -> list:
+    plan = [FootCell(includeMagnets)]
+    if slotsWide > 1 or slotsDeep > 1:
+        plan.append(Pattern(slotsWide, slotsDeep, slotDimension))
+    return plan
+
+# All the feet at once, as three layers of tapered cells, built top down so both chamfers narrow in
+# the direction of the extrude (same shape as the edge profile in patternBasePlan). The top chamfer
+# starts footSeam in, and so stops footSeam short of its full height, where the middle layer takes over.
+# Each layer is one sketch and one extrude however many cells, so there's no pattern or combine, but
+# the sketches still draw every cell: it saves features and Fusion's compute, not API calls.
+def slabBasePlan(slotsWide: int, slotsDeep: int, includeMagnets: bool) -> list:
+    chamferTop = nestingDepth - nestingRimWidth + footSeam
+    layers = [
+        ("Foot Top Sketch", footSeam, nestingDepth, nestingRimWidth - footSeam, FOOT_TAPER, NEW_BODY),
+        ("Foot Middle Sketch", nestingRimWidth, chamferTop, chamferTop - baseLip, 0, JOIN),
+        ("Foot Bottom Sketch", nestingRimWidth, baseLip, baseLip, FOOT_TAPER, JOIN),
+    ]
+    plan = []
+    for name, inset, top, height, taper, operation in layers:
+        plan += [footCellsSketch(name, slotsWide, slotsDeep, inset, top),
+                 extrude(name, height, operation, taper, "Base" if operation == NEW_BODY else None)]
+    if includeMagnets:
+        plan += [magnetHolesSketch(slotsWide, slotsDeep), extrude("Magnet Holes Sketch", magnetThickness, CUT)]
+    return plan
+
+# Everything buildFull() does, in order. However many cells and dividers, and whichever options,
+# the box itself is three features for the walls, rim and hole, one for the ledge and one fillet,
+# and the dividers one extrude and one fillet. The sizes are taken as given: boxProblems() is what
+# turns down ones that can't be built, and has to have passed them.
+def boxPlan(boxName: str, slotsWide: int, slotsDeep: int, slotsHigh: float, dividerCount: int = 0, dividerCountDeep: int = 0,
+            includeScoop: bool = True, baseOnly: bool = False, includeLedge: bool = True, includeMagnets: bool = False,
+            baseBuilder: str = PATTERN_BASE) -> tuple:
+    width = slotsWide * slotDimension
+    depth = slotsDeep * slotDimension
+    height = slotsHigh * slotDimension
+
+    if baseBuilder == SLAB_BASE:
+        plan = slabBasePlan(slotsWide, slotsDeep, includeMagnets)
+    else:
+        plan = patternBasePlan(slotsWide, slotsDeep, includeMagnets)
+
+    # Now the box
+    plan.append(curvedRectSketch("Box Profile", width, depth, baseCornerRadius, nestingDepth))
+    if baseOnly:
+        plan.append(extrude("Box Profile", 1*SCALE, JOIN))
+        return tuple(plan)
+    # The walls, right up to the top of the rim. Then the hole in the box, and the rim and the
+    # indent in the lower part of the walls, which leaves a rim around the top, cut in one sweep.
+    top = rimTop(slotsHigh)
+    plan += [extrude("Box Profile", top - nestingDepth, JOIN),
+             curvedRectSketch("Hole Sketch", width, depth, baseCornerRadius, top, rimInset),
+             extrude("Hole Sketch", -(top - floorHeight), CUT),
+             wallSketch(slotsHigh), Sweep("Wall Sketch", "Box Profile", CUT)]
+
+    if includeLedge:
+        plan += [ledgeSketch(slotsHigh), extrude("Ledge Sketch", width - wallThickness * 2, JOIN)]
+
+    # One fillet for the top edge of the rim and the curved scoop along the bottom of the back wall,
+    # both edges of faces the sweep made
+    walls = ("Wall Sketch",)
+    edgeSets = [EdgeSet(HighestEdge(walls), edgeFilletRadius, True)]
+    if includeScoop:
+        scoopEdge = EdgeAtHeight(walls, floorHeight, baseCornerRadius, width - baseCornerRadius, -(depth - innerWallInset))
+        edgeSets.append(EdgeSet(scoopEdge, height / 2, False))
+    plan.append(Fillet(tuple(edgeSets)))
+
+    # Now we're a box. :-)
+    plan.append(RenameBody(boxName))
+
+    # Finally, dividers: one sketch, one extrude and one fillet however many there are. Their
+    # fillet can't join the one above: dividers across the width run into the scoop, which has to
+    # be there first.
+    widthPositions = tuple(dividerPositions(dividerCount, width))
+    deepPositions = tuple(dividerPositions(dividerCountDeep, depth))
+    if widthPositions or deepPositions:
+        plan += [dividersSketch(widthPositions, deepPositions, slotsWide, slotsDeep),
+                 extrude("Dividers Sketch", height - ledgeOffset - nestingDepth, JOIN),
+                 Fillet((EdgeSet(DividerEdges(widthPositions, deepPositions), edgeFilletRadius, True),))]
+
+    return tuple(plan)
+
+# buildDraft()'s plan: one extrude for feet and wall together, up to the top of the rim, and a hole
+# down to the floor at the final inner wall thickness
+def draftPlan(boxName: str, slotsWide: int, slotsDeep: int, slotsHigh: float, baseOnly: bool = False) -> tuple:
+    width = slotsWide * slotDimension
+    depth = slotsDeep * slotDimension
+    footprint = curvedRectSketch("Draft Footprint", width, depth, baseCornerRadius, 0)
+    if baseOnly:
+        return (footprint, extrude("Draft Footprint", nestingDepth + 1*SCALE, NEW_BODY))
+
+    top = rimTop(slotsHigh)
+    return (footprint, extrude("Draft Footprint", top, NEW_BODY, bodyName=boxName),
+            curvedRectSketch("Draft Hole", width, depth, baseCornerRadius, top, innerWallInset),
+            extrude("Draft Hole", -(top - floorHeight), CUT))
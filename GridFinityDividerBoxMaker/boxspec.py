@@ -0,0 +1,65 @@
+#Author- Ben Laurie <ben@links.org>
+#Description- Gridfinity sizes, shared by the Fusion script and anything that runs without Fusion
+
+# Why?
+SCALE = 0.1
+
+magnetDiameter = 6.5 * SCALE * 0.75
+magnetThickness = 2.5 * SCALE * 0.75
+
+# Sizes!
+baseCornerRadius = 4 * SCALE
+baseLip = .8 * SCALE
+slotDimension = 42 * SCALE
+nestingDepth = 5 * SCALE
+nestingRimWidth = 2.4 * SCALE
+nestingClearance = .25 * SCALE
+wallThickness = 1.2 * SCALE
+holeOffset = 8 * SCALE
+ledgeOffset = 0.2 * SCALE
+ledgeDepth = 16 * SCALE
+ledgeAngle = 54
+ledgeMinSlotsHigh = 0.43  # Lower boxes have no room for the ledge
+edgeFilletRadius = .6 * SCALE  # The top of the rim and the dividers' edges
+
+# Box defaults, as the dialog starts out. Foot is 6mm high
+#
+defaultBoxName = "Box"
+defaultSlotsWide = 2
+defaultSlotsDeep = 2
+
+# Miles'
+#
+defaultSlotsHigh = 1.31
+
+# 52" Husky case 
+#
+defaultSlotsHigh = 1.45
+
+# 62" Husky case 
+#
+# defaultSlotsHigh = 1.25
+
+defaultDividerCount = 0
+defaultDividerCountDeep = 0
+defaultBaseOnly = False
+defaultIncludeScoop = True
+defaultIncludeLedge = True
+defaultIncludeMagnets = False
+
+# The range the dialog's Slots High takes
+#
+minSlotsHigh = 0.25
+maxSlotsHigh = 10.0
+
+# Derived sizes
+nestingVerticalClearance = nestingClearance * 1.416  # Empirically determined from original sketch
+cornerVerticalOffset = nestingClearance * .416  # Empirically determined from existing sketch
+innerWallInset = nestingRimWidth + baseLip - nestingVerticalClearance - wallThickness  # Inside of the wall below the rim
+floorHeight = nestingDepth + wallThickness + 1 * SCALE  # FIXME: the + 1 * SCALE is ad hoc (but copied from the original)
+
+# Where count evenly spaced dividers start along a side of the given (outside) length
+# FIXME: these end up not *quite* the same size
+def dividerPositions(count: int, length: float) -> list:
+    l = length - 2 * wallThickness
+    return [(n + 1) * l / (count + 1) + wallThickness / 2 for n in range(count)]
@@ -0,0 +1,94 @@
+#Author-
+#Description- Per-stage timings of a build, appended to a JSON-lines log so slow builds can be looked at afterwards
+
+import cProfile
+import datetime
+import json
+import os
+import sys
+import time
+
+# Counts calls into the API while installed as the profile function. A call counts if it's into a
+# Python file of the adsk package, or a C function of an adsk module, and comes from outside adsk.
+class ApiCallCounter:
+    def __init__(self, apiDirectory: str):
+        self.apiDirectory = apiDirectory
+        self.count = 0
+
+    def __call__(self, frame, event, arg):
+        if event == 'call':
+            caller = frame.f_back
+            if frame.f_code.co_filename.startswith(self.apiDirectory) and not (caller and caller.f_code.co_filename.startswith(self.apiDirectory)):
+                self.count += 1
+        elif event == 'c_call':
+            if (getattr(arg, '__module__', None) or '').startswith('adsk') and not frame.f_code.co_filename.startswith(self.apiDirectory):
+                self.count += 1
+
+# One build: start() it, call stage() at the end of every stage, and finish() it. Counting API calls
+# slows Python down a little; with profilePath set a cProfile of the whole build is saved there
+# instead, and the per-stage call counts are left out.
+class BuildLog:
+    def __init__(self, path: str, maker: str, parameters: dict, apiDirectory: str = None, profilePath: str = None, preview: bool = False):
+        self.path = path
+        self.maker = maker
+        self.parameters = parameters
+        self.profilePath = profilePath
+        self.preview = preview
+        self.counter = ApiCallCounter(apiDirectory) if apiDirectory and not profilePath else None
+        self.profiler = None
+        self.previousProfile = None
+        self.stages = []
+
+    def start(self):
+        self.stages = []
+        if self.profilePath:
+            self.profiler = cProfile.Profile()
+            self.profiler.enable()
+        elif self.counter:
+            self.previousProfile = sys.getprofile()
+            sys.setprofile(self.counter)
+        self.started = self.mark = time.perf_counter()
+        self.counted = 0
+
+    # The body's edge and face counts are fetched outside the stage's time and call count
+    def stage(self, name: str, body=None):
+        record = {'stage': name, 'seconds': round(time.perf_counter() - self.mark, 6)}
+        if self.counter:
+            record['apiCalls'] = self.counter.count - self.counted
+        if body is not None:
+            record['edges'] = body.edges.count
+            record['faces'] = body.faces.count
+        self.stages.append(record)
+        self.mark = time.perf_counter()
+        if self.counter:
+            self.counted = self.counter.count
+
+    # outcome is 'built', 'reused', 'copied', 'invalid', 'stale' or 'failed'. A log that can't be written never fails the build.
+    def finish(self, outcome: str):
+        seconds = time.perf_counter() - self.started
+        if self.profiler:
+            self.profiler.disable()
+        elif self.counter:
+            sys.setprofile(self.previousProfile)
+
+        entry = {
+            'time': datetime.datetime.now().isoformat(timespec='seconds'),
+            'maker': self.maker,
+            'preview': self.preview,
+            'outcome': outcome,
+            'seconds': round(seconds, 6),
+            'parameters': self.parameters,
+            'stages': self.stages,
+        }
+        if self.counter:
+            entry['apiCalls'] = self.counter.count
+        try:
+            if self.profiler:
+                os.makedirs(os.path.dirname(self.profilePath), exist_ok=True)
+                self.profiler.dump_stats(self.profilePath)
+                entry['profile'] = self.profilePath
+            with open(self.path, 'a') as f:
+                f.write(json.dumps(entry) + '\n')
+        except OSError:
+            pass
+        return entry
@@ -0,0 +1,148 @@
+#Author- Ben Laurie <ben@links.org>
+#Description- Packs a demand list of boxes into a drawer on the gridfinity grid
+
+import math
+from collections import namedtuple
+
+from .boxspec import SCALE, slotDimension, nestingDepth, nestingVerticalClearance, maxSlotsHigh
+
+# A box at a grid position; column runs across the drawer's width and row back to front. spec
+# holds the Box fields, turned round if the box was.
+Placement = namedtuple('Placement', 'column row spec')
+# optimal is False if the search ran out of nodes before it could be sure nothing better exists
+Layout = namedtuple('Layout', 'columns rows placements unplaced optimal')
+
+# Search nodes before settling for the best layout found so far; about a tenth of a second
+defaultNodeLimit = 20000
+
+# Whole grid cells in a drawer, and the tallest slotsHigh that fits (to 0.01, and no more than the
+# dialog takes) if the height is given. Sizes in mm. A drawer exactly some cells wide is, even
+# though 42mm isn't exact in cm.
+def drawerGrid(width: float, depth: float, height: float = None) -> tuple:
+    def cellsIn(size: float) -> int:
+        return math.floor(round(size * SCALE / slotDimension, 9))
+    columns = cellsIn(width)
+    rows = cellsIn(depth)
+    if height is None:
+        return columns, rows, None
+    boxTop = nestingDepth - nestingVerticalClearance
+    return columns, rows, min(math.floor(round((height * SCALE - boxTop) / slotDimension * 100, 9)) / 100, maxSlotsHigh)
+
+# The spec turned through a right angle, dividers and all
+def turned(spec: dict) -> dict:
+    spec = dict(spec, slotsWide=spec['slotsDeep'], slotsDeep=spec['slotsWide'])
+    if 'dividerCount' in spec or 'dividerCountDeep' in spec:
+        spec['dividerCount'], spec['dividerCountDeep'] = spec.get('dividerCountDeep', 0), spec.get('dividerCount', 0)
+    return spec
+
+# Places as much of the demand, by area, as fits in columns x rows. demand is a list of Box
+# specs, each with slotsWide, slotsDeep and optionally a count. Boxes go in one at a time at the
+# lowest, then leftmost, free cell of a skyline, trying the biggest first, then leaving the cell
+# empty. Branches that can't place more than the best so far, even if every column filled up as
+# far as boxes' depths can add up to, are cut, and skylines already seen with the same boxes left
+# aren't searched again. With rotate, boxes may be turned; with
+# fillGaps, the cells left over are filled with boxes made to fit.
+def layoutDrawer(columns: int, rows: int, demand: list, rotate: bool = True, fillGaps: bool = False,
+                 nodeLimit: int = defaultNodeLimit) -> Layout:
+    specs = [dict(spec) for spec in demand]
+    counts = tuple(spec.pop('count', 1) for spec in specs)
+    shapes = []
+    for spec in specs:
+        shape = [(spec['slotsWide'], spec['slotsDeep'])]
+        if rotate and spec['slotsWide'] != spec['slotsDeep']:
+            shape.append((spec['slotsDeep'], spec['slotsWide']))
+        shapes.append(shape)
+    areas = [spec['slotsWide'] * spec['slotsDeep'] for spec in specs]
+    # Biggest first, so the first layout tried is a good one
+    order = sorted(range(len(specs)), key=lambda n: -areas[n])
+    target = min(sum(a * c for a, c in zip(areas, counts)), columns * rows)
+
+    # The most of each height of column that boxes' depths can add up to, whichever boxes they are
+    depths = {d for shape in shapes for _, d in shape}
+    reachable = [True] + [False] * rows
+    for h in range(1, rows + 1):
+        reachable[h] = any(d <= h and reachable[h - d] for d in depths)
+    fill = [max(k for k in range(h + 1) if reachable[k]) for h in range(rows + 1)]
+
+    best = {'area': -1, 'placed': None}
+    seen = set()
+    nodes = 0
+    placed = []
+
+    def search(heights: tuple, counts: tuple, area: int) -> bool:
+        nonlocal nodes
+        nodes += 1
+        if area > best['area']:
+            best['area'], best['placed'] = area, list(placed)
+        if area == target or nodes > nodeLimit:
+            return True
+        free = sum(fill[rows - h] for h in heights)
+        left = sum(a * c for a, c in zip(areas, counts))
+        if area + min(free, left) <= best['area'] or (heights, counts) in seen:
+            return False
+        seen.add((heights, counts))
+
+        h = min(heights)
+        column = heights.index(h)
+        run = 1
+        while column + run < columns and heights[column + run] == h:
+            run += 1
+        fits = False
+        for n in order:
+            if not counts[n]:
+                continue
+            for turn, (w, d) in enumerate(shapes[n]):
+                if w > run or h + d > rows:
+                    continue
+                fits = True
+                placed.append((column, h, n, turn))
+                raised = heights[:column] + (h + d,) * w + heights[column + w:]
+                if search(raised, counts[:n] + (counts[n] - 1,) + counts[n + 1:], area + areas[n]):
+                    return True
+                placed.pop()
+
+        # Leave the cell empty. If nothing fits the run at all, none of it can be used.
+        if fits:
+            raised = heights[:column] + (h + 1,) + heights[column + 1:]
+        else:
+            neighbours = [heights[column - 1]] if column else []
+            if column + run < columns:
+                neighbours.append(heights[column + run])
+            level = min(neighbours) if neighbours else rows
+            raised = heights[:column] + (level,) * run + heights[column + run:]
+        return search(raised, counts, area)
+
+    search((0,) * columns, counts, 0)
+
+    placements = []
+    used = list(counts)
+    for column, row, n, turn in best['placed']:
+        placements.append(Placement(column, row, turned(specs[n]) if turn else dict(specs[n])))
+        used[n] -= 1
+    unplaced = [dict(specs[n], count=c) for n, c in enumerate(used) if c]
+    if fillGaps:
+        placements += gapFillers(columns, rows, placements)
+    return Layout(columns, rows, placements, unplaced, nodes <= nodeLimit)
+
+# Boxes covering every cell no placement covers, each as wide and then as deep as it can go
+def gapFillers(columns: int, rows: int, placements: list) -> list:
+    taken = [[False] * columns for _ in range(rows)]
+    for column, row, spec in placements:
+        for r in range(row, row + spec['slotsDeep']):
+            for c in range(column, column + spec['slotsWide']):
+                taken[r][c] = True
+    fillers = []
+    for row in range(rows):
+        for column in range(columns):
+            if taken[row][column]:
+                continue
+            w = 1
+            while column + w < columns and not taken[row][column + w]:
+                w += 1
+            d = 1
+            while row + d < rows and not any(taken[row + d][column:column + w]):
+                d += 1
+            for r in range(row, row + d):
+                taken[r][column:column + w] = [True] * w
+            fillers.append(Placement(column, row, {'boxName': 'Filler', 'slotsWide': w, 'slotsDeep': d}))
+    return fillers
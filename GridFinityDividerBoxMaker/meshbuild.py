@@ -0,0 +1,53 @@
+#Author-
+#Description- Triangle meshes built with NumPy: shells, welding them into one surface, and preview buffers
+
+import numpy as np
+
+# Points closer than this are the same point
+weldTolerance = 1e-7
+
+# A bag of triangle shells. They may overlap, which is fine for looking at but not for anything
+# that needs a single watertight solid; shells that meet exactly can be welded into one.
+class Mesh:
+    def __init__(self):
+        self.vertexArrays = []
+        self.triangleArrays = []
+        self.vertexCount = 0
+
+    def add(self, vertices: np.ndarray, triangles: np.ndarray):
+        self.vertexArrays.append(vertices)
+        self.triangleArrays.append(triangles + self.vertexCount)
+        self.vertexCount += len(vertices)
+
+    # All the shells as one (n, 3) float vertex array and one (m, 3) int triangle array
+    def arrays(self):
+        if not self.vertexArrays:
+            return np.zeros((0, 3)), np.zeros((0, 3), dtype=np.int64)
+        return np.concatenate(self.vertexArrays), np.concatenate(self.triangleArrays)
+
+# Shared vertices and triangles indexing them, from (n, 3) points with duplicates
+def weld(points: np.ndarray):
+    keys = np.round(points / weldTolerance).astype(np.int64)
+    _, first, inverse = np.unique(keys, axis=0, return_index=True, return_inverse=True)
+    return points[first], inverse.reshape(-1)
+
+# Turns round any triangle whose normal points against direction (one vector, or one per triangle)
+def facing(vertices: np.ndarray, triangles: np.ndarray, direction) -> np.ndarray:
+    corners = vertices[triangles]
+    normals = np.cross(corners[:, 1] - corners[:, 0], corners[:, 2] - corners[:, 0])
+    backwards = np.einsum('ij,ij->i', normals, np.broadcast_to(direction, normals.shape)) < 0
+    triangles = triangles.copy()
+    triangles[backwards] = triangles[backwards][:, ::-1]
+    return triangles
+
+# Unshared vertices with one normal per triangle, so edges stay sharp. Returns flat coordinate,
+# index and normal arrays, ready for CustomGraphicsCoordinates and addMesh().
+def flatBuffers(mesh: Mesh):
+    vertices, triangles = mesh.arrays()
+    corners = vertices[triangles]
+    normals = np.cross(corners[:, 1] - corners[:, 0], corners[:, 2] - corners[:, 0])
+    lengths = np.linalg.norm(normals, axis=1)
+    normals = normals / np.where(lengths > 0, lengths, 1)[:, None]
+    coordinates = corners.reshape(-1)
+    indices = np.arange(len(triangles) * 3, dtype=np.int64)
+    return coordinates, indices, np.repeat(normals, 3, axis=0).reshape(-1)
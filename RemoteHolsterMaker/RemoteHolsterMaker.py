@@ -1,9 +1,30 @@
 #Author-
 #Description-
 
+import json
 import math
+import os
+import time
 import adsk.core, adsk.fusion, adsk.cam, traceback
 
+from .holsterspec import (SCALE, defaultHolsterName, defaultRemoteWidth, defaultRemoteLength, defaultRemoteThickness,
+                          defaultFrontSlotWidth, defaultFrontHeight, defaultBackCornerRound, defaultSoftenFillet,
+                          defaultFrontSlotRound, defaultSideThickness, defaultBackThickness, defaultBottomThickness,
+                          defaultTolerance, defaultIncludeScrewHoles, screwHoleRadius, screwHeadRadius)
+from .holsterplan import (Circle, Rectangle, Sketch, Extrude, Fillet, CounterboredHole, OtherEdges, FaceAtDepth, holsterPlan,
+                          stepName)
+from .holstercheck import holsterProblems
+from .buildlog import BuildLog
+from .catalog import convert
+from .fusionutil import createComponent, shapeHash, tagComponent, reuseComponent, close, TopologyIndex, StaleBuild, InputDebouncer
+
+# NumPy isn't part of Fusion's own Python; without it previews are built as B-Rep
+try:
+    from .holstermesh import holsterMesh
+    from .meshbuild import flatBuffers
+except ImportError:
+    holsterMesh = None
+
 #############################################
 # Globals
 #############################################
@@ -13,44 +34,19 @@ _des = adsk.fusion.Design.cast(None)
 _handlers = []
 _commandId = 'Remote Holster Maker'
 
-#############################################
-# Default Values
-#############################################
-
-defaultHolsterName = "TV Remote Holster"
-
-# Remote Details
-#
-defaultRemoteWidth = 80.0
-defaultRemoteLength = 44.0
-defaultRemoteThickness = 15.0
+# Every build is logged here, one JSON object per line; profiles go in the directory below it
+_buildLogPath = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'build-log.jsonl')
+_profileDirectory = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'profiles')
 
-# Holster Details
-#
-defaultFrontSlotWidth = 10.0
-defaultFrontHeight = 22.0
-
-# Holster Appearance
-#
-defaultBackCornerRound = 4.0
-defaultSoftenFillet = 0.5
-defaultFrontSlotRound = 3.0
-
-# Holster Strength
-#
-defaultSideThickness = 3.0
-defaultBackThickness = 3.0
-defaultBottomThickness = 3.0
-
-# Tolerance
-#
-defaultTolerance = 0.5
+# Spinner drags fire a preview per step; only rebuild once the inputs have been quiet this long
+_debounceDelay = 0.3
+_debounceEventId = _commandId + '_debounce'
 
 #############################################
 # Global Command inputs
 #############################################
 
-_holsterName       = adsk.core.StringValueCommandInput.cast(None)
+_holsterName       = defaultHolsterName
 _remoteWidth       = adsk.core.FloatSpinnerCommandInput.cast(None)
 _remoteLength      = adsk.core.FloatSpinnerCommandInput.cast(None)
 _remoteThickness   = adsk.core.FloatSpinnerCommandInput.cast(None)
@@ -63,7 +59,15 @@ _sideThickness     = adsk.core.FloatSpinnerCommandInput.cast(None)
 _backThickness     = adsk.core.FloatSpinnerCommandInput.cast(None)
 _bottomThickness   = adsk.core.FloatSpinnerCommandInput.cast(None)
 _tolerance         = adsk.core.IntegerSliderCommandInput.cast(None)
-_includeScrewHoles = True
+_includeScrewHoles = defaultIncludeScrewHoles
+_fastBuild         = False
+_transientEngine   = False
+_meshPreview       = True
+_profileBuild      = False
+_catalogPath       = ''
+
+# Set while building in fast mode, see createSketch
+_deferSketchCompute = False
 
 #############################################
 # Global Command Groups
@@ -82,18 +86,12 @@ _toleranceGroup          = adsk.core.GroupCommandInput.cast(None)
 CUT = adsk.fusion.FeatureOperations.CutFeatureOperation
 JOIN = adsk.fusion.FeatureOperations.JoinFeatureOperation
 NEW_BODY = adsk.fusion.FeatureOperations.NewBodyFeatureOperation
-SCALE = 0.1
 
 #############################################
 # Utility Functions
 #############################################
-def createComponent(design: adsk.fusion.Design, name: str) -> adsk.fusion.Component:
-    rootComp = design.rootComponent
-    allOccs = rootComp.occurrences
-    newOcc = allOccs.addNewComponent(adsk.core.Matrix3D.create())
-    comp = newOcc.component
-    comp.name = name
-    return comp
+# The attribute group holsters are tagged in; see tagComponent()
+_attributeGroup = 'RemoteHolsterMaker'
 
 def createPoint(x: float, y: float, z: float) -> adsk.core.Point3D:
     return adsk.core.Point3D.create(x, y, z)
@@ -107,78 +105,336 @@ def createDistance(d) -> adsk.core.ValueInput:
 def createReal(r) -> adsk.core.ValueInput:
     return adsk.core.ValueInput.createByReal(r)
 
-def close(a, b):
-    return abs(a - b) < 1e-5 * SCALE
-
-def createBaseRectSketch(component: adsk.fusion.Component) -> adsk.fusion.Profile:
-    base_sketch = component.sketches.add(component.xYConstructionPlane)
-    base_sketch.name = "Base Sketch"
-    p0 = create2DPoint(0, 0)
-    p1 = create2DPoint((_remoteWidth + 2 * _sideThickness) * SCALE, (_remoteThickness + _sideThickness + _backThickness) * SCALE)
-    base_sketch.sketchCurves.sketchLines.addTwoPointRectangle(p0, p1)
-    # FIXME: there must be a better way!
-    base_rect_profile = base_sketch.profiles.item(0)
-    return base_rect_profile
-
-def createScrewHolesSketch(component: adsk.fusion.Component, diameter) -> adsk.core.ObjectCollection:
-    sketch: adsk.fusion.Sketch = component.sketches.add(component.xZConstructionPlane)
-    sketch.name = "Screw Holes Sketch"
-
-    holesCenter = (_sideThickness + _remoteWidth / 2)
-    holesBack = (_sideThickness + _remoteThickness)
-    holesSpace = (_bottomThickness + _remoteLength) / 4 * -1
-    
-    sketch.sketchCurves.sketchCircles.addByCenterRadius(createPoint(holesCenter * SCALE, holesSpace * SCALE, holesBack * SCALE), diameter * SCALE)
-    sketch.sketchCurves.sketchCircles.addByCenterRadius(createPoint(holesCenter * SCALE, 3 * holesSpace * SCALE, holesBack * SCALE), diameter * SCALE)
-
-    circles = adsk.core.ObjectCollection.create()
-    for n in range(2):
-        circles.add(sketch.profiles.item(n))
-
-    return circles
-
-def createPocketSketch(component: adsk.fusion.Component) -> adsk.core.ObjectCollection:
-    sketch: adsk.fusion.Sketch = component.sketches.add(component.xYConstructionPlane)
-    sketch.name = "Pocket Sketch"
-    
-    p1 = createPoint((_sideThickness) * SCALE, (_sideThickness) * SCALE, (_remoteLength + _bottomThickness) * SCALE)
-    p2 = createPoint((_sideThickness + _remoteWidth) * SCALE, (_sideThickness + _remoteThickness) * SCALE, (_remoteLength + _bottomThickness) * SCALE)
-
-    sketch.sketchCurves.sketchLines.addTwoPointRectangle(p1, p2)
-
-    rect = adsk.core.ObjectCollection.create()
-    rect.add(sketch.profiles.item(0))
-
-    return rect
-            
-def createFrontSketch(component: adsk.fusion.Component) -> adsk.core.ObjectCollection:
-    sketch: adsk.fusion.Sketch = component.sketches.add(component.xYConstructionPlane)
-    sketch.name = "Front Sketch"
-
-    p1 = createPoint(0, 0, (_remoteLength + _bottomThickness) * SCALE)
-    p2 = createPoint((2 * _sideThickness + _remoteWidth) * SCALE, (_sideThickness + _remoteThickness) * SCALE, (_remoteLength + _bottomThickness) * SCALE)
-
-    sketch.sketchCurves.sketchLines.addTwoPointRectangle(p1, p2)
-
-    rect = adsk.core.ObjectCollection.create()
-    rect.add(sketch.profiles.item(0))
-
-    return rect
-
-def createSlotSketch(component: adsk.fusion.Component) -> adsk.core.ObjectCollection:
-    sketch: adsk.fusion.Sketch = component.sketches.add(component.xZConstructionPlane)
-    sketch.name = "Slot Sketch"
-    
-    slotLeft = (2 * _sideThickness + _remoteWidth - _frontSlotWidth) / 2
-    p1 = createPoint(slotLeft * SCALE, 0, 0)
-    p2 = createPoint((slotLeft + _frontSlotWidth) * SCALE, -1 * (_frontHeight + _bottomThickness) * SCALE, 0)
-
-    sketch.sketchCurves.sketchLines.addTwoPointRectangle(p1, p2)
-   
-    rect = adsk.core.ObjectCollection.create()
-    rect.add(sketch.profiles.item(0))
-
-    return rect
+# Everything that affects what gets built, by name
+def holsterSettings() -> dict:
+    return {'holsterName': _holsterName, 'remoteWidth': _remoteWidth, 'remoteLength': _remoteLength,
+            'remoteThickness': _remoteThickness, 'frontSlotWidth': _frontSlotWidth, 'frontHeight': _frontHeight,
+            'backCornerRound': _backCornerRound, 'softenFillet': _softenFillet, 'frontSlotRound': _frontSlotRound,
+            'sideThickness': _sideThickness, 'backThickness': _backThickness, 'bottomThickness': _bottomThickness,
+            'includeScrewHoles': _includeScrewHoles, 'tolerance': _tolerance, 'fastBuild': _fastBuild, 'transientEngine': _transientEngine}
+
+# Why the holster can't be built, or nothing if it can; see holsterProblems()
+def holsterSizeProblems() -> list:
+    return holsterProblems(_remoteWidth, _remoteLength, _remoteThickness, _frontSlotWidth, _frontHeight, _backCornerRound,
+                           _frontSlotRound, _sideThickness, _backThickness, _bottomThickness, _includeScrewHoles, _softenFillet)
+
+# Only what shapes the holster: fast build makes the same solid. The engines don't when the holster
+# is softened, as the transient one softens every edge, the rounds' included, and the plan only the
+# edges there were before its rounds.
+def holsterShapeHash() -> str:
+    return shapeHash(holsterSettings(), 'fastBuild')
+
+# The same without the name: holsters with the same one have the same body
+def holsterBodyHash() -> str:
+    return shapeHash(holsterSettings(), 'holsterName', 'fastBuild')
+
+# Curves added to a sketch made here don't trigger a solve until its profiles are needed
+def createSketch(component: adsk.fusion.Component, plane, name: str) -> adsk.fusion.Sketch:
+    sketch = component.sketches.add(plane)
+    sketch.name = name
+    if _deferSketchCompute:
+        sketch.isComputeDeferred = True
+    return sketch
+
+# Profiles only exist once the sketch has been computed
+def computedProfiles(sketch: adsk.fusion.Sketch) -> adsk.fusion.Profiles:
+    if _deferSketchCompute:
+        sketch.isComputeDeferred = False
+    return sketch.profiles
+
+# Replays a build plan (see holsterplan.py) against a component. Edge and face queries are answered
+# from one TopologyIndex of the body, invalidated between stages.
+class PlanExecutor:
+    def __init__(self, component: adsk.fusion.Component, stageDone):
+        self.component = component
+        self.features = component.features
+        self.stageDone = stageDone
+        self.profiles = {}
+        self.body = None
+        self.topology = None
+
+    def run(self, plan) -> adsk.fusion.BRepBody:
+        for step in plan:
+            if isinstance(step, Sketch):
+                self.drawSketch(step)
+                continue
+
+            if isinstance(step, Extrude):
+                self.extrude(step)
+            elif isinstance(step, Fillet):
+                self.fillet(step)
+            elif isinstance(step, CounterboredHole):
+                self.hole(step)
+            else:
+                raise ValueError('Unknown plan step {}'.format(step))
+
+            if self.topology:
+                self.topology.invalidate()
+            self.stageDone(stepName(step), self.body)
+
+        return self.body
+
+    def drawSketch(self, step: Sketch):
+        sketch = createSketch(self.component, getattr(self.component, step.plane + 'ConstructionPlane'), step.name)
+        rectangles = [curve for curve in step.curves if isinstance(curve, Rectangle)]
+        circles = [curve for curve in step.curves if isinstance(curve, Circle)]
+        if rectangles:
+            lines = sketch.sketchCurves.sketchLines
+            for rectangle in rectangles:
+                lines.addTwoPointRectangle(createPoint(*rectangle.corner), createPoint(*rectangle.opposite))
+        if circles:
+            sketchCircles = sketch.sketchCurves.sketchCircles
+            for circle in circles:
+                sketchCircles.addByCenterRadius(createPoint(*circle.centre), circle.radius)
+
+        profiles = adsk.core.ObjectCollection.create()
+        for profile in computedProfiles(sketch):
+            profiles.add(profile)
+        self.profiles[step.name] = profiles
+
+    def extrude(self, step: Extrude) -> adsk.fusion.ExtrudeFeature:
+        operation = getattr(adsk.fusion.FeatureOperations, step.operation)
+        feature = self.features.extrudeFeatures.addSimple(self.profiles[step.profiles], createDistance(step.distance), operation)
+        if operation == NEW_BODY and self.body is None:
+            self.body = feature.bodies.item(0)
+            if step.bodyName:
+                self.body.name = step.bodyName
+            self.topology = TopologyIndex(self.body, up=2)
+        return feature
+
+    # Every edge set in one feature. Other edges are taken straight from the body, without the
+    # extents a TopologyIndex would fetch for each one.
+    def fillet(self, step: Fillet) -> adsk.fusion.FilletFeature:
+        fillets = self.features.filletFeatures
+        fillet_input = fillets.createInput()
+        taken = []
+        for edgeSet in step.edgeSets:
+            if isinstance(edgeSet.edges, OtherEdges):
+                edges = [edge for edge in self.body.edges if edge not in taken]
+            else:
+                edges = self.topology.edgesAtHeight(edgeSet.edges.z, **dict(edgeSet.edges.extents))
+            if not edges:
+                continue
+            taken += edges
+            fillet_edges = adsk.core.ObjectCollection.create()
+            for edge in edges:
+                fillet_edges.add(edge)
+            fillet_input.addConstantRadiusEdgeSet(fillet_edges, createDistance(edgeSet.radius), True)
+        fillet_input.isG2 = False
+        fillet_input.isRollingBallCorner = True
+        return fillets.add(fillet_input)
+
+    # The face at depth y with all the points on it
+    def faceAtDepth(self, query: FaceAtDepth, points) -> adsk.fusion.BRepFace:
+        for face in self.topology.faces(minY=query.y, maxY=query.y):
+            bb = face.boundingBox
+            lo, hi = bb.minPoint.asArray(), bb.maxPoint.asArray()
+            if all(lo[0] <= x <= hi[0] and lo[2] <= z <= hi[2] for x, _, z in points):
+                return face
+        raise ValueError('No face at depth {:g} has all of {}'.format(query.y, points))
+
+    # Every hole in one feature, from points sketched on the face they go in from
+    def hole(self, step: CounterboredHole) -> adsk.fusion.HoleFeature:
+        sketch = createSketch(self.component, self.faceAtDepth(step.face, step.centres), 'Screw Holes Sketch')
+        points = adsk.core.ObjectCollection.create()
+        for centre in step.centres:
+            points.add(sketch.sketchPoints.add(sketch.modelToSketchSpace(createPoint(*centre))))
+
+        holes = self.features.holeFeatures
+        hole_input = holes.createCounterboreInput(createDistance(2 * step.radius), createDistance(2 * step.headRadius),
+                                                  createDistance(step.headDepth))
+        hole_input.setPositionBySketchPoints(points)
+        hole_input.setDistanceExtent(createDistance(step.depth))
+        return holes.add(hole_input)
+
+# Transient B-Rep engine: the same solid as the pocket, front and slot cuts, corner rounds and
+# screw holes, built from temporary bodies and committed in one go
+
+def transientBox(x0: float, x1: float, y0: float, y1: float, z0: float, z1: float) -> adsk.fusion.BRepBody:
+    center = createPoint((x0 + x1) / 2, (y0 + y1) / 2, (z0 + z1) / 2)
+    obb = adsk.core.OrientedBoundingBox3D.create(center, adsk.core.Vector3D.create(1, 0, 0), adsk.core.Vector3D.create(0, 1, 0),
+                                                 x1 - x0, y1 - y0, z1 - z0)
+    return adsk.fusion.TemporaryBRepManager.get().createBox(obb)
+
+# A hole running along y
+def transientHole(x: float, z: float, y0: float, y1: float, radius: float) -> adsk.fusion.BRepBody:
+    return adsk.fusion.TemporaryBRepManager.get().createCylinderOrCone(createPoint(x, y0, z), radius, createPoint(x, y1, z), radius)
+
+def transientDifference(target: adsk.fusion.BRepBody, tool: adsk.fusion.BRepBody) -> adsk.fusion.BRepBody:
+    if not adsk.fusion.TemporaryBRepManager.get().booleanOperation(target, tool, adsk.fusion.BooleanTypes.DifferenceBooleanType):
+        raise Exception('Transient boolean failed')
+    return target
+
+# What a fillet takes off a convex edge running along y at (x, z), given the centre of the round
+def transientEdgeRound(x: float, z: float, cx: float, cz: float, y0: float, y1: float) -> adsk.fusion.BRepBody:
+    corner = transientBox(min(x, cx), max(x, cx), y0, y1, min(z, cz), max(z, cz))
+    return transientDifference(corner, transientHole(cx, cz, y0, y1, abs(x - cx)))
+
+def buildTransientHolster(component: adsk.fusion.Component) -> adsk.fusion.BRepBody:
+    width = (_remoteWidth + 2 * _sideThickness) * SCALE
+    inner = (_sideThickness + _remoteThickness) * SCALE
+    back = inner + _backThickness * SCALE
+    top = (_remoteLength + _bottomThickness) * SCALE
+    front = (_frontHeight + _bottomThickness) * SCALE
+
+    body = transientBox(0, width, 0, back, 0, top)
+    transientDifference(body, transientBox(_sideThickness * SCALE, width - _sideThickness * SCALE, _sideThickness * SCALE, inner, _bottomThickness * SCALE, top))
+    transientDifference(body, transientBox(0, width, 0, inner, front, top))
+    slotLeft = (width - _frontSlotWidth * SCALE) / 2
+    transientDifference(body, transientBox(slotLeft, slotLeft + _frontSlotWidth * SCALE, 0, inner, 0, front))
+
+    if _backCornerRound > 0:
+        r = _backCornerRound * SCALE
+        transientDifference(body, transientEdgeRound(0, top, r, top - r, inner, back))
+        transientDifference(body, transientEdgeRound(width, top, width - r, top - r, inner, back))
+
+    if _frontSlotRound > 0:
+        r = _frontSlotRound * SCALE
+        transientDifference(body, transientEdgeRound(slotLeft, front, slotLeft - r, front - r, 0, _sideThickness * SCALE))
+        transientDifference(body, transientEdgeRound(slotLeft + _frontSlotWidth * SCALE, front, slotLeft + _frontSlotWidth * SCALE + r, front - r, 0, _sideThickness * SCALE))
+
+    if _includeScrewHoles:
+        # Same spots and sizes as holsterPlan() drills them
+        holesCenter = (_sideThickness + _remoteWidth / 2) * SCALE
+        holesSpace = (_bottomThickness + _remoteLength) / 4 * SCALE
+        for z in [holesSpace, 3 * holesSpace]:
+            transientDifference(body, transientHole(holesCenter, z, inner, back, screwHoleRadius * SCALE))
+            transientDifference(body, transientHole(holesCenter, z, inner, inner + _backThickness / 3 * SCALE, screwHeadRadius * SCALE))
+
+    return commitBody(component, body)
+
+# A transient body added to the component as the holster, in a base feature if the design has a timeline
+def commitBody(component: adsk.fusion.Component, body: adsk.fusion.BRepBody) -> adsk.fusion.BRepBody:
+    if _des.designType == adsk.fusion.DesignTypes.ParametricDesignType:
+        baseFeature = component.features.baseFeatures.add()
+        baseFeature.startEdit()
+        try:
+            committed = component.bRepBodies.add(body, baseFeature)
+        finally:
+            baseFeature.finishEdit()
+    else:
+        committed = component.bRepBodies.add(body)
+    committed.name = _holsterName
+    return committed
+
+# Rounds over every edge of the body. The edges are taken straight from the body, without the
+# extents a TopologyIndex would fetch for each one.
+def softenHolster(component: adsk.fusion.Component, body: adsk.fusion.BRepBody) -> adsk.fusion.FilletFeature:
+    fillet_edges = adsk.core.ObjectCollection.create()
+    for edge in body.edges:
+        fillet_edges.add(edge)
+
+    fillets = component.features.filletFeatures
+    fillet_input = fillets.createInput()
+    fillet_radius = createDistance(_softenFillet * SCALE)
+    fillet_input.addConstantRadiusEdgeSet(fillet_edges, fillet_radius, True)
+    fillet_input.isG2 = False
+    fillet_input.isRollingBallCorner = True
+    return fillets.add(fillet_input)
+
+# Builds the holster the settings describe in a new component, tagged with its shape
+def buildHolster(stageDone) -> adsk.fusion.BRepBody:
+    component = createComponent(_des, _holsterName)
+
+    # Fast builds go into a single base feature, so none of it is captured in the timeline
+    #
+    baseFeature = None
+    if _fastBuild and not _transientEngine and _des.designType == adsk.fusion.DesignTypes.ParametricDesignType:
+        baseFeature = component.features.baseFeatures.add()
+        baseFeature.startEdit()
+    try:
+        # The transient engine does everything but the soften fillet in one base feature; the plan
+        # softens in the same fillet as its corner rounds
+        #
+        if _transientEngine:
+            holster_body = buildTransientHolster(component)
+            stageDone('Transient Holster', holster_body)
+            if _softenFillet > 0:
+                softenHolster(component, holster_body)
+                stageDone('Soften Fillet', holster_body)
+        else:
+            executor = PlanExecutor(component, stageDone)
+            holster_body = executor.run(holsterPlan(_holsterName, _remoteWidth, _remoteLength, _remoteThickness,
+                                                    _frontSlotWidth, _frontHeight, _backCornerRound, _frontSlotRound,
+                                                    _sideThickness, _backThickness, _bottomThickness, _includeScrewHoles,
+                                                    _softenFillet))
+    finally:
+        if baseFeature:
+            baseFeature.finishEdit()
+    tagComponent(component, _attributeGroup, holsterShapeHash())
+    return holster_body
+
+# What a catalog row can set; anything it leaves out is as the dialog has it
+_catalogFields = ('holsterName', 'remoteWidth', 'remoteLength', 'remoteThickness', 'frontSlotWidth', 'frontHeight',
+                  'backCornerRound', 'softenFillet', 'frontSlotRound', 'sideThickness', 'backThickness',
+                  'bottomThickness', 'includeScrewHoles')
+
+# Builds every holster in a JSON list of them, each in its own component. Rows of any kind but
+# 'holster' are skipped, so a make_catalog.py catalog can be used as it is. It all happens in this
+# one command, so a single undo takes the whole catalog back out. A holster shaped like one built
+# earlier in the run, under another name, gets a copy of that body, soften fillet and all, instead
+# of being built again. Each part is logged with its stage timings like any other build, and the
+# parts' times are listed at the end.
+def buildCatalog(path: str):
+    with open(path) as f:
+        rows = json.load(f)
+    dialog = {name: globals()['_' + name] for name in _catalogFields}
+    bodies = {}
+    report = []
+    started = time.perf_counter()
+    try:
+        for row in rows:
+            if row.get('kind', 'holster') != 'holster':
+                continue
+            # A value that isn't the type the dialog has is only that row's problem
+            try:
+                values = {name: convert(row[name], value) if name in row else value for name, value in dialog.items()}
+            except (ValueError, TypeError) as e:
+                report.append('{}: invalid, {}'.format(row.get('holsterName', dialog['holsterName']), e))
+                continue
+            globals().update(('_' + name, value) for name, value in values.items())
+            log = BuildLog(_buildLogPath, 'RemoteHolsterMaker', dict(holsterSettings(), catalog=path),
+                           os.path.dirname(os.path.abspath(adsk.__file__)))
+            log.start()
+            try:
+                shape = holsterBodyHash()
+                problems = holsterSizeProblems()
+                if problems:
+                    outcome = 'invalid'
+                elif reuseComponent(_des, _attributeGroup, holsterShapeHash()):
+                    outcome = 'reused'
+                elif shape in bodies:
+                    component = createComponent(_des, _holsterName)
+                    log.stage('Copy', commitBody(component, adsk.fusion.TemporaryBRepManager.get().copy(bodies[shape])))
+                    tagComponent(component, _attributeGroup, holsterShapeHash())
+                    outcome = 'copied'
+                else:
+                    bodies[shape] = buildHolster(log.stage)
+                    outcome = 'built'
+                entry = log.finish(outcome)
+                if problems:
+                    outcome = 'invalid, ' + ' '.join(problems)
+            except:
+                entry = log.finish('failed')
+                outcome = 'failed, ' + traceback.format_exc().strip().splitlines()[-1]
+            report.append('{}: {} in {:.2f}s'.format(_holsterName, outcome, entry['seconds']))
+    finally:
+        globals().update(('_' + name, value) for name, value in dialog.items())
+    if _ui:
+        _ui.messageBox('Holster catalog: {} parts in {:.1f}s\n\n{}'.format(len(report), time.perf_counter() - started, '\n'.join(report)))
+
+# The holster as custom graphics, which Fusion throws away with the rest of the preview
+def showHolsterMesh() -> adsk.fusion.CustomGraphicsGroup:
+    mesh = holsterMesh(_remoteWidth, _remoteLength, _remoteThickness, _frontSlotWidth, _frontHeight, _backCornerRound,
+                       _frontSlotRound, _sideThickness, _backThickness, _bottomThickness)
+    coordinates, indices, normals = flatBuffers(mesh)
+    group = _des.rootComponent.customGraphicsGroups.add()
+    group.addMesh(adsk.fusion.CustomGraphicsCoordinates.create(coordinates.tolist()), indices.tolist(), normals.tolist(), indices.tolist())
+    return group
+
+
+# Raised at a stage boundary when newer inputs have made the build in progress pointless
+_debouncer = InputDebouncer(_debounceDelay, _debounceEventId)
 
 
 def run(context):
@@ -228,23 +484,36 @@ class HolsterCommandCreatedHandler(adsk.core.CommandCreatedEventHandler):
             cmd.isRepeatable = False
             onExecute = HolsterCommandExecuteHandler()
             cmd.execute.add(onExecute)
-            onExecutePreview = HolsterCommandExecuteHandler()
+            onExecutePreview = HolsterCommandExecuteHandler(preview=True)
             cmd.executePreview.add(onExecutePreview)
             onDestroy = HolsterCommandDestroyHandler()
             cmd.destroy.add(onDestroy)
+            onInputChanged = HolsterCommandInputChangedHandler()
+            cmd.inputChanged.add(onInputChanged)
+            onValidateInputs = HolsterCommandValidateInputsHandler()
+            cmd.validateInputs.add(onValidateInputs)
+
+            # The debounce timer runs on another thread, so it comes back to us through a custom event
+            #
+            _app.unregisterCustomEvent(_debounceEventId)
+            onDebounce = HolsterDebounceEventHandler()
+            _app.registerCustomEvent(_debounceEventId).add(onDebounce)
+            _debouncer.command = cmd
             
             # keep the handler referenced beyond this function
             #
             _handlers.append(onExecute)
             _handlers.append(onExecutePreview)
             _handlers.append(onDestroy)
+            _handlers.append(onInputChanged)
+            _handlers.append(onValidateInputs)
+            _handlers.append(onDebounce)
 
             finestIncrement = 1.0
 
             #define the inputs
             inputs = cmd.commandInputs
             
-            global _holsterName
             global _remoteWidth, _remoteLength, _remoteThickness
             global _frontSlotWidth, _frontHeight
             global _backCornerRound, _softenFillet, _frontSlotRound
@@ -252,7 +521,7 @@ class HolsterCommandCreatedHandler(adsk.core.CommandCreatedEventHandler):
             global _tolerance         
             global _remoteDetailsGroup, _holsterDetailsGroup, _holsterAppearanceGroup, _holsterStrengthGroup, _toleranceGroup 
             
-            _holsterName = inputs.addStringValueInput(_commandId + '_holsterName', 'Holster Name', defaultHolsterName)
+            inputs.addStringValueInput('holsterName', 'Holster Name', defaultHolsterName)
             
             # Remote details
             #
@@ -277,7 +546,7 @@ class HolsterCommandCreatedHandler(adsk.core.CommandCreatedEventHandler):
             _holsterAppearanceGroup.children.addFloatSpinnerCommandInput('backCornerRound', 'Back Corner Round', '', 0.25, 100, finestIncrement, defaultBackCornerRound)
             _holsterAppearanceGroup.children.addFloatSpinnerCommandInput('frontSlotRound', 'Slot Round', '', 0.0, 30, finestIncrement, defaultFrontSlotRound)
             _holsterAppearanceGroup.children.addFloatSpinnerCommandInput('softenFillet', 'Overall Fillet', '', 0.0, 100, 0.01, defaultSoftenFillet)
-            _holsterAppearanceGroup.children.addBoolValueInput('includeScrewHoles', 'Include Screw Holes?', True, '', True)
+            _holsterAppearanceGroup.children.addBoolValueInput('includeScrewHoles', 'Include Screw Holes?', True, '', defaultIncludeScrewHoles)
 
             
             # Holster Strength
@@ -292,15 +561,107 @@ class HolsterCommandCreatedHandler(adsk.core.CommandCreatedEventHandler):
             _toleranceGroup = inputs.addGroupCommandInput(_commandId + '_toleranceGroup', 'Tolerance Group')
             _toleranceGroup.children.addFloatSpinnerCommandInput('tolerance', 'Tolerance', '', 0.1, 10, 0.01, defaultTolerance)
             _toleranceGroup.isExpanded = False            
+
+            # For batches where nobody will edit the timeline afterwards
+            #
+            inputs.addBoolValueInput('fastBuild', 'Fast Build (no timeline)?', True, '', False)
+            inputs.addBoolValueInput('transientEngine', 'Transient B-Rep Engine?', True, '', False)
+
+            # Previews drawn as a mesh, if NumPy is there to build it; features only get made on OK
+            #
+            inputs.addBoolValueInput('meshPreview', 'Mesh Preview?', True, '', True)
+
+            # Every build's stages are timed into build-log.jsonl; this also saves a cProfile of the final build
+            #
+            inputs.addBoolValueInput('profileBuild', 'Profile Build?', True, '', False)
+
+            # A JSON list of holsters to build all at once on OK, instead of the one above; see buildCatalog
+            #
+            inputs.addStringValueInput('catalogPath', 'Batch Catalog (JSON)', '')
+
+            # Why the holster can't be built, when it can't
+            #
+            problems = inputs.addTextBoxCommandInput('problems', '', '', 4, True)
+            problems.isVisible = False
             
         except:
             if _ui:
                 _ui.messageBox('Failed:\n{}'.format(traceback.format_exc()))
 
-class HolsterCommandExecuteHandler(adsk.core.CommandEventHandler):
+# The globals, as the dialog has them
+def readInputs(inputs):
+    global _holsterName
+    global _remoteWidth, _remoteLength, _remoteThickness
+    global _frontSlotWidth, _frontHeight
+    global _backCornerRound, _softenFillet, _frontSlotRound
+    global _sideThickness, _backThickness, _bottomThickness, _includeScrewHoles
+    global _tolerance, _fastBuild, _transientEngine, _meshPreview, _profileBuild, _catalogPath, _deferSketchCompute
+
+    for input in inputs:
+        id = input.id
+        if id == 'holsterName':
+            _holsterName = input.value
+        elif id == 'remoteWidth':
+            _remoteWidth = input.value
+        elif id == 'remoteLength':
+            _remoteLength = input.value
+        elif id == 'remoteThickness':
+            _remoteThickness = input.value
+        elif id == 'frontSlotWidth':
+            _frontSlotWidth = input.value
+        elif id == 'frontHeight':
+            _frontHeight = input.value
+        elif id == 'backCornerRound':
+            _backCornerRound = input.value
+        elif id == 'softenFillet':
+            _softenFillet = input.value
+        elif id == 'frontSlotRound':
+            _frontSlotRound = input.value
+        elif id == 'sideThickness':
+            _sideThickness = input.value
+        elif id == 'backThickness':
+            _backThickness = input.value
+        elif id == 'bottomThickness':
+            _bottomThickness = input.value
+        elif id == 'includeScrewHoles':
+            _includeScrewHoles = input.value
+        elif id == 'tolerance':
+            _tolerance = input.value
+        elif id == 'fastBuild':
+            _fastBuild = input.value
+        elif id == 'transientEngine':
+            _transientEngine = input.value
+        elif id == 'meshPreview':
+            _meshPreview = input.value
+        elif id == 'profileBuild':
+            _profileBuild = input.value
+        elif id == 'catalogPath':
+            _catalogPath = input.value.strip()
+    _deferSketchCompute = _fastBuild
+
+# Problems with the sizes are listed under the inputs as they're made, and OK stays greyed out. A
+# catalog's rows are each checked as they come to be built.
+class HolsterCommandValidateInputsHandler(adsk.core.ValidateInputsEventHandler):
     def __init__(self):
         super().__init__()
     def notify(self, args):
+        try:
+            readInputs(args.inputs)
+            problems = [] if _catalogPath else holsterSizeProblems()
+            message = args.inputs.itemById('problems')
+            message.formattedText = '<br>'.join(problems)
+            message.isVisible = bool(problems)
+            args.areInputsValid = not problems
+        except:
+            if _ui:
+                _ui.messageBox('Failed:\n{}'.format(traceback.format_exc()))
+
+class HolsterCommandExecuteHandler(adsk.core.CommandEventHandler):
+    def __init__(self, preview: bool = False):
+        super().__init__()
+        self.preview = preview
+    def notify(self, args):
+        log = None
         try:
             eventArgs = adsk.core.CommandEventArgs.cast(args)
             
@@ -308,150 +669,102 @@ class HolsterCommandExecuteHandler(adsk.core.CommandEventHandler):
             command = args.firingEvent.sender
             inputs = command.commandInputs
 
-            global _holsterName
-            global _remoteWidth, _remoteLength, _remoteThickness
-            global _frontSlotWidth, _frontHeight
-            global _backCornerRound, _softenFillet, _frontSlotRound
-            global _sideThickness, _backThickness, _bottomThickness, _includeScrewHoles
-            global _tolerance         
-            
-            for input in inputs:
-                if input.id == 'holsterName':
-                    _holsterName = input.value
-                elif input.id == 'remoteWidth':
-                    _remoteWidth = input.value
-                elif input.id == 'remoteLength':
-                    _remoteLength = input.value
-                elif input.id == 'remoteThickness':
-                    _remoteThickness = input.value
-                elif input.id == 'frontSlotWidth':
-                    _frontSlotWidth = input.value
-                elif input.id == 'frontHeight':
-                    _frontHeight = input.value
-                elif input.id == 'backCornerRound':
-                    _backCornerRound = input.value
-                elif input.id == 'softenFillet':
-                    _softenFillet = input.value
-                elif input.id == 'frontSlotRound':
-                    _frontSlotRound = input.value
-                elif input.id == 'sideThickness':
-                    _sideThickness = input.value                
-                elif input.id == 'backThickness':
-                    _backThickness = input.value                
-                elif input.id == 'bottomThickness':
-                    _bottomThickness = input.value                
-                elif input.id == 'includeScrewHoles':
-                    _includeScrewHoles = input.value                
-                elif input.id == 'tolerance':
-                    _tolerance = input.value                
-             
-            args.isValidResult = True
-            
-            component = createComponent(_des, _holsterName.value)
-            
-            base_rect_profile = createBaseRectSketch(component)
-            distance = createDistance((_remoteLength + _bottomThickness) * SCALE)
-            
-            # Extrude to full height
-            #
-            holster = component.features.extrudeFeatures.addSimple(base_rect_profile, distance, NEW_BODY)
-            holster_body = holster.bodies.item(0)
-            holster_body.name = _holsterName.value
+            if self.preview and not _debouncer.settled():
+                _debouncer.schedule()
+                args.isValidResult = False
+                return
 
-            # Cut out the pocket
-            #
-            pocket_profile = createPocketSketch(component)            
-            pocket_depth = createDistance(_remoteLength * SCALE * -1)
-            component.features.extrudeFeatures.addSimple(pocket_profile, pocket_depth, CUT)
+            # Previews give up between stages once newer inputs have arrived
+            generation = _debouncer.generation
+            def stageDone(name: str = '', body: adsk.fusion.BRepBody = None):
+                if log:
+                    log.stage(name, body)
+                if self.preview:
+                    _debouncer.checkpoint(generation)
+
+            readInputs(inputs)
 
-            # Push down the front
+            # A catalog is only built on OK, and there's no one holster to preview
             #
-            front_profile = createFrontSketch(component)            
-            front_depth = createDistance((_remoteLength - _frontHeight) * SCALE * -1)
-            component.features.extrudeFeatures.addSimple(front_profile, front_depth, CUT)
+            if _catalogPath:
+                if self.preview:
+                    args.isValidResult = False
+                else:
+                    buildCatalog(_catalogPath)
+                return
+
+            # Nothing is previewed of sizes that can't be built; OK turns them away below
+            #
+            if self.preview and holsterSizeProblems():
+                args.isValidResult = False
+                return
 
-            # Create Slot
+            # A mesh preview creates no features at all, so there is nothing for Fusion to keep
             #
-            slot_profile = createSlotSketch(component)
-            slot_depth = createDistance((_remoteThickness + _sideThickness) * SCALE)
-            component.features.extrudeFeatures.addSimple(slot_profile, slot_depth, CUT)
-            
-            edges = holster_body.edges
-            fillet_edges = adsk.core.ObjectCollection.create()
+            if self.preview and _meshPreview and holsterMesh:
+                showHolsterMesh()
+                args.isValidResult = False
+                return
 
-            # Round the back corners
+            # Every build's stages are timed; only builds that are kept get profiled
             #
-            if _backCornerRound > 0:
-                for n in range(edges.count):
-                    edge = edges.item(n)
-                    if math.isclose(edge.length, _backThickness * SCALE):
-                        # Need to figure out where it is
-                        bb = edge.boundingBox
-                        maxZ = bb.maxPoint.z
-                        minZ = bb.minPoint.z
-                        if math.isclose(maxZ, minZ) and math.isclose(maxZ, (_remoteLength + _bottomThickness) * SCALE):
-                            fillet_edges.add(edge)
-
-                fillets = component.features.filletFeatures
-                fillet_input = fillets.createInput()
-                fillet_radius = createDistance(_backCornerRound * SCALE)
-                fillet_input.addConstantRadiusEdgeSet(fillet_edges, fillet_radius, True)
-                fillet_input.isG2 = False
-                fillet_input.isRollingBallCorner = True
-                top_fillet = fillets.add(fillet_input)
-
-            # Round the front/slot corners
-            #            
-            if _frontSlotRound > 0:
-                fillet_edges.clear()
-                for n in range(edges.count):
-                    edge = edges.item(n)
-                    if math.isclose(edge.length, _sideThickness * SCALE):
-                        # Need to figure out where it is
-                        bb = edge.boundingBox
-                        maxZ = bb.maxPoint.z
-                        minZ = bb.minPoint.z
-                        minY = bb.minPoint.y
-                    
-                        if math.isclose(maxZ, minZ) and math.isclose(maxZ, (_frontHeight + _bottomThickness) * SCALE) and math.isclose(minY, 0):
-                            fillet_edges.add(edge)
-
-                fillets = component.features.filletFeatures
-                fillet_input = fillets.createInput()
-                fillet_radius = createDistance(_frontSlotRound * SCALE)
-                fillet_input.addConstantRadiusEdgeSet(fillet_edges, fillet_radius, True)
-                fillet_input.isG2 = False
-                fillet_input.isRollingBallCorner = True
-                top_fillet = fillets.add(fillet_input)
-            
-            if _includeScrewHoles:
-                # Magnet hole sketch
-                screwHolesProfile = createScrewHolesSketch(component, 2)
-
-                # Extrude for magnets
-                distance = createDistance(_backThickness * SCALE)
-                component.features.extrudeFeatures.addSimple(screwHolesProfile, distance, CUT)
-                
-                screwHolesProfile = createScrewHolesSketch(component, 4)
-                distance = createDistance(_backThickness / 3 * SCALE)
-                component.features.extrudeFeatures.addSimple(screwHolesProfile, distance, CUT)
-                
-            # Soften everything
-            # 
-            if _softenFillet > 0:
-                fillet_edges.clear()
-                for n in range(edges.count):
-                    edge = edges.item(n)
-                    fillet_edges.add(edge)
-
-                fillets = component.features.filletFeatures
-                fillet_input = fillets.createInput()
-                fillet_radius = createDistance(_softenFillet * SCALE)
-                fillet_input.addConstantRadiusEdgeSet(fillet_edges, fillet_radius, True)
-                fillet_input.isG2 = False
-                fillet_input.isRollingBallCorner = True
-                top_fillet = fillets.add(fillet_input)
+            profilePath = None
+            if _profileBuild and not self.preview:
+                profilePath = os.path.join(_profileDirectory, time.strftime('%Y%m%d-%H%M%S') + '.prof')
+            log = BuildLog(_buildLogPath, 'RemoteHolsterMaker', holsterSettings(), os.path.dirname(os.path.abspath(adsk.__file__)),
+                           profilePath, self.preview)
+            log.start()
+
+            # Sizes that can't be built are turned away before anything is made
+            #
+            problems = holsterSizeProblems()
+            if problems:
+                log.finish('invalid')
+                if _ui:
+                    _ui.messageBox('This holster can\'t be built:\n\n' + '\n'.join(problems))
+                return
+
+            # An identical holster already in the design is reused rather than built again
+            #
+            if reuseComponent(_des, _attributeGroup, holsterShapeHash()):
+                log.finish('reused')
+            else:
+                buildHolster(stageDone)
+                log.finish('built')
+
+            # Only a preview that got all the way here is adopted; Fusion keeps it and doesn't fire
+            # execute, so OK doesn't build it again
+            if self.preview:
+                args.isValidResult = True
              
+        except StaleBuild:
+            if log:
+                log.finish('stale')
+            args.isValidResult = False
+        except:
+            if log:
+                log.finish('failed')
+            if _ui:
+                _ui.messageBox('Failed:\n{}'.format(traceback.format_exc()))
+
+class HolsterCommandInputChangedHandler(adsk.core.InputChangedEventHandler):
+    def __init__(self):
+        super().__init__()
+    def notify(self, args):
+        try:
+            _debouncer.touch()
+        except:
+            if _ui:
+                _ui.messageBox('Failed:\n{}'.format(traceback.format_exc()))
+
+class HolsterDebounceEventHandler(adsk.core.CustomEventHandler):
+    def __init__(self):
+        super().__init__()
+    def notify(self, args):
+        try:
+            # Anything older than the latest change will be followed by another timer
+            if _debouncer.command and args.additionalInfo == str(_debouncer.generation):
+                _debouncer.command.doExecutePreview()
         except:
             if _ui:
                 _ui.messageBox('Failed:\n{}'.format(traceback.format_exc()))
@@ -462,6 +775,9 @@ class HolsterCommandDestroyHandler(adsk.core.CommandEventHandler):
     def notify(self, args):
         try:
 #            eventArgs = adsk.core.CommandEventArgs.cast(args)
+            _debouncer.cancel()
+            _debouncer.command = None
+            _app.unregisterCustomEvent(_debounceEventId)
 
             # when the command is done, terminate the script
             # this will release all globals which will remove all event handlers
@@ -0,0 +1,13 @@
+#Author-
+#Description- Catalog values as the types of the dialog's defaults, the same in Fusion and out of it
+
+# A catalog value as the type of its default. CSV gives everything as text, and bool('false') is
+# True, so true and false are spelt out.
+def convert(value, default):
+    if isinstance(default, bool):
+        if isinstance(value, str):
+            if value.strip().lower() not in ('true', 'false', 'yes', 'no', '1', '0'):
+                raise ValueError('{!r} is not true or false'.format(value))
+            return value.strip().lower() in ('true', 'yes', '1')
+        return bool(value)
+    return type(default)(value)
@@ -0,0 +1,152 @@
+#Author-
+#Description- Fusion helpers both add-ins use: components tagged by shape, a topology index and an input debouncer
+
+import hashlib
+import json
+import threading
+import time
+import adsk.core, adsk.fusion
+
+def createComponent(design: adsk.fusion.Design, name: str) -> adsk.fusion.Component:
+    rootComp = design.rootComponent
+    allOccs = rootComp.occurrences
+    newOcc = allOccs.addNewComponent(adsk.core.Matrix3D.create())
+    comp = newOcc.component
+    comp.name = name
+    return comp
+
+# Generated components are tagged, in their add-in's attribute group, with a hash of the parameters
+# that shape them, so that building an identical part again only adds another occurrence of the one
+# already in the design
+hashAttribute = 'parameterHash'
+
+def parameterHash(parameters: dict) -> str:
+    return hashlib.sha1(json.dumps(parameters, sort_keys=True).encode()).hexdigest()
+
+# The hash of settings without the named ones, which change how a part is built but not its shape
+def shapeHash(settings: dict, *buildOnly: str) -> str:
+    return parameterHash({name: value for name, value in settings.items() if name not in buildOnly})
+
+def tagComponent(component: adsk.fusion.Component, group: str, hash: str):
+    component.attributes.add(group, hashAttribute, hash)
+
+# A new occurrence of the component built from the same parameters, or None if there isn't one
+def reuseComponent(design: adsk.fusion.Design, group: str, hash: str) -> adsk.fusion.Component:
+    for attribute in design.findAttributes(group, hashAttribute):
+        if attribute.value != hash:
+            continue
+        comp = adsk.fusion.Component.cast(attribute.parent)
+        if comp and comp.bRepBodies.count > 0:
+            design.rootComponent.occurrences.addExistingComponent(comp, adsk.core.Matrix3D.create())
+            return comp
+    return None
+
+# Equal to well within anything Fusion models, in its cm
+def close(a, b):
+    return abs(a - b) < 1e-6
+
+# Edge and face extents of a body (or feature), fetched from Fusion once and then queried
+# in memory. Call invalidate() after any feature that changes the body. up is the axis heights
+# are measured along: 1 for y, 2 for z.
+class TopologyIndex:
+    def __init__(self, source, up: int = 1):
+        self.source = source
+        self.up = up
+        self._edges = None
+        self._faces = None
+
+    def invalidate(self):
+        self._edges = None
+        self._faces = None
+
+    @staticmethod
+    def _snapshot(entities) -> list:
+        snapshot = []
+        for entity in entities:
+            bb = entity.boundingBox
+            snapshot.append((entity, bb.minPoint.asArray(), bb.maxPoint.asArray()))
+        return snapshot
+
+    # Lengths are only fetched for the entities already inside the extents
+    @staticmethod
+    def _select(snapshot, length=None, minX=None, minY=None, minZ=None, maxX=None, maxY=None, maxZ=None) -> list:
+        wanted = [(0, 0, minX), (0, 1, minY), (0, 2, minZ), (1, 0, maxX), (1, 1, maxY), (1, 2, maxZ)]
+        wanted = [(corner + 1, axis, value) for corner, axis, value in wanted if value is not None]
+        return [item[0] for item in snapshot if all(close(item[corner][axis], value) for corner, axis, value in wanted)
+                and (length is None or close(item[0].length, length))]
+
+    def edgeExtents(self) -> list:
+        if self._edges is None:
+            self._edges = self._snapshot(self.source.edges)
+        return self._edges
+
+    def faceExtents(self) -> list:
+        if self._faces is None:
+            self._faces = self._snapshot(self.source.faces)
+        return self._faces
+
+    def edges(self, **extents) -> list:
+        return self._select(self.edgeExtents(), **extents)
+
+    def faces(self, **extents) -> list:
+        return self._select(self.faceExtents(), **extents)
+
+    def _atHeight(self, height: float, extents: dict) -> dict:
+        axis = 'XYZ'[self.up]
+        return dict(extents, **{'min' + axis: height, 'max' + axis: height})
+
+    def edgesAtHeight(self, height: float, **extents) -> list:
+        return self.edges(**self._atHeight(height, extents))
+
+    def facesAtHeight(self, height: float, **extents) -> list:
+        return self.faces(**self._atHeight(height, extents))
+
+    def facesAtX(self, x: float, **extents) -> list:
+        return self.faces(minX=x, maxX=x, **extents)
+
+    def facesAtZ(self, z: float, **extents) -> list:
+        return self.faces(minZ=z, maxZ=z, **extents)
+
+    def highestEdge(self):
+        return max(self.edgeExtents(), key=lambda item: item[1][self.up])[0]
+
+class StaleBuild(Exception):
+    pass
+
+# Input changes come in bursts as a value is typed or dragged. Previews wait for a burst to end,
+# then eventId, a custom event the add-in registered, asks for one on Fusion's thread.
+class InputDebouncer:
+    def __init__(self, delay: float, eventId: str):
+        self.delay = delay
+        self.eventId = eventId
+        self.generation = 0
+        self.lastChange = 0.0
+        self.command = None
+        self.timer = None
+
+    def touch(self):
+        self.generation += 1
+        self.lastChange = time.time()
+
+    def settled(self) -> bool:
+        return time.time() - self.lastChange >= self.delay
+
+    # Ask for a preview once the current burst of changes is over
+    def schedule(self):
+        self.cancel()
+        generation = self.generation
+        app = adsk.core.Application.get()
+        self.timer = threading.Timer(self.delay, lambda: app.fireCustomEvent(self.eventId, str(generation)))
+        self.timer.daemon = True
+        self.timer.start()
+
+    def cancel(self):
+        if self.timer:
+            self.timer.cancel()
+            self.timer = None
+
+    # Let Fusion deliver any pending input changes, then give up if there were some
+    def checkpoint(self, generation: int):
+        adsk.doEvents()
+        if generation != self.generation:
+            raise StaleBuild()
@@ -0,0 +1,67 @@
+#Author-
+#Description- Checks that a remote holster can be built, from its sizes alone, before Fusion is asked for anything
+
+from .holsterspec import (defaultRemoteWidth, defaultRemoteLength, defaultRemoteThickness, defaultFrontSlotWidth,
+                          defaultFrontHeight, defaultBackCornerRound, defaultFrontSlotRound, defaultSideThickness,
+                          defaultBackThickness, defaultBottomThickness, defaultIncludeScrewHoles, defaultSoftenFillet,
+                          screwHoleRadius, screwHeadRadius)
+
+# Why the sizes can't be built, one sentence each, or nothing if they can. All sizes in mm, as the
+# dialog has them. It's only arithmetic on the sizes holsterPlan() works from, so it can run on
+# every change in the dialog.
+def holsterProblems(remoteWidth: float = defaultRemoteWidth, remoteLength: float = defaultRemoteLength,
+                    remoteThickness: float = defaultRemoteThickness, frontSlotWidth: float = defaultFrontSlotWidth,
+                    frontHeight: float = defaultFrontHeight, backCornerRound: float = defaultBackCornerRound,
+                    frontSlotRound: float = defaultFrontSlotRound, sideThickness: float = defaultSideThickness,
+                    backThickness: float = defaultBackThickness, bottomThickness: float = defaultBottomThickness,
+                    includeScrewHoles: bool = defaultIncludeScrewHoles, softenFillet: float = defaultSoftenFillet) -> list:
+    sizes = [('Remote Width', remoteWidth), ('Remote Length', remoteLength), ('Remote Thickness', remoteThickness),
+             ('Slot Width', frontSlotWidth), ('Front Height', frontHeight), ('Side Thickness', sideThickness),
+             ('Back Thickness', backThickness), ('Bottom Thickness', bottomThickness)]
+    problems = ['{} has to be more than 0, not {:g}mm.'.format(name, size) for name, size in sizes if size <= 0]
+    problems += ['{} can\'t be negative.'.format(name) for name, size in
+                 [('Back Corner Round', backCornerRound), ('Slot Round', frontSlotRound), ('Overall Fillet', softenFillet)] if size < 0]
+    if problems:
+        return problems
+
+    width = remoteWidth + 2 * sideThickness
+    top = remoteLength + bottomThickness
+    front = frontHeight + bottomThickness
+    beside = (width - frontSlotWidth) / 2
+
+    # The back's top corners are rounded down its sides, which have to reach above the front
+    if 2 * backCornerRound > width:
+        problems.append('Back Corner Round ({:g}mm) is more than half the holster\'s width ({:g}mm).'.format(backCornerRound, width))
+    elif front > top - backCornerRound:
+        problems.append('The front comes up to {:g}mm, past where the back corners start to round ({:g}mm); lower Front Height or Back Corner Round.'.format(
+            front, top - backCornerRound))
+
+    # The slot's corners are rounded across the top of the front either side of it, and down the slot.
+    # The round has to stay in front of the pocket and above the bottom, or it would cut into the
+    # side walls or through the bottom.
+    if frontSlotWidth >= remoteWidth:
+        problems.append('The slot ({:g}mm) has to be narrower than the remote ({:g}mm).'.format(frontSlotWidth, remoteWidth))
+    elif frontSlotRound > beside - sideThickness:
+        problems.append('Slot Round ({:g}mm) is more than the front beside the slot, inside the side walls ({:g}mm).'.format(
+            frontSlotRound, beside - sideThickness))
+    elif frontSlotRound > frontHeight:
+        problems.append('Slot Round ({:g}mm) is more than Front Height ({:g}mm).'.format(frontSlotRound, frontHeight))
+
+    # Screw heads a quarter of the way down and up the back, in the middle, clear of the bottom
+    # unless the slot is under them
+    if includeScrewHoles:
+        if 2 * screwHeadRadius > remoteWidth:
+            problems.append('The screw heads ({:g}mm) are wider than the remote ({:g}mm); turn Include Screw Holes off.'.format(
+                2 * screwHeadRadius, remoteWidth))
+        elif top / 4 - screwHeadRadius < bottomThickness and frontSlotWidth / 2 < screwHeadRadius or 3 * top / 4 + screwHeadRadius > top:
+            problems.append('The screw heads run into the bottom or off the top of the back; make the remote longer or turn Include Screw Holes off.')
+
+    # The soften fillet rounds every edge, so it needs the thinnest wall to be twice as thick
+    if softenFillet > 0:
+        walls = [('Side Thickness', sideThickness), ('Back Thickness', backThickness), ('Bottom Thickness', bottomThickness)]
+        if includeScrewHoles:
+            walls += [('the screw heads\' counterbore', backThickness / 3), ('the step round the screw holes', screwHeadRadius - screwHoleRadius)]
+        name, thinnest = min(walls, key=lambda wall: wall[1])
+        if 2 * softenFillet > thinnest + 1e-9:
+            problems.append('Overall Fillet ({:g}mm) is more than half of {} ({:g}mm).'.format(softenFillet, name, thinnest))
+    return problems
@@ -0,0 +1,62 @@
+#Author-
+#Description- Volume, surface area, size and material of remote holsters, worked out from their sizes without a mesh
+
+import math
+import numpy as np
+
+from .holsterspec import (SCALE, defaultRemoteWidth, defaultRemoteLength, defaultRemoteThickness, defaultFrontSlotWidth,
+                          defaultFrontHeight, defaultBackCornerRound, defaultFrontSlotRound, defaultSideThickness,
+                          defaultBackThickness, defaultBottomThickness, screwHoleRadius, screwHeadRadius)
+
+# Filament and printing, for rough costs: PLA on 1.75mm filament, at an overall 10mm³/s
+filamentDiameter = 1.75 * SCALE
+filamentDensity = 1.24
+printRate = 10 * SCALE ** 3 * 3600
+
+# What a fillet of radius r takes from the square corner it rounds
+cornerArea = 1 - math.pi / 4
+
+# Solid volume (cm³), surface area (cm²) and the size of the holster as it prints (cm), for each
+# holster. Sizes are in mm, as arrays or numbers. The holster is the back wall and, either side of
+# the slot, a block as deep as the pocket and as high as the front, with the pocket taken out of
+# its inside corner. Taking a box out of a corner leaves the block's area as it was. The soften
+# fillet is left out.
+def holsterEstimate(remoteWidth=defaultRemoteWidth, remoteLength=defaultRemoteLength, remoteThickness=defaultRemoteThickness,
+                    frontSlotWidth=defaultFrontSlotWidth, frontHeight=defaultFrontHeight, backCornerRound=defaultBackCornerRound,
+                    frontSlotRound=defaultFrontSlotRound, sideThickness=defaultSideThickness, backThickness=defaultBackThickness,
+                    bottomThickness=defaultBottomThickness, includeScrewHoles=True) -> dict:
+    remoteWidth, remoteLength, remoteThickness, frontSlotWidth, frontHeight, backCornerRound, frontSlotRound, sideThickness, backThickness, bottomThickness, includeScrewHoles = np.broadcast_arrays(
+        *[np.atleast_1d(np.asarray(a, dtype=float)) for a in (remoteWidth, remoteLength, remoteThickness, frontSlotWidth, frontHeight, backCornerRound,
+                                                              frontSlotRound, sideThickness, backThickness, bottomThickness, includeScrewHoles)])
+    width = remoteWidth + 2 * sideThickness
+    inner = sideThickness + remoteThickness
+    depth = inner + backThickness
+    top = remoteLength + bottomThickness
+    front = frontHeight + bottomThickness
+    slotLeft = (width - frontSlotWidth) / 2
+
+    # Back wall, with its top corners rounded
+    r = backCornerRound
+    profile = width * top - 2 * cornerArea * r ** 2
+    volume = profile * backThickness
+    area = 2 * profile + (2 * width + 2 * top - (4 - math.pi) * r) * backThickness
+
+    # Each side of the slot, less the pocket, with its slot corner rounded along the front wall.
+    # The face it shares with the back wall is in neither.
+    r = frontSlotRound
+    notch = slotLeft - sideThickness
+    volume = volume + 2 * (slotLeft * inner * front - notch * remoteThickness * (front - bottomThickness) - cornerArea * r ** 2 * sideThickness)
+    area = area + 2 * (2 * (slotLeft * inner + slotLeft * front + inner * front) - (2 - math.pi / 2) * r * sideThickness - 2 * cornerArea * r ** 2)
+    area = area - 2 * 2 * (slotLeft * front - notch * (front - bottomThickness))
+
+    # Two screw holes through the back, counterbored a third of the way in from the pocket
+    volume = volume - np.where(includeScrewHoles > 0, 2 * math.pi * (screwHeadRadius ** 2 / 3 + screwHoleRadius ** 2 * 2 / 3) * backThickness, 0)
+    area = area + np.where(includeScrewHoles > 0, 2 * (2 * math.pi * (screwHeadRadius / 3 + screwHoleRadius * 2 / 3) * backThickness
+                                                      - 2 * math.pi * screwHoleRadius ** 2), 0)
+
+    return {'volume': volume * SCALE ** 3, 'area': area * SCALE ** 2, 'width': width * SCALE, 'depth': depth * SCALE, 'height': top * SCALE}
+
+# Filament length (m), weight (g) and print time (hours) for volumes in cm³
+def materialEstimate(volume) -> dict:
+    filamentArea = math.pi * (filamentDiameter / 2) ** 2
+    return {'filament': volume / filamentArea / 100, 'mass': volume * filamentDensity, 'hours': volume / printRate}
@@ -0,0 +1,73 @@
+#Author-
+#Description- Triangle mesh of a remote holster, built with NumPy from the same sizes as the B-Rep
+
+import math
+import numpy as np
+
+from .holsterspec import (SCALE, defaultRemoteWidth, defaultRemoteLength, defaultRemoteThickness, defaultFrontSlotWidth,
+                          defaultFrontHeight, defaultBackCornerRound, defaultFrontSlotRound, defaultSideThickness,
+                          defaultBackThickness, defaultBottomThickness)
+from .meshbuild import Mesh
+
+# Points along each rounded corner
+cornerSegments = 8
+
+# An (x, z) profile swept along y from y0 to y1. The profile has to be visible in full from its
+# first point, so the end caps can fan out from there.
+def addPrism(mesh: Mesh, profile: list, y0: float, y1: float):
+    xz = np.asarray(profile, dtype=float)
+    # Make the profile run so that the sides face out
+    area = np.sum(xz[:, 0] * np.roll(xz[:, 1], -1) - np.roll(xz[:, 0], -1) * xz[:, 1])
+    if area < 0:
+        xz = xz[::-1]
+    n = len(xz)
+    j = np.arange(n)
+    k = (j + 1) % n
+    vertices = np.concatenate([np.column_stack([xz[:, 0], np.full(n, y), xz[:, 1]]) for y in (y0, y1)])
+    sides = np.stack([j, k + n, k, j, j + n, k + n], axis=-1).reshape(-1, 3)
+    fan = np.stack([np.zeros(n - 2, dtype=np.int64), j[1:-1], j[2:]], axis=1)
+    mesh.add(vertices, np.concatenate([sides, fan, fan[:, ::-1] + n]))
+
+def addCuboid(mesh: Mesh, x0: float, x1: float, y0: float, y1: float, z0: float, z1: float):
+    addPrism(mesh, [(x0, z0), (x1, z0), (x1, z1), (x0, z1)], y0, y1)
+
+# Corner at (x, z) rounded off by radius about the centre at (cx, cz), running from the side at x
+# to the side at z; a radius of 0 leaves it square
+def roundedCorner(x: float, z: float, cx: float, cz: float, radius: float) -> list:
+    if radius <= 0:
+        return [(x, z)]
+    a = np.linspace(math.atan2(0, x - cx), math.atan2(z - cz, 0), cornerSegments + 1)
+    return [(cx + radius * math.cos(t), cz + radius * math.sin(t)) for t in a]
+
+# The holster as the feature recipe makes it, less the soften fillet and screw holes. All sizes in mm.
+def holsterMesh(remoteWidth: float = defaultRemoteWidth, remoteLength: float = defaultRemoteLength,
+                remoteThickness: float = defaultRemoteThickness, frontSlotWidth: float = defaultFrontSlotWidth,
+                frontHeight: float = defaultFrontHeight, backCornerRound: float = defaultBackCornerRound,
+                frontSlotRound: float = defaultFrontSlotRound, sideThickness: float = defaultSideThickness,
+                backThickness: float = defaultBackThickness, bottomThickness: float = defaultBottomThickness) -> Mesh:
+    mesh = Mesh()
+    width = (remoteWidth + 2 * sideThickness) * SCALE
+    side = sideThickness * SCALE
+    inner = (sideThickness + remoteThickness) * SCALE
+    back = inner + backThickness * SCALE
+    top = (remoteLength + bottomThickness) * SCALE
+    front = (frontHeight + bottomThickness) * SCALE
+    bottom = bottomThickness * SCALE
+    slotLeft = (width - frontSlotWidth * SCALE) / 2
+    slotRight = slotLeft + frontSlotWidth * SCALE
+
+    # Back wall, with its top corners rounded
+    r = backCornerRound * SCALE
+    addPrism(mesh, [(width / 2, 0), (width, 0)] + roundedCorner(width, top, width - r, top - r, r)
+             + roundedCorner(0, top, r, top - r, r)[::-1] + [(0, 0)], inner, back)
+
+    # Each side of the slot: bottom, side wall, and front wall with the slot corner rounded
+    r = frontSlotRound * SCALE
+    addPrism(mesh, [(0, 0), (slotLeft, 0)] + roundedCorner(slotLeft, front, slotLeft - r, front - r, r) + [(0, front)], 0, side)
+    addPrism(mesh, [(width, 0), (width, front)] + roundedCorner(slotRight, front, slotRight + r, front - r, r)[::-1] + [(slotRight, 0)], 0, side)
+    addCuboid(mesh, 0, side, side, inner, 0, front)
+    addCuboid(mesh, width - side, width, side, inner, 0, front)
+    addCuboid(mesh, 0, slotLeft, side, inner, 0, bottom)
+    addCuboid(mesh, slotRight, width, side, inner, 0, bottom)
+
+    return mesh
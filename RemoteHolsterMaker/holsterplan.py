@@ -0,0 +1,97 @@
+#Author-
+#Description- Build plans for remote holsters: every sketch and feature, worked out without Fusion
+
+from collections import namedtuple
+
+from .holsterspec import (SCALE, defaultHolsterName, defaultRemoteWidth, defaultRemoteLength, defaultRemoteThickness,
+                          defaultFrontSlotWidth, defaultFrontHeight, defaultBackCornerRound, defaultFrontSlotRound,
+                          defaultSoftenFillet, defaultSideThickness, defaultBackThickness, defaultBottomThickness,
+                          defaultIncludeScrewHoles, screwHoleRadius, screwHeadRadius)
+
+# Feature operations, named as in adsk.fusion.FeatureOperations
+JOIN = 'JoinFeatureOperation'
+CUT = 'CutFeatureOperation'
+NEW_BODY = 'NewBodyFeatureOperation'
+
+# Sketch curves, in the sketch's own coordinates (cm)
+Circle = namedtuple('Circle', 'centre radius')
+Rectangle = namedtuple('Rectangle', 'corner opposite')
+
+# A sketch on the 'xY', 'xZ' or 'yZ' construction plane
+Sketch = namedtuple('Sketch', 'name plane curves')
+
+# Features. profiles names a sketch; bodyName names the body a NEW_BODY extrude makes. A fillet
+# rounds every one of its edge sets at once. A counterbored hole is drilled at each of centres
+# (model coordinates, cm) on face, into the body, with the counterbore at the face.
+Extrude = namedtuple('Extrude', 'profiles distance operation bodyName')
+Fillet = namedtuple('Fillet', 'edgeSets')
+EdgeSet = namedtuple('EdgeSet', 'edges radius')
+CounterboredHole = namedtuple('CounterboredHole', 'face centres radius headRadius headDepth depth')
+
+# Queries, only answerable once the body exists. extents are (name, value) pairs as
+# TopologyIndex.edgesAtHeight takes them. OtherEdges is every edge no other set of the fillet has.
+EdgesAtHeight = namedtuple('EdgesAtHeight', 'z extents')
+OtherEdges = namedtuple('OtherEdges', '')
+FaceAtDepth = namedtuple('FaceAtDepth', 'y')
+
+def extrude(profiles: str, distance: float, operation: str, bodyName: str = None) -> Extrude:
+    return Extrude(profiles, distance, operation, bodyName)
+
+# What a step is called in build logs
+def stepName(step) -> str:
+    if isinstance(step, Fillet):
+        return 'Fillet ' + ', '.join('other edges' if isinstance(edgeSet.edges, OtherEdges) else 'edges at {:g}'.format(edgeSet.edges.z)
+                                     for edgeSet in step.edgeSets)
+    if isinstance(step, CounterboredHole):
+        return 'Counterbored Holes x{}'.format(len(step.centres))
+    return '{} {}'.format(type(step).__name__, step[0])
+
+# Every feature of the build, in order: the block, the pocket cut down into it, the front and slot
+# cut in from the front together, the screw holes, and one fillet for the back and slot corners
+# and the soften fillet over everything else. Sizes are in mm, as the dialog has them.
+def holsterPlan(holsterName: str = defaultHolsterName, remoteWidth: float = defaultRemoteWidth, remoteLength: float = defaultRemoteLength,
+                remoteThickness: float = defaultRemoteThickness, frontSlotWidth: float = defaultFrontSlotWidth,
+                frontHeight: float = defaultFrontHeight, backCornerRound: float = defaultBackCornerRound,
+                frontSlotRound: float = defaultFrontSlotRound, sideThickness: float = defaultSideThickness,
+                backThickness: float = defaultBackThickness, bottomThickness: float = defaultBottomThickness,
+                includeScrewHoles: bool = defaultIncludeScrewHoles, softenFillet: float = defaultSoftenFillet) -> tuple:
+    width = (remoteWidth + 2 * sideThickness) * SCALE
+    top = (remoteLength + bottomThickness) * SCALE
+    inner = (sideThickness + remoteThickness) * SCALE
+    front = (frontHeight + bottomThickness) * SCALE
+
+    # Extrude to full height
+    plan = [Sketch("Base Sketch", 'xY', (Rectangle((0, 0, 0), (width, (remoteThickness + sideThickness + backThickness) * SCALE, 0)),)),
+            extrude("Base Sketch", top, NEW_BODY, holsterName)]
+
+    # Cut out the pocket
+    plan += [Sketch("Pocket Sketch", 'xY', (Rectangle((sideThickness * SCALE, sideThickness * SCALE, top),
+                                                      ((sideThickness + remoteWidth) * SCALE, inner, top)),)),
+             extrude("Pocket Sketch", remoteLength * SCALE * -1, CUT)]
+
+    # Push down the front and cut the slot, both in from the front as deep as the pocket. The xZ
+    # sketch's y runs down the model's z.
+    slotLeft = (width - frontSlotWidth * SCALE) / 2
+    plan += [Sketch("Front Sketch", 'xZ', (Rectangle((0, -front, 0), (width, -top, 0)),
+                                           Rectangle((slotLeft, 0, 0), (slotLeft + frontSlotWidth * SCALE, -front, 0)))),
+             extrude("Front Sketch", inner, CUT)]
+
+    # Through the back, with a counterbore a third of the way in from the pocket for the heads
+    if includeScrewHoles:
+        holesCenter = (sideThickness + remoteWidth / 2) * SCALE
+        holesSpace = (bottomThickness + remoteLength) / 4 * SCALE
+        plan.append(CounterboredHole(FaceAtDepth(inner), ((holesCenter, inner, holesSpace), (holesCenter, inner, 3 * holesSpace)),
+                                     screwHoleRadius * SCALE, screwHeadRadius * SCALE, backThickness / 3 * SCALE, backThickness * SCALE))
+
+    # Round the back corners, the front/slot corners and then soften everything else, all at once
+    edgeSets = []
+    if backCornerRound > 0:
+        edgeSets.append(EdgeSet(EdgesAtHeight(top, (('length', backThickness * SCALE),)), backCornerRound * SCALE))
+    if frontSlotRound > 0:
+        edgeSets.append(EdgeSet(EdgesAtHeight(front, (('length', sideThickness * SCALE), ('minY', 0))), frontSlotRound * SCALE))
+    if softenFillet > 0:
+        edgeSets.append(EdgeSet(OtherEdges(), softenFillet * SCALE))
+    if edgeSets:
+        plan.append(Fillet(tuple(edgeSets)))
+
+    return tuple(plan)
@@ -0,0 +1,174 @@
+#Author-
+#Description- Watertight triangle mesh of a remote holster, for printing without Fusion
+
+import math
+import numpy as np
+
+from .holsterspec import (SCALE, defaultRemoteWidth, defaultRemoteLength, defaultRemoteThickness, defaultFrontSlotWidth,
+                          defaultFrontHeight, defaultBackCornerRound, defaultFrontSlotRound, defaultSideThickness,
+                          defaultBackThickness, defaultBottomThickness, defaultIncludeScrewHoles, screwHoleRadius,
+                          screwHeadRadius)
+from .meshbuild import Mesh, weld, facing, weldTolerance
+from .holstercheck import holsterProblems
+
+# Unlike holsterMesh(), which overlaps closed shells, this is one closed surface: every edge is
+# shared by exactly two triangles, which face out. Across y the holster is three profiles swept one
+# after another: the front wall either side of the slot, the side walls and bottom behind it, and
+# the back wall with the screw holes through it. Only the left half is built; it's the right half
+# mirrored, and the two meet on the plane down the middle of the slot and the screw holes.
+
+# Furthest the straight pieces of a round can be from the true curve, in mm
+defaultRoundTolerance = 0.01
+
+# Pieces a round of radius through angle needs to stay within tolerance of the curve
+def roundSegments(radius: float, angle: float, tolerance: float) -> int:
+    if radius <= tolerance:
+        return 1
+    return max(1, math.ceil(angle / (2 * math.acos(1 - tolerance / radius))))
+
+# (x, z) points from angle a0 to a1 round the centre (cx, cz), both ends included; a radius of 0
+# is just the centre, which is then the square corner
+def arc(cx: float, cz: float, radius: float, a0: float, a1: float, segments: int) -> list:
+    if radius <= 0:
+        return [(cx, cz)]
+    return [(cx + radius * math.cos(a), cz + radius * math.sin(a)) for a in np.linspace(a0, a1, segments + 1)]
+
+# The points without any that repeat the one before, round the end too if closed
+def distinct(points: list, closed: bool = True) -> np.ndarray:
+    points = np.asarray(points, dtype=float)
+    keep = np.ones(len(points), dtype=bool)
+    keep[1:] = np.linalg.norm(np.diff(points, axis=0), axis=1) > weldTolerance
+    if closed and len(points) > 1 and np.linalg.norm(points[-1] - points[0]) <= weldTolerance:
+        keep[-1] = False
+    return points[keep]
+
+# Triangles filling a simple anticlockwise polygon of (n, 2) points, by cutting off ears. Points in
+# a straight line along a side are kept, and no ear is cut with a point on its edge, so every side
+# stays joined to whatever shares it.
+def earClip(points: np.ndarray) -> np.ndarray:
+    turn = lambda a, b, c: (b[..., 0] - a[..., 0]) * (c[..., 1] - a[..., 1]) - (b[..., 1] - a[..., 1]) * (c[..., 0] - a[..., 0])
+    epsilon = weldTolerance ** 2
+    remaining = list(range(len(points)))
+    triangles = []
+    k = misses = 0
+    while len(remaining) > 3:
+        n = len(remaining)
+        k %= n
+        a, b, c = remaining[k - 1], remaining[k], remaining[(k + 1) % n]
+        ear = turn(points[a], points[b], points[c]) > epsilon
+        if ear:
+            others = points[[m for m in remaining if m not in (a, b, c)]]
+            inside = ((turn(points[a], points[b], others) >= -epsilon) & (turn(points[b], points[c], others) >= -epsilon)
+                      & (turn(points[c], points[a], others) >= -epsilon))
+            ear = not inside.any()
+        # Only points in a straight line are left to cut; they fill nothing
+        if ear or misses > n:
+            triangles.append((a, b, c))
+            remaining.pop(k)
+            misses = 0
+        else:
+            k += 1
+            misses += 1
+    triangles.append(tuple(remaining))
+    return np.array(triangles, dtype=np.int64)
+
+# A flat polygon of (x, z) points at y, facing direction
+def addCap(mesh: Mesh, polygon: list, y: float, direction):
+    xz = distinct(polygon)
+    vertices = np.column_stack([xz[:, 0], np.full(len(xz), y), xz[:, 1]])
+    mesh.add(vertices, facing(vertices, earClip(xz), direction))
+
+# The sides swept along y from y0 to y1 by a chain of (x, z) points running anticlockwise round
+# the solid, as the chain runs round a cap
+def addSides(mesh: Mesh, chain: list, y0: float, y1: float, closed: bool = False):
+    xz = distinct(chain, closed)
+    if closed:
+        xz = np.concatenate([xz, xz[:1]])
+    n = len(xz) - 1
+    vertices = np.concatenate([np.column_stack([xz[:, 0], np.full(n + 1, y), xz[:, 1]]) for y in (y0, y1)])
+    j = np.arange(n)
+    triangles = np.stack([j, j + 1, j + n + 2, j, j + n + 2, j + n + 1], axis=1).reshape(-1, 3)
+    # Out is to the right of the way the chain runs
+    step = np.diff(xz, axis=0)
+    out = np.repeat(np.column_stack([step[:, 1], np.zeros(n), -step[:, 0]]), 2, axis=0)
+    mesh.add(vertices, facing(vertices, triangles, out))
+
+# The holster as buildTransientHolster() makes it, less the soften fillet, as one watertight solid.
+# All sizes in mm; rounds and screw holes are cut into straight pieces no further than
+# roundTolerance mm from the true curves. ValueError, saying why, for any sizes holsterProblems()
+# turns down.
+def solidHolsterMesh(remoteWidth: float = defaultRemoteWidth, remoteLength: float = defaultRemoteLength,
+                     remoteThickness: float = defaultRemoteThickness, frontSlotWidth: float = defaultFrontSlotWidth,
+                     frontHeight: float = defaultFrontHeight, backCornerRound: float = defaultBackCornerRound,
+                     frontSlotRound: float = defaultFrontSlotRound, sideThickness: float = defaultSideThickness,
+                     backThickness: float = defaultBackThickness, bottomThickness: float = defaultBottomThickness,
+                     includeScrewHoles: bool = defaultIncludeScrewHoles, roundTolerance: float = defaultRoundTolerance) -> Mesh:
+    width = (remoteWidth + 2 * sideThickness) * SCALE
+    side = sideThickness * SCALE
+    inner = (sideThickness + remoteThickness) * SCALE
+    back = inner + backThickness * SCALE
+    top = (remoteLength + bottomThickness) * SCALE
+    front = (frontHeight + bottomThickness) * SCALE
+    bottom = bottomThickness * SCALE
+    slotLeft = (width - frontSlotWidth * SCALE) / 2
+    middle = width / 2
+    tolerance = roundTolerance * SCALE
+    head = screwHeadRadius * SCALE
+    # Sizes the dialog wouldn't build would make a mesh with holes or overlaps in it
+    problems = holsterProblems(remoteWidth, remoteLength, remoteThickness, frontSlotWidth, frontHeight, backCornerRound,
+                               frontSlotRound, sideThickness, backThickness, bottomThickness, includeScrewHoles, 0)
+    if problems:
+        raise ValueError(' '.join(problems))
+    half = Mesh()
+
+    # Front wall, with the slot corner rounded; the sides and bottom behind it; and what of the
+    # front wall's back they don't cover, which faces into the pocket
+    r = frontSlotRound * SCALE
+    corner = arc(slotLeft - r, front - r, r, 0, math.pi / 2, roundSegments(r, math.pi / 2, tolerance))
+    frontWall = [(0, 0), (slotLeft, 0), (slotLeft, bottom)] + corner + [(side, front), (0, front)]
+    sides = [(0, 0), (slotLeft, 0), (slotLeft, bottom), (side, bottom), (side, front), (0, front)]
+    addCap(half, frontWall, 0, (0, -1, 0))
+    addSides(half, frontWall, 0, side, closed=True)
+    addCap(half, [(side, bottom), (slotLeft, bottom)] + corner + [(side, front)], side, (0, 1, 0))
+    addSides(half, sides, side, inner, closed=True)
+
+    # Up the middle of the back wall, round the left of each screw hole
+    holes = []
+    if includeScrewHoles:
+        segments = 4 * roundSegments(head, math.pi / 2, tolerance)
+        for z in (top / 4, 3 * top / 4):
+            holes.append([arc(middle, z, radius * SCALE, 3 * math.pi / 2, math.pi / 2, segments // 2)
+                          for radius in (screwHeadRadius, screwHoleRadius)])
+    counterbore = inner + backThickness / 3 * SCALE
+    headSide = [(middle, 0)] + [p for head, _ in holes for p in head] + [(middle, top)]
+    screwSide = [(middle, 0)] + [p for _, screw in holes for p in screw] + [(middle, top)]
+
+    # Back wall, from the top of the middle round the rounded corner to the bottom of the middle,
+    # with points wherever the sides and bottom meet its edge
+    r = backCornerRound * SCALE
+    corner = arc(r, top - r, r, math.pi / 2, math.pi, roundSegments(r, math.pi / 2, tolerance))
+    outline = [(middle, top)] + corner + [(0, front), (0, 0), (slotLeft, 0), (middle, 0)]
+    addSides(half, outline, inner, back)
+    addCap(half, screwSide[:-1] + outline[:-1], back, (0, 1, 0))
+    pocket = outline[:-4] + [(0, front), (side, front), (side, bottom), (slotLeft, bottom), (slotLeft, 0)]
+    addCap(half, headSide[:-1] + pocket, inner, (0, -1, 0))
+
+    # Each screw hole, wide for the head a third of the way in from the pocket
+    for head, screw in holes:
+        addSides(half, head, inner, counterbore)
+        addSides(half, screw, counterbore, back)
+        vertices = np.array([(x, counterbore, z) for x, z in head + screw])
+        n = len(head) - 1
+        j = np.arange(n)
+        triangles = np.stack([j, j + 1, j + n + 2, j, j + n + 2, j + n + 1], axis=1).reshape(-1, 3)
+        half.add(vertices, facing(vertices, triangles, (0, -1, 0)))
+
+    # Both halves as one surface; mirroring turns the triangles inside out, so they're turned back
+    vertices, triangles = half.arrays()
+    mirrored = vertices * [-1, 1, 1] + [width, 0, 0]
+    vertices, inverse = weld(np.concatenate([vertices, mirrored]))
+    triangles = inverse[np.concatenate([triangles, triangles[:, ::-1] + len(mirrored)])]
+    triangles = triangles[(triangles[:, 0] != triangles[:, 1]) & (triangles[:, 1] != triangles[:, 2]) & (triangles[:, 0] != triangles[:, 2])]
+    mesh = Mesh()
+    mesh.add(vertices, triangles)
+    return mesh
@@ -0,0 +1,44 @@
+#Author-
+#Description- Remote holster sizes, shared by the Fusion script and anything that runs without Fusion
+
+# Sizes are in mm; Fusion wants cm
+SCALE = 0.1
+
+#############################################
+# Default Values
+#############################################
+
+defaultHolsterName = "TV Remote Holster"
+
+# Remote Details
+#
+defaultRemoteWidth = 80.0
+defaultRemoteLength = 44.0
+defaultRemoteThickness = 15.0
+
+# Holster Details
+#
+defaultFrontSlotWidth = 10.0
+defaultFrontHeight = 22.0
+
+# Holster Appearance
+#
+defaultBackCornerRound = 4.0
+defaultSoftenFillet = 0.5
+defaultFrontSlotRound = 3.0
+
+# Holster Strength
+#
+defaultSideThickness = 3.0
+defaultBackThickness = 3.0
+defaultBottomThickness = 3.0
+
+# Tolerance
+#
+defaultTolerance = 0.5
+
+# Screw Holes
+#
+defaultIncludeScrewHoles = True
+screwHoleRadius = 2.0
+screwHeadRadius = 4.0
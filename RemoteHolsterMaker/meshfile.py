@@ -0,0 +1,96 @@
+#Author-
+#Description- Binary STL and 3MF files of meshes, written a chunk at a time
+
+import io
+import struct
+import zipfile
+import numpy as np
+
+# Triangles (or vertices) converted per chunk, and the size of the file buffer. Only one part and
+# one chunk of it are ever held, so memory doesn't grow with the number of parts in a file.
+chunkSize = 1 << 16
+bufferSize = 1 << 20
+
+# A binary STL triangle record, 50 bytes with no padding
+stlTriangle = np.dtype([('normal', '<f4', (3,)), ('corners', '<f4', (3, 3)), ('attribute', '<u2')])
+
+modelPath = '3D/3dmodel.model'
+contentTypes = ('<?xml version="1.0" encoding="UTF-8"?>\n'
+                '<Types xmlns="http://schemas.openxmlformats.org/package/2006/content-types">'
+                '<Default Extension="rels" ContentType="application/vnd.openxmlformats-package.relationships+xml"/>'
+                '<Default Extension="model" ContentType="application/vnd.ms-package.3dmanufacturing-3dmodel+xml"/>'
+                '</Types>\n')
+relationships = ('<?xml version="1.0" encoding="UTF-8"?>\n'
+                 '<Relationships xmlns="http://schemas.openxmlformats.org/package/2006/relationships">'
+                 '<Relationship Target="/' + modelPath + '" Id="rel0" '
+                 'Type="http://schemas.microsoft.com/3dmanufacturing/2013/01/3dmodel"/>'
+                 '</Relationships>\n')
+
+# Meshes are in Fusion's cm; printers want mm with z up. A mesh with y up has its depth running
+# towards -z, so that becomes +y, and the turn keeps triangles facing the way they did.
+cmPerMm = 0.1
+
+def printerCoordinates(vertices: np.ndarray, yUp: bool) -> np.ndarray:
+    vertices = np.asarray(vertices, dtype=float) / cmPerMm
+    if not yUp:
+        return vertices
+    return np.column_stack([vertices[:, 0], -vertices[:, 2], vertices[:, 1]])
+
+# Corners of every triangle of every part, as (n, 3, 3) arrays of at most chunkSize triangles.
+# parts are (vertices, triangles) pairs, as Mesh.arrays() returns them.
+def triangleChunks(parts, yUp: bool):
+    for vertices, triangles in parts:
+        vertices = printerCoordinates(vertices, yUp)
+        for start in range(0, len(triangles), chunkSize):
+            yield vertices[triangles[start:start + chunkSize]]
+
+# Every part's triangles to one binary STL. The count in the header is only known at the end, so
+# it's written as 0 and patched, after a header of name. Returns the number of triangles written.
+def writeStl(path: str, parts, yUp: bool, name: str) -> int:
+    count = 0
+    with open(path, 'wb', buffering=bufferSize) as f:
+        f.write(name.encode()[:80].ljust(80) + struct.pack('<I', 0))
+        for corners in triangleChunks(parts, yUp):
+            records = np.zeros(len(corners), dtype=stlTriangle)
+            normals = np.cross(corners[:, 1] - corners[:, 0], corners[:, 2] - corners[:, 0])
+            lengths = np.linalg.norm(normals, axis=1)
+            records['normal'] = normals / np.where(lengths > 0, lengths, 1)[:, None]
+            records['corners'] = corners
+            f.write(records.tobytes())
+            count += len(corners)
+        f.seek(80)
+        f.write(struct.pack('<I', count))
+    return count
+
+# One line of pattern per row, formatted in a single operation
+def formatRows(rows: np.ndarray, pattern: str) -> bytes:
+    return ((pattern + '\n') * len(rows) % tuple(rows.ravel().tolist())).encode()
+
+# Every part to a 3MF package, each as its own object with a build item. The model is streamed
+# into the zip as it's made, vertices then triangles a chunk at a time. Returns the number of
+# triangles written. name is only for the STL header, and unused.
+def write3mf(path: str, parts, yUp: bool, name: str) -> int:
+    count = 0
+    objects = 0
+    with zipfile.ZipFile(path, 'w', zipfile.ZIP_DEFLATED) as package:
+        package.writestr('[Content_Types].xml', contentTypes)
+        package.writestr('_rels/.rels', relationships)
+        with package.open(modelPath, 'w', force_zip64=True) as raw, io.BufferedWriter(raw, bufferSize) as model:
+            model.write(b'<?xml version="1.0" encoding="UTF-8"?>\n'
+                        b'<model unit="millimeter" xml:lang="en-US" xmlns="http://schemas.microsoft.com/3dmanufacturing/core/2015/02">\n'
+                        b'<resources>\n')
+            for vertices, triangles in parts:
+                objects += 1
+                model.write(b'<object id="%d" type="model"><mesh><vertices>\n' % objects)
+                for start in range(0, len(vertices), chunkSize):
+                    model.write(formatRows(printerCoordinates(vertices[start:start + chunkSize], yUp), '<vertex x="%.4f" y="%.4f" z="%.4f"/>'))
+                model.write(b'</vertices><triangles>\n')
+                for start in range(0, len(triangles), chunkSize):
+                    model.write(formatRows(triangles[start:start + chunkSize], '<triangle v1="%d" v2="%d" v3="%d"/>'))
+                model.write(b'</triangles></mesh></object>\n')
+                count += len(triangles)
+            model.write(b'</resources>\n<build>\n')
+            for n in range(1, objects + 1):
+                model.write(b'<item objectid="%d"/>\n' % n)
+            model.write(b'</build>\n</model>\n')
+    return count
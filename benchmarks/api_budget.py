@@ -0,0 +1,201 @@
+#!/usr/bin/env python3
+#Description- API call budgets for both makers, run without Fusion against the recording adsk in stubs/
+#
+# Usage: python benchmarks/api_budget.py [--update] [-k text] [--verbose]
+#
+# Each configuration builds one box or holster from scratch and counts API calls, sketches, curves,
+# timeline features, collection iterations and .boundingBox reads; the "again" ones count building
+# an identical one a second time in the same design, the "foot library" ones a box whose foot
+# cell is already in the design, and "holster catalog" a batch of holsters from one catalog. The
+# "rejected" ones have settings that can't be built, and should be turned away having made nothing.
+# Any count over its budget in budgets.json fails
+# the run, as does any box with more than BOX_FEATURES timeline features, however big it is and
+# whatever its options; --update can't raise that. --update writes the current counts as the new
+# budgets.
+
+import argparse
+import json
+import os
+import sys
+import tempfile
+
+HERE = os.path.dirname(os.path.abspath(__file__))
+sys.path[:0] = [os.path.join(HERE, 'stubs'), os.path.dirname(HERE)]
+
+import adsk.core, adsk.fusion
+from adsk._stub import recorder
+
+# The makers look the application up as they are imported
+adsk.core._reset()
+from GridFinityDividerBoxMaker import GridFinityDividerBoxMaker as boxMaker
+from RemoteHolsterMaker import RemoteHolsterMaker as holsterMaker
+
+BUDGETS = os.path.join(HERE, 'budgets.json')
+
+# Most timeline features a box can take, counting the foot library's when it's built too
+BOX_FEATURES = 12
+
+# Holster builds always log their stages; keep that out of the tree
+holsterMaker._buildLogPath = os.path.join(tempfile.gettempdir(), 'holster-build-log.jsonl')
+
+# Box configurations: grid sizes with each base builder, divider counts, then each option on its own
+def boxConfigurations() -> list:
+    configurations = []
+    for n in [1, 2, 3, 5, 10, 20]:
+        for builder in [boxMaker.PATTERN_BASE, boxMaker.SLAB_BASE]:
+            configurations.append(('box {0}x{0} {1}'.format(n, builder), dict(slotsWide=n, slotsDeep=n, baseBuilder=builder)))
+    configurations.append(('box 1x3', dict(slotsWide=1, slotsDeep=3)))
+    configurations.append(('box 4x2', dict(slotsWide=4, slotsDeep=2)))
+    for count in [1, 2, 5, 10]:
+        configurations.append(('box 3x3 dividers {}x0'.format(count), dict(slotsWide=3, slotsDeep=3, dividerCount=count)))
+        configurations.append(('box 3x3 dividers {0}x{0}'.format(count), dict(slotsWide=3, slotsDeep=3, dividerCount=count, dividerCountDeep=count)))
+    options = [
+        ('no scoop', dict(includeScoop=False)),
+        ('no ledge', dict(includeLedge=False)),
+        ('magnets', dict(includeMagnets=True)),
+        ('magnets slab', dict(includeMagnets=True, baseBuilder=boxMaker.SLAB_BASE)),
+        ('base only', dict(baseOnly=True)),
+        ('draft', dict(draft=True)),
+        ('fast', dict(fastBuild=True)),
+        ('transient', dict(engine=boxMaker.TRANSIENT_ENGINE)),
+        ('transient magnets dividers', dict(engine=boxMaker.TRANSIENT_ENGINE, includeMagnets=True, dividerCount=2, dividerCountDeep=2)),
+    ]
+    for name, values in options:
+        configurations.append(('box 2x2 ' + name, values))
+    configurations.append(('box rejected', dict(slotsDeep=1, slotsHigh=3.0)))
+    return configurations
+
+# Holster configurations: dialog inputs changed from their defaults before OK
+def holsterConfigurations() -> list:
+    return [
+        ('holster', {}),
+        ('holster no screw holes', dict(includeScrewHoles=False)),
+        ('holster no rounds', dict(backCornerRound=0.0, frontSlotRound=0.0)),
+        ('holster no soften', dict(softenFillet=0.0)),
+        ('holster wide', dict(remoteWidth=160.0, remoteLength=120.0)),
+        ('holster fast', dict(fastBuild=True)),
+        ('holster transient', dict(transientEngine=True)),
+        ('holster rejected', dict(frontSlotWidth=100.0)),
+    ]
+
+def buildBox(values: dict):
+    box = boxMaker.Box()
+    for name, value in values.items():
+        setattr(box, name, value)
+    box.buildBox()
+    # Settings that can't be built are explained, which isn't a failure
+    recorder.messages[:] = [message for message in recorder.messages if not message.startswith('This box can\'t be built')]
+
+def buildHolster(values: dict):
+    holsterMaker.run(None)
+    command = adsk.core.Application.get().userInterface.commandDefinitions.itemById(holsterMaker._commandId)._command
+    for name, value in values.items():
+        command._changeInput(name, value)
+    command._ok()
+    command._close()
+
+# Five holsters in one batch: two shapes, one of them again under another name, one repeated, and
+# one that can't be built
+HOLSTER_CATALOG = [
+    {'kind': 'holster', 'holsterName': 'Small', 'remoteWidth': 40.0, 'remoteLength': 120.0},
+    {'kind': 'holster', 'holsterName': 'Large', 'remoteWidth': 60.0, 'remoteLength': 200.0, 'includeScrewHoles': False},
+    {'kind': 'holster', 'holsterName': 'Small Spare', 'remoteWidth': 40.0, 'remoteLength': 120.0},
+    {'kind': 'box', 'slotsWide': 2},
+    {'kind': 'holster', 'holsterName': 'Large', 'remoteWidth': 60.0, 'remoteLength': 200.0, 'includeScrewHoles': False},
+    {'kind': 'holster', 'holsterName': 'Too Wide a Slot', 'frontSlotWidth': 100.0},
+]
+
+def buildHolsterCatalog(values: dict):
+    path = os.path.join(tempfile.gettempdir(), 'holster-catalog.json')
+    with open(path, 'w') as f:
+        json.dump(HOLSTER_CATALOG, f)
+    buildHolster(dict(values, catalogPath=path))
+    # The batch ends by listing its parts, which isn't a failure
+    recorder.messages[:] = [message for message in recorder.messages if not message.startswith('Holster catalog')]
+
+# Builds once uncounted, then counts building the same again in the same design
+def again(build):
+    def buildAgain(values: dict):
+        build(values)
+        recorder.reset()
+        build(values)
+    return buildAgain
+
+# Counts a box built in a design whose foot library a different box has already filled
+def buildBoxWithFootLibrary(values: dict):
+    buildBox(dict(values, slotsWide=1, slotsDeep=1, baseOnly=True))
+    recorder.reset()
+    buildBox(values)
+
+def measure(build, values: dict) -> dict:
+    adsk.core._reset()
+    build(values)
+    if recorder.messages:
+        raise RuntimeError('\n'.join(recorder.messages))
+    return recorder.summary()
+
+def main():
+    parser = argparse.ArgumentParser(description='API call budgets for both makers')
+    parser.add_argument('--update', action='store_true', help='write the current counts to budgets.json')
+    parser.add_argument('-k', dest='keyword', default='', help='only run configurations whose name contains this')
+    parser.add_argument('--verbose', action='store_true', help='list the most frequent calls for each configuration')
+    options = parser.parse_args()
+
+    budgets = {}
+    if os.path.exists(BUDGETS):
+        with open(BUDGETS) as f:
+            budgets = json.load(f)
+
+    configurations = [(name, buildBox, values) for name, values in boxConfigurations()]
+    configurations += [(name, buildHolster, values) for name, values in holsterConfigurations()]
+    configurations += [('box 2x2 again', again(buildBox), {}), ('holster again', again(buildHolster), {})]
+    configurations += [('holster catalog', buildHolsterCatalog, {})]
+    configurations += [('box 3x3 foot library', buildBoxWithFootLibrary, dict(slotsWide=3, slotsDeep=3)),
+                       ('box 3x3 magnets foot library', buildBoxWithFootLibrary, dict(slotsWide=3, slotsDeep=3, includeMagnets=True))]
+
+    results = {}
+    failures = []
+    metrics = None
+    for name, build, values in configurations:
+        if options.keyword not in name:
+            continue
+        try:
+            counts = measure(build, values)
+        except Exception as e:
+            failures.append('{}: failed to build\n{}'.format(name, e))
+            continue
+        results[name] = counts
+        if metrics is None:
+            metrics = list(counts)
+            print('{:<40}'.format('configuration') + ''.join('{:>14}'.format(m) for m in metrics))
+        print('{:<40}'.format(name) + ''.join('{:>14}'.format(counts[m]) for m in metrics))
+        if options.verbose:
+            for call, n in recorder.calls.most_common(10):
+                print('    {:>8}  {}'.format(n, call))
+
+        if build is buildBox and counts['features'] > BOX_FEATURES:
+            failures.append('{}: {} features, more than the {} any box may take'.format(name, counts['features'], BOX_FEATURES))
+
+        budget = budgets.get(name)
+        if budget is None:
+            if not options.update:
+                failures.append('{}: no budget'.format(name))
+            continue
+        for metric, value in counts.items():
+            if metric in budget and value > budget[metric]:
+                failures.append('{}: {} went from {} to {}'.format(name, metric, budget[metric], value))
+
+    if options.update:
+        budgets.update(results)
+        with open(BUDGETS, 'w') as f:
+            json.dump(budgets, f, indent=2, sort_keys=True)
+            f.write('\n')
+        print('Wrote {} budgets to {}'.format(len(results), BUDGETS))
+        failures = [f for f in failures if 'failed to build' in f or 'any box may take' in f]
+
+    for failure in failures:
+        print('FAIL ' + failure)
+    return 1 if failures else 0
+
+if __name__ == '__main__':
+    sys.exit(main())
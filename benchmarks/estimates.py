@@ -0,0 +1,127 @@
+#!/usr/bin/env python3
+#Description- Checks the analytic box and holster estimates against watertight meshes of a random sample of each
+#
+# Usage: python benchmarks/estimates.py [-n count] [--seed seed]
+#
+# Each box in the sample is meshed with boxMesh(), and each holster with solidHolsterMesh(),
+# and its volume, surface area and size measured from the triangles; boxEstimate() and
+# holsterEstimate() do the whole sample at once. Fails if any estimate is further off than the
+# tolerances below, or any mesh isn't watertight. The meshes have straight-sided corners and scoops, so they come out a little
+# under the true shapes.
+
+import argparse
+import os
+import sys
+import time
+
+HERE = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, os.path.dirname(HERE))
+
+import numpy as np
+from GridFinityDividerBoxMaker.boxmesh import boxMesh
+from GridFinityDividerBoxMaker.boxestimate import boxEstimate
+from GridFinityDividerBoxMaker.boxcheck import boxProblems
+from RemoteHolsterMaker.holstersolid import solidHolsterMesh
+from RemoteHolsterMaker.holsterestimate import holsterEstimate
+from RemoteHolsterMaker.holstercheck import holsterProblems
+
+# Relative tolerances
+VOLUME = 0.002
+AREA = 0.015
+SIZE = 1e-6
+
+def boxSample(count: int, seed: int) -> dict:
+    random = np.random.default_rng(seed)
+    return {
+        'slotsWide': random.integers(1, 6, count),
+        'slotsDeep': random.integers(1, 6, count),
+        'slotsHigh': random.choice([0.3, 0.5, 0.8, 1.0, 1.25, 1.45, 2.0, 3.0], count),
+        'dividerCount': random.integers(0, 5, count),
+        'dividerCountDeep': random.integers(0, 4, count),
+        'includeScoop': random.random(count) < 0.5,
+        'baseOnly': random.random(count) < 0.1,
+        'includeLedge': random.random(count) < 0.5,
+        'includeMagnets': random.random(count) < 0.5,
+    }
+
+# Remotes from a slim stick to a big universal, in holsters of every strength and style, fronts from
+# barely above the bottom, and slot rounds up to and past what fits. Some won't be buildable, and
+# are dropped.
+def holsterSample(count: int, seed: int) -> dict:
+    random = np.random.default_rng(seed)
+    remoteLength = random.uniform(50, 150, count)
+    return {
+        'remoteWidth': random.uniform(30, 90, count),
+        'remoteLength': remoteLength,
+        'remoteThickness': random.uniform(8, 30, count),
+        'frontSlotWidth': random.uniform(5, 25, count),
+        'frontHeight': remoteLength * random.uniform(0.02, 0.8, count),
+        'backCornerRound': random.uniform(0.25, 10, count),
+        'frontSlotRound': np.where(random.random(count) < 0.2, 0.0, random.uniform(0, 30, count)),
+        'sideThickness': random.uniform(2, 6, count),
+        'backThickness': random.uniform(2, 6, count),
+        'bottomThickness': random.uniform(2, 6, count),
+        'includeScrewHoles': random.random(count) < 0.7,
+    }
+
+# The parts of a sample the dialog would build; problems is holsterProblems() or the like
+def buildable(sample: dict, problems) -> dict:
+    count = len(next(iter(sample.values())))
+    keep = np.array([not problems(**{name: values[n].item() for name, values in sample.items()}) for n in range(count)], dtype=bool)
+    return {name: values[keep] for name, values in sample.items()}
+
+# Every triangle's edge is met once by an edge running the other way, and by no other
+def watertight(triangles: np.ndarray) -> bool:
+    edges = np.concatenate([triangles[:, [0, 1]], triangles[:, [1, 2]], triangles[:, [2, 0]]])
+    forward = np.unique(edges, axis=0)
+    backward = np.unique(edges[:, ::-1], axis=0)
+    return len(forward) == len(edges) and np.array_equal(forward, backward)
+
+# Volume, area and size of a mesh, and whether it's watertight; up is y for boxes and z for holsters
+def measure(mesh, up: int) -> dict:
+    vertices, triangles = mesh.arrays()
+    corners = vertices[triangles]
+    size = np.ptp(vertices, axis=0)
+    return {'volume': np.einsum('ij,ij->i', corners[:, 0], np.cross(corners[:, 1], corners[:, 2])).sum() / 6,
+            'area': np.linalg.norm(np.cross(corners[:, 1] - corners[:, 0], corners[:, 2] - corners[:, 0]), axis=1).sum() / 2,
+            'width': size[0], 'depth': size[3 - up], 'height': size[up], 'watertight': watertight(triangles)}
+
+# Prints every estimate of the sample further off than the tolerances; returns how many
+def compare(kind: str, sample: dict, estimate, makeMesh, up: int) -> int:
+    count = len(next(iter(sample.values())))
+    started = time.perf_counter()
+    estimates = estimate(**sample)
+    estimated = time.perf_counter() - started
+
+    started = time.perf_counter()
+    measured = [measure(makeMesh(**{name: values[n].item() for name, values in sample.items()}), up) for n in range(count)]
+    meshed = time.perf_counter() - started
+
+    failed = 0
+    for n in range(count):
+        if not measured[n]['watertight']:
+            failed += 1
+            print('{} mesh not watertight: {}'.format(kind, {key: values[n].item() for key, values in sample.items()}))
+    worst = {}
+    for name, tolerance in (('volume', VOLUME), ('area', AREA), ('width', SIZE), ('depth', SIZE), ('height', SIZE)):
+        errors = np.array([estimates[name][n] / measured[n][name] - 1 for n in range(count)])
+        worst[name] = np.abs(errors).max()
+        for n in np.nonzero(np.abs(errors) > tolerance)[0]:
+            failed += 1
+            print('{} {} off by {:+.2%}: {}'.format(kind, name, errors[n], {key: values[n].item() for key, values in sample.items()}))
+    print('{} {} estimated in {:.3f}s, meshed in {:.1f}s'.format(count, kind, estimated, meshed))
+    print('worst: ' + ', '.join('{} {:.3%}'.format(name, error) for name, error in worst.items()))
+    return failed
+
+def main():
+    parser = argparse.ArgumentParser(description='Check box and holster estimates against meshes')
+    parser.add_argument('-n', dest='count', type=int, default=100, help='boxes, and holsters, in the sample')
+    parser.add_argument('--seed', type=int, default=0, help='seed for the sample')
+    options = parser.parse_args()
+
+    failed = compare('boxes', buildable(boxSample(options.count, options.seed), lambda includeMagnets, **sizes: boxProblems(**sizes)), boxEstimate, boxMesh, 1)
+    failed += compare('holsters', buildable(holsterSample(options.count, options.seed), holsterProblems), holsterEstimate, solidHolsterMesh, 2)
+    return 1 if failed else 0
+
+if __name__ == '__main__':
+    sys.exit(main())
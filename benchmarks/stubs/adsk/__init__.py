@@ -0,0 +1,12 @@
+# Stand-in for Fusion 360's adsk package, for running the scripts headless. See _stub.py.
+
+from ._stub import recorder
+
+def doEvents():
+    recorder.call('adsk.doEvents')
+
+def autoTerminate(value: bool):
+    recorder.call('adsk.autoTerminate')
+
+def terminate():
+    recorder.call('adsk.terminate')
@@ -0,0 +1,133 @@
+# Recording stand-in for the parts of the Fusion 360 API the scripts use.
+#
+# Every public attribute read or write on a stub object, and every public class attribute, counts
+# as one API call. Nothing is solved or modelled properly: sketches are split into profiles by
+# joining up curve ends, and bodies are a list of faces and edges with bounding boxes, made up
+# from what each feature was given. That's enough for the scripts' own topology queries to find
+# what they look for, and for the counts to be stable from run to run.
+
+import math
+from collections import Counter, defaultdict
+
+EPSILON = 1e-7
+
+class Recorder:
+    def __init__(self):
+        self.reset()
+
+    def reset(self):
+        self.calls = Counter()
+        self.created = Counter()
+        self.messages = []
+
+    def call(self, name: str):
+        self.calls[name] += 1
+
+    def create(self, kind: str, count: int = 1):
+        self.created[kind] += count
+
+    # The numbers the budgets are kept for
+    def summary(self) -> dict:
+        return {
+            'calls': sum(self.calls.values()),
+            'sketches': self.created['sketch'],
+            'curves': self.created['curve'],
+            'features': self.created['feature'],
+            'iterations': self.created['iteration'],
+            'boundingBoxes': sum(n for name, n in self.calls.items() if name.endswith('.boundingBox')),
+        }
+
+recorder = Recorder()
+
+class ApiMeta(type):
+    def __getattribute__(cls, name):
+        if not name.startswith('_'):
+            recorder.call(type.__getattribute__(cls, '__name__') + '.' + name)
+        return type.__getattribute__(cls, name)
+
+class ApiObject(metaclass=ApiMeta):
+    def __getattribute__(self, name):
+        if not name.startswith('_'):
+            recorder.call(type(self).__name__ + '.' + name)
+        return object.__getattribute__(self, name)
+
+    def __setattr__(self, name, value):
+        if not name.startswith('_'):
+            recorder.call(type(self).__name__ + '.' + name + '=')
+        object.__setattr__(self, name, value)
+
+    @classmethod
+    def cast(cls, obj):
+        return obj if isinstance(obj, cls) else None
+
+# Collections iterate like Fusion's; each item handed out counts as an iteration
+class Collection(ApiObject):
+    def __init__(self, items=None):
+        self._items = list(items) if items is not None else []
+
+    @property
+    def count(self):
+        return len(self._items)
+
+    def item(self, index: int):
+        return self._items[index] if 0 <= index < len(self._items) else None
+
+    def __iter__(self):
+        recorder.call(type(self).__name__ + '.__iter__')
+        for item in list(self._items):
+            recorder.create('iteration')
+            yield item
+
+# Bounding boxes are (min, max) pairs of 3-tuples
+def boxOf(points) -> tuple:
+    points = list(points)
+    return (tuple(min(p[i] for p in points) for i in range(3)), tuple(max(p[i] for p in points) for i in range(3)))
+
+def unionOf(boxes) -> tuple:
+    boxes = list(boxes)
+    return boxOf([b[0] for b in boxes] + [b[1] for b in boxes])
+
+def translated(box: tuple, v: tuple) -> tuple:
+    return (tuple(box[0][i] + v[i] for i in range(3)), tuple(box[1][i] + v[i] for i in range(3)))
+
+def flatAxis(box: tuple):
+    for axis in range(3):
+        if box[1][axis] - box[0][axis] < EPSILON:
+            return axis
+    return None
+
+def overlaps(a: tuple, b: tuple) -> bool:
+    return all(a[0][i] <= b[1][i] + EPSILON and b[0][i] <= a[1][i] + EPSILON for i in range(3))
+
+def distance(p: tuple, q: tuple) -> float:
+    return math.sqrt(sum((p[i] - q[i]) ** 2 for i in range(3)))
+
+# Faces and edges of a made-up body. Planar faces that land on the same plane and touch are
+# merged, much as Fusion would merge coplanar faces after a join.
+class Topology:
+    def __init__(self):
+        self.faces = []
+        self.edges = []
+        self.planes = defaultdict(list)
+
+    def addEdge(self, edge):
+        self.edges.append(edge)
+
+    def addFace(self, face):
+        axis = flatAxis(face._box)
+        if axis is not None:
+            key = (axis, round(face._box[0][axis], 6))
+            for other in self.planes[key]:
+                if overlaps(other._box, face._box):
+                    other._box = unionOf([other._box, face._box])
+                    other._edges.extend(face._edges)
+                    return other
+            self.planes[key].append(face)
+        self.faces.append(face)
+        return face
+
+    def absorb(self, other):
+        for edge in other.edges:
+            self.addEdge(edge)
+        for face in other.faces:
+            self.addFace(face)
@@ -0,0 +1 @@
+# Imported by the scripts but never used
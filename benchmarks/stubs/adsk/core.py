@@ -0,0 +1,656 @@
+# Stand-in for adsk.core. See _stub.py.
+
+import math
+
+from ._stub import ApiObject, Collection, recorder
+
+class DropDownStyles:
+    CheckBoxDropDownStyle = 0
+    LabeledIconDropDownStyle = 1
+    TextListDropDownStyle = 2
+
+# Geometry
+
+class Point3D(ApiObject):
+    def __init__(self, x: float, y: float, z: float):
+        self._xyz = (float(x), float(y), float(z))
+
+    @staticmethod
+    def create(x: float = 0, y: float = 0, z: float = 0):
+        return Point3D(x, y, z)
+
+    @property
+    def x(self):
+        return self._xyz[0]
+
+    @property
+    def y(self):
+        return self._xyz[1]
+
+    @property
+    def z(self):
+        return self._xyz[2]
+
+    def asArray(self):
+        return list(self._xyz)
+
+class Vector3D(ApiObject):
+    def __init__(self, x: float, y: float, z: float):
+        self._xyz = (float(x), float(y), float(z))
+
+    @staticmethod
+    def create(x: float = 0, y: float = 0, z: float = 0):
+        return Vector3D(x, y, z)
+
+    def asArray(self):
+        return list(self._xyz)
+
+class Matrix3D(ApiObject):
+    def __init__(self):
+        self._translation = (0.0, 0.0, 0.0)
+
+    @staticmethod
+    def create():
+        return Matrix3D()
+
+    @property
+    def translation(self):
+        return Vector3D(*self._translation)
+
+    @translation.setter
+    def translation(self, value):
+        self._translation = value._xyz
+
+class BoundingBox3D(ApiObject):
+    def __init__(self, box: tuple):
+        self._box = box
+
+    @property
+    def minPoint(self):
+        return Point3D(*self._box[0])
+
+    @property
+    def maxPoint(self):
+        return Point3D(*self._box[1])
+
+class OrientedBoundingBox3D(ApiObject):
+    def __init__(self, centre, lengthDirection, widthDirection, length, width, height):
+        self._centre = centre._xyz
+        self._size = (length, width, height)
+
+    @staticmethod
+    def create(centerPoint, lengthDirection, widthDirection, length: float, width: float, height: float):
+        return OrientedBoundingBox3D(centerPoint, lengthDirection, widthDirection, length, width, height)
+
+class ValueInput(ApiObject):
+    def __init__(self, value):
+        self._value = value
+
+    @staticmethod
+    def createByReal(value: float):
+        return ValueInput(float(value))
+
+    @staticmethod
+    def createByString(value: str):
+        return ValueInput(value)
+
+    @property
+    def realValue(self):
+        return self._value
+
+class ObjectCollection(Collection):
+    @staticmethod
+    def create():
+        return ObjectCollection()
+
+    def add(self, item):
+        self._items.append(item)
+        return True
+
+    def clear(self):
+        self._items.clear()
+        return True
+
+    def find(self, item, startIndex: int = 0):
+        for n in range(startIndex, len(self._items)):
+            if self._items[n] is item:
+                return n
+        return -1
+
+    def removeByIndex(self, index: int):
+        del self._items[index]
+        return True
+
+class NamedValues(ApiObject):
+    def __init__(self):
+        self._values = {}
+
+    @staticmethod
+    def create():
+        return NamedValues()
+
+    def add(self, name: str, value):
+        self._values[name] = value
+        return True
+
+# Events
+
+class Event(ApiObject):
+    def __init__(self, name: str, sender=None):
+        self._name = name
+        self._sender = sender
+        self._handlers = []
+
+    @property
+    def name(self):
+        return self._name
+
+    @property
+    def sender(self):
+        return self._sender
+
+    def add(self, handler):
+        self._handlers.append(handler)
+        return True
+
+    def remove(self, handler):
+        if handler in self._handlers:
+            self._handlers.remove(handler)
+        return True
+
+    def _fire(self, args):
+        args._firingEvent = self
+        for handler in list(self._handlers):
+            handler.notify(args)
+        return args
+
+# Handlers are the scripts' own classes, so they aren't API objects and aren't counted
+class EventHandler:
+    def __init__(self):
+        pass
+
+class CommandCreatedEventHandler(EventHandler):
+    pass
+
+class CommandEventHandler(EventHandler):
+    pass
+
+class InputChangedEventHandler(EventHandler):
+    pass
+
+class CustomEventHandler(EventHandler):
+    pass
+
+class ValidateInputsEventHandler(EventHandler):
+    pass
+
+class EventArgs(ApiObject):
+    def __init__(self):
+        self._firingEvent = None
+
+    @property
+    def firingEvent(self):
+        return self._firingEvent
+
+class CommandCreatedEventArgs(EventArgs):
+    def __init__(self, command):
+        super().__init__()
+        self._command = command
+
+    @property
+    def command(self):
+        return self._command
+
+class CommandEventArgs(EventArgs):
+    def __init__(self, command):
+        super().__init__()
+        self._command = command
+        self._isValidResult = False
+        self._executeFailed = False
+
+    @property
+    def command(self):
+        return self._command
+
+    @property
+    def isValidResult(self):
+        return self._isValidResult
+
+    @isValidResult.setter
+    def isValidResult(self, value):
+        self._isValidResult = value
+
+    @property
+    def executeFailed(self):
+        return self._executeFailed
+
+    @executeFailed.setter
+    def executeFailed(self, value):
+        self._executeFailed = value
+
+class InputChangedEventArgs(EventArgs):
+    def __init__(self, input, inputs):
+        super().__init__()
+        self._input = input
+        self._inputs = inputs
+
+    @property
+    def input(self):
+        return self._input
+
+    @property
+    def inputs(self):
+        return self._inputs
+
+class ValidateInputsEventArgs(EventArgs):
+    def __init__(self, inputs):
+        super().__init__()
+        self._inputs = inputs
+        self._areInputsValid = True
+
+    @property
+    def inputs(self):
+        return self._inputs
+
+    @property
+    def areInputsValid(self):
+        return self._areInputsValid
+
+    @areInputsValid.setter
+    def areInputsValid(self, value):
+        self._areInputsValid = value
+
+class CustomEventArgs(EventArgs):
+    def __init__(self, additionalInfo: str):
+        super().__init__()
+        self._additionalInfo = additionalInfo
+
+    @property
+    def additionalInfo(self):
+        return self._additionalInfo
+
+# Command inputs
+
+class CommandInput(ApiObject):
+    def __init__(self, id: str, name: str, value=None):
+        self._id = id
+        self._name = name
+        self._value = value
+        self._isVisible = True
+        self._isEnabled = True
+        self._tooltip = ''
+
+    @property
+    def id(self):
+        return self._id
+
+    @property
+    def name(self):
+        return self._name
+
+    @property
+    def value(self):
+        return self._value
+
+    @value.setter
+    def value(self, value):
+        self._value = value
+
+    @property
+    def isVisible(self):
+        return self._isVisible
+
+    @isVisible.setter
+    def isVisible(self, value):
+        self._isVisible = value
+
+    @property
+    def isEnabled(self):
+        return self._isEnabled
+
+    @isEnabled.setter
+    def isEnabled(self, value):
+        self._isEnabled = value
+
+    @property
+    def tooltip(self):
+        return self._tooltip
+
+    @tooltip.setter
+    def tooltip(self, value):
+        self._tooltip = value
+
+class StringValueCommandInput(CommandInput):
+    pass
+
+class BoolValueCommandInput(CommandInput):
+    pass
+
+class IntegerSpinnerCommandInput(CommandInput):
+    pass
+
+class FloatSpinnerCommandInput(CommandInput):
+    pass
+
+class IntegerSliderCommandInput(CommandInput):
+    pass
+
+class TextBoxCommandInput(CommandInput):
+    @property
+    def text(self):
+        return self._value
+
+    @text.setter
+    def text(self, value):
+        self._value = value
+
+    @property
+    def formattedText(self):
+        return self._value
+
+    @formattedText.setter
+    def formattedText(self, value):
+        self._value = value
+
+class ListItem(ApiObject):
+    def __init__(self, name: str, isSelected: bool):
+        self._name = name
+        self._isSelected = isSelected
+
+    @property
+    def name(self):
+        return self._name
+
+    @property
+    def isSelected(self):
+        return self._isSelected
+
+    @isSelected.setter
+    def isSelected(self, value):
+        self._isSelected = value
+
+class ListItems(Collection):
+    def add(self, name: str, isSelected: bool, icon: str = '', beforeIndex: int = -1):
+        item = ListItem(name, isSelected)
+        self._items.append(item)
+        return item
+
+class DropDownCommandInput(CommandInput):
+    def __init__(self, id: str, name: str):
+        super().__init__(id, name)
+        self._listItems = ListItems()
+
+    @property
+    def listItems(self):
+        return self._listItems
+
+    @property
+    def selectedItem(self):
+        for item in self._listItems._items:
+            if item._isSelected:
+                return item
+        return None
+
+    # Headless drivers pick by label, as a user would
+    def _select(self, name: str):
+        for item in self._listItems._items:
+            item._isSelected = item._name == name
+
+class CommandInputs(Collection):
+    def __init__(self, command=None):
+        super().__init__()
+        self._command = command
+
+    @property
+    def command(self):
+        return self._command
+
+    def _add(self, input):
+        self._items.append(input)
+        return input
+
+    # Every input, including those inside groups, as the scripts expect
+    def _all(self):
+        for input in self._items:
+            yield input
+            if isinstance(input, GroupCommandInput):
+                yield from input._children._all()
+
+    def __iter__(self):
+        recorder.call(type(self).__name__ + '.__iter__')
+        for input in list(self._all()):
+            recorder.create('iteration')
+            yield input
+
+    def itemById(self, id: str):
+        for input in self._all():
+            if input._id == id:
+                return input
+        return None
+
+    def addStringValueInput(self, id: str, name: str, initialValue: str = ''):
+        return self._add(StringValueCommandInput(id, name, initialValue))
+
+    def addBoolValueInput(self, id: str, name: str, isCheckBox: bool, resourceFolder: str = '', initialValue: bool = False):
+        return self._add(BoolValueCommandInput(id, name, initialValue))
+
+    def addIntegerSpinnerCommandInput(self, id: str, name: str, min: int, max: int, spinStep: int, initialValue: int):
+        return self._add(IntegerSpinnerCommandInput(id, name, initialValue))
+
+    def addFloatSpinnerCommandInput(self, id: str, name: str, unitType: str, min: float, max: float, spinStep: float, initialValue: float):
+        return self._add(FloatSpinnerCommandInput(id, name, initialValue))
+
+    def addIntegerSliderCommandInput(self, id: str, name: str, min: int, max: int, hasTwoSliders: bool = False):
+        return self._add(IntegerSliderCommandInput(id, name, min))
+
+    def addTextBoxCommandInput(self, id: str, name: str, formattedText: str, numRows: int, isReadOnly: bool):
+        return self._add(TextBoxCommandInput(id, name, formattedText))
+
+    def addDropDownCommandInput(self, id: str, name: str, dropDownStyle: int):
+        return self._add(DropDownCommandInput(id, name))
+
+    def addGroupCommandInput(self, id: str, name: str):
+        return self._add(GroupCommandInput(id, name, self._command))
+
+class GroupCommandInput(CommandInput):
+    def __init__(self, id: str, name: str, command=None):
+        super().__init__(id, name)
+        self._children = CommandInputs(command)
+        self._isExpanded = True
+
+    @property
+    def children(self):
+        return self._children
+
+    @property
+    def isExpanded(self):
+        return self._isExpanded
+
+    @isExpanded.setter
+    def isExpanded(self, value):
+        self._isExpanded = value
+
+# Commands
+
+class Command(ApiObject):
+    def __init__(self):
+        self._commandInputs = CommandInputs(self)
+        self._isRepeatable = True
+        self._execute = Event('execute', self)
+        self._executePreview = Event('executePreview', self)
+        self._destroy = Event('destroy', self)
+        self._inputChanged = Event('inputChanged', self)
+        self._validateInputs = Event('validateInputs', self)
+
+    @property
+    def commandInputs(self):
+        return self._commandInputs
+
+    @property
+    def isRepeatable(self):
+        return self._isRepeatable
+
+    @isRepeatable.setter
+    def isRepeatable(self, value):
+        self._isRepeatable = value
+
+    @property
+    def execute(self):
+        return self._execute
+
+    @property
+    def executePreview(self):
+        return self._executePreview
+
+    @property
+    def destroy(self):
+        return self._destroy
+
+    @property
+    def inputChanged(self):
+        return self._inputChanged
+
+    @property
+    def validateInputs(self):
+        return self._validateInputs
+
+    def doExecutePreview(self):
+        self._preview()
+        return True
+
+    # What Fusion does when the dialog changes, and on OK and close
+    def _changeInput(self, id: str, value):
+        input = self._commandInputs.itemById(id)
+        if isinstance(input, DropDownCommandInput):
+            input._select(value)
+        else:
+            input._value = value
+        self._inputChanged._fire(InputChangedEventArgs(input, self._commandInputs))
+        return input
+
+    def _validate(self) -> bool:
+        return self._validateInputs._fire(ValidateInputsEventArgs(self._commandInputs))._areInputsValid
+
+    def _preview(self):
+        return self._executePreview._fire(CommandEventArgs(self))
+
+    # OK can't be pressed while the inputs are invalid
+    def _ok(self):
+        if not self._validate():
+            return None
+        return self._execute._fire(CommandEventArgs(self))
+
+    def _close(self):
+        return self._destroy._fire(CommandEventArgs(self))
+
+class CommandDefinition(ApiObject):
+    def __init__(self, id: str, name: str):
+        self._id = id
+        self._name = name
+        self._commandCreated = Event('commandCreated', self)
+        self._command = None
+
+    @property
+    def id(self):
+        return self._id
+
+    @property
+    def commandCreated(self):
+        return self._commandCreated
+
+    def execute(self, input=None):
+        self._command = Command()
+        self._commandCreated._fire(CommandCreatedEventArgs(self._command))
+        return True
+
+class CommandDefinitions(Collection):
+    def itemById(self, id: str):
+        for definition in self._items:
+            if definition._id == id:
+                return definition
+        return None
+
+    def addButtonDefinition(self, id: str, name: str, tooltip: str, resourceFolder: str = ''):
+        definition = CommandDefinition(id, name)
+        self._items.append(definition)
+        return definition
+
+# The application
+
+class UserInterface(ApiObject):
+    def __init__(self):
+        self._commandDefinitions = CommandDefinitions()
+
+    @property
+    def commandDefinitions(self):
+        return self._commandDefinitions
+
+    def messageBox(self, text: str, title: str = '', buttons: int = 0, icon: int = 0):
+        recorder.messages.append(text)
+        return 0
+
+class Products(Collection):
+    def itemByProductType(self, productType: str):
+        return self._items[0] if productType == 'DesignProductType' and self._items else None
+
+class Document(ApiObject):
+    def __init__(self, design):
+        self._products = Products([design])
+
+    @property
+    def products(self):
+        return self._products
+
+class Application(ApiObject):
+    _instance = None
+
+    def __init__(self, design):
+        self._userInterface = UserInterface()
+        self._design = design
+        self._document = Document(design)
+        self._customEvents = {}
+
+    @staticmethod
+    def get():
+        return Application._instance
+
+    @property
+    def userInterface(self):
+        return self._userInterface
+
+    @property
+    def activeProduct(self):
+        return self._design
+
+    @property
+    def activeDocument(self):
+        return self._document
+
+    def registerCustomEvent(self, eventId: str):
+        event = Event(eventId, self)
+        self._customEvents[eventId] = event
+        return event
+
+    def unregisterCustomEvent(self, eventId: str):
+        return self._customEvents.pop(eventId, None) is not None
+
+    def fireCustomEvent(self, eventId: str, additionalInfo: str = ''):
+        event = self._customEvents.get(eventId)
+        if event:
+            event._fire(CustomEventArgs(additionalInfo))
+        return event is not None
+
+class Color(ApiObject):
+    def __init__(self, red: int, green: int, blue: int, opacity: int):
+        self._rgba = (red, green, blue, opacity)
+
+    @staticmethod
+    def create(red: int, green: int, blue: int, opacity: int):
+        return Color(red, green, blue, opacity)
+
+# A fresh application and design for the next run. Parametric unless told otherwise.
+def _reset(parametric: bool = True):
+    from . import fusion
+    recorder.reset()
+    Application._instance = Application(fusion.Design(parametric))
+    return Application._instance
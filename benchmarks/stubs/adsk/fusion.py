@@ -0,0 +1,1058 @@
+# Stand-in for adsk.fusion. See _stub.py.
+
+import math
+
+from ._stub import ApiObject, Collection, Topology, recorder, boxOf, unionOf, translated, flatAxis, distance
+from .core import BoundingBox3D, ObjectCollection, Point3D
+
+class FeatureOperations:
+    JoinFeatureOperation = 0
+    CutFeatureOperation = 1
+    IntersectFeatureOperation = 2
+    NewBodyFeatureOperation = 3
+    NewComponentFeatureOperation = 4
+
+class DesignTypes:
+    DirectDesignType = 0
+    ParametricDesignType = 1
+
+class DistanceUnits:
+    MillimeterDistanceUnits = 0
+    CentimeterDistanceUnits = 1
+    MeterDistanceUnits = 2
+    InchDistanceUnits = 3
+    FootDistanceUnits = 4
+
+class ExtentDirections:
+    PositiveExtentDirection = 0
+    NegativeExtentDirection = 1
+    SymmetricExtentDirection = 2
+
+class PatternDistanceType:
+    ExtentPatternDistanceType = 0
+    SpacingPatternDistanceType = 1
+
+class BooleanTypes:
+    DifferenceBooleanType = 0
+    IntersectionBooleanType = 1
+    UnionBooleanType = 2
+
+# Where sketch coordinates end up in the model, which way each plane faces, and where model
+# coordinates are in the sketch
+PLANES = {
+    'xY': (lambda x, y, z: (x, y, z), (0.0, 0.0, 1.0), lambda x, y, z: (x, y, z)),
+    'xZ': (lambda x, y, z: (x, z, -y), (0.0, 1.0, 0.0), lambda x, y, z: (x, -z, y)),
+    'yZ': (lambda x, y, z: (z, y, -x), (1.0, 0.0, 0.0), lambda x, y, z: (-z, y, x)),
+}
+
+# B-Rep
+
+class BRepEdge(ApiObject):
+    def __init__(self, box: tuple, length: float):
+        self._box = box
+        self._length = length
+
+    @property
+    def boundingBox(self):
+        return BoundingBox3D(self._box)
+
+    @property
+    def length(self):
+        return self._length
+
+    def _moved(self, v: tuple):
+        return BRepEdge(translated(self._box, v), self._length)
+
+class BRepEdges(Collection):
+    pass
+
+class BRepFace(ApiObject):
+    def __init__(self, box: tuple, edges: list):
+        self._box = box
+        self._edges = list(edges)
+
+    @property
+    def boundingBox(self):
+        return BoundingBox3D(self._box)
+
+    @property
+    def edges(self):
+        return BRepEdges(self._edges)
+
+    # The face as a loop of (box, length, start) segments, for extruding it
+    def _loop(self):
+        return [(edge._box, edge._length, edge._box[0]) for edge in self._edges]
+
+class BRepFaces(Collection):
+    pass
+
+class BRepBody(ApiObject):
+    def __init__(self, component=None, topology: Topology = None):
+        self._component = component
+        self._topology = topology or Topology()
+        self._name = 'Body'
+
+    @property
+    def name(self):
+        return self._name
+
+    @name.setter
+    def name(self, value):
+        self._name = value
+
+    @property
+    def parentComponent(self):
+        return self._component
+
+    # Bodies are never merged away here
+    @property
+    def isValid(self):
+        return True
+
+    @property
+    def edges(self):
+        return BRepEdges(self._topology.edges)
+
+    @property
+    def faces(self):
+        return BRepFaces(self._topology.faces)
+
+    @property
+    def boundingBox(self):
+        faces = self._topology.faces
+        return BoundingBox3D(unionOf(face._box for face in faces) if faces else ((0, 0, 0), (0, 0, 0)))
+
+    def _copy(self, v: tuple = (0.0, 0.0, 0.0)):
+        copy = BRepBody(self._component)
+        edges = {}
+        for edge in self._topology.edges:
+            edges[id(edge)] = edge._moved(v)
+            copy._topology.addEdge(edges[id(edge)])
+        for face in self._topology.faces:
+            copy._topology.addFace(BRepFace(translated(face._box, v), [edges.get(id(e)) or e._moved(v) for e in face._edges]))
+        return copy
+
+class BRepBodies(Collection):
+    def __init__(self, component):
+        super().__init__()
+        self._component = component
+
+    def add(self, body, baseFeature=None):
+        recorder.create('body')
+        added = body._copy()
+        added._component = self._component
+        self._items.append(added)
+        return added
+
+class TemporaryBRepManager(ApiObject):
+    _instance = None
+
+    @staticmethod
+    def get():
+        if TemporaryBRepManager._instance is None:
+            TemporaryBRepManager._instance = TemporaryBRepManager()
+        return TemporaryBRepManager._instance
+
+    def createBox(self, box):
+        recorder.create('transientBody')
+        c, s = box._centre, box._size
+        return self._solid(boxOf([tuple(c[i] - s[i] / 2 for i in range(3)), tuple(c[i] + s[i] / 2 for i in range(3))]))
+
+    def createCylinderOrCone(self, pointOne, pointOneRadius: float, pointTwo, pointTwoRadius: float):
+        recorder.create('transientBody')
+        r = max(pointOneRadius, pointTwoRadius)
+        ends = [pointOne._xyz, pointTwo._xyz]
+        return self._solid(boxOf([tuple(p[i] + d for i in range(3)) for p in ends for d in (-r, r)]))
+
+    def booleanOperation(self, targetBody, toolBody, booleanType: int):
+        recorder.create('transientBoolean')
+        if booleanType == BooleanTypes.UnionBooleanType:
+            targetBody._topology.absorb(toolBody._topology)
+        return True
+
+    def copy(self, body):
+        return body._copy()
+
+    def transform(self, body, transform):
+        moved = body._copy(transform._translation)
+        body._topology = moved._topology
+        return True
+
+    # A made-up box of six faces and twelve edges
+    @staticmethod
+    def _solid(box: tuple):
+        body = BRepBody()
+        lo, hi = box
+        corners = [(x, y, z) for x in (lo[0], hi[0]) for y in (lo[1], hi[1]) for z in (lo[2], hi[2])]
+        edges = [BRepEdge(boxOf([a, b]), distance(a, b)) for a in corners for b in corners
+                 if a < b and sum(a[i] != b[i] for i in range(3)) == 1]
+        for edge in edges:
+            body._topology.addEdge(edge)
+        for axis in range(3):
+            for value in (lo[axis], hi[axis]):
+                face = boxOf([c for c in corners if c[axis] == value])
+                body._topology.addFace(BRepFace(face, [e for e in edges if e._box[0][axis] == value and e._box[1][axis] == value]))
+        return body
+
+# Sketches
+
+class SketchCurve(ApiObject):
+    def __init__(self, sketch, points: list, ends: tuple, length: float):
+        self._sketch = sketch
+        self._points = points
+        self._ends = ends
+        self._length = length
+        self._model = [sketch._toModel(p) for p in points]
+        self._box = boxOf(self._model)
+        self._sketchBox = boxOf(points)
+        recorder.create('curve')
+
+    @property
+    def length(self):
+        return self._length
+
+    @property
+    def parentSketch(self):
+        return self._sketch
+
+    @property
+    def boundingBox(self):
+        return BoundingBox3D(self._sketchBox)
+
+    # As a segment of a loop: model space box, length and start
+    def _segment(self):
+        return (self._box, self._length, self._model[0])
+
+class SketchLine(SketchCurve):
+    pass
+
+class SketchArc(SketchCurve):
+    pass
+
+class SketchCircle(SketchCurve):
+    pass
+
+class SketchLineList(Collection):
+    pass
+
+def _key(point: tuple) -> tuple:
+    return (round(point[0], 6), round(point[1], 6), round(point[2], 6))
+
+class SketchLines(Collection):
+    def __init__(self, sketch):
+        super().__init__()
+        self._sketch = sketch
+
+    def _line(self, start: tuple, end: tuple):
+        line = SketchLine(self._sketch, [start, end], (_key(start), _key(end)), distance(start, end))
+        self._sketch._curves.append(line)
+        self._items.append(line)
+        return line
+
+    def addByTwoPoints(self, startPoint, endPoint):
+        return self._line(startPoint._xyz, endPoint._xyz)
+
+    def addTwoPointRectangle(self, pointOne, pointTwo):
+        (x0, y0, z), (x1, y1, _) = pointOne._xyz, pointTwo._xyz
+        corners = [(x0, y0, z), (x1, y0, z), (x1, y1, z), (x0, y1, z)]
+        return SketchLineList([self._line(corners[n], corners[(n + 1) % 4]) for n in range(4)])
+
+class SketchArcs(Collection):
+    def __init__(self, sketch):
+        super().__init__()
+        self._sketch = sketch
+
+    def addByCenterStartSweep(self, centerPoint, startPoint, sweepAngle: float):
+        (cx, cy, cz), (sx, sy, _) = centerPoint._xyz, startPoint._xyz
+        r = math.hypot(sx - cx, sy - cy)
+        a = math.atan2(sy - cy, sx - cx)
+        points = [(cx + r * math.cos(a + sweepAngle * n / 8), cy + r * math.sin(a + sweepAngle * n / 8), cz) for n in range(9)]
+        arc = SketchArc(self._sketch, points, (_key(points[0]), _key(points[-1])), r * abs(sweepAngle))
+        self._sketch._curves.append(arc)
+        self._items.append(arc)
+        return arc
+
+class SketchCircles(Collection):
+    def __init__(self, sketch):
+        super().__init__()
+        self._sketch = sketch
+
+    def addByCenterRadius(self, centerPoint, radius: float):
+        cx, cy, cz = centerPoint._xyz
+        points = [(cx + radius * math.cos(math.pi * n / 4), cy + radius * math.sin(math.pi * n / 4), cz) for n in range(8)]
+        circle = SketchCircle(self._sketch, points, None, 2 * math.pi * radius)
+        self._sketch._curves.append(circle)
+        self._items.append(circle)
+        return circle
+
+class SketchCurves(ApiObject):
+    def __init__(self, sketch):
+        self._sketchLines = SketchLines(sketch)
+        self._sketchArcs = SketchArcs(sketch)
+        self._sketchCircles = SketchCircles(sketch)
+
+    @property
+    def sketchLines(self):
+        return self._sketchLines
+
+    @property
+    def sketchArcs(self):
+        return self._sketchArcs
+
+    @property
+    def sketchCircles(self):
+        return self._sketchCircles
+
+class SketchPoint(ApiObject):
+    def __init__(self, sketch, point: tuple):
+        self._sketch = sketch
+        self._point = point
+        self._model = sketch._toModel(point)
+
+    @property
+    def parentSketch(self):
+        return self._sketch
+
+class SketchPoints(Collection):
+    def __init__(self, sketch):
+        super().__init__()
+        self._sketch = sketch
+
+    def add(self, point):
+        sketchPoint = SketchPoint(self._sketch, point._xyz)
+        self._items.append(sketchPoint)
+        return sketchPoint
+
+class Profile(ApiObject):
+    def __init__(self, sketch, curves: list):
+        self._sketch = sketch
+        self._curves = curves
+
+    @property
+    def boundingBox(self):
+        return BoundingBox3D(unionOf(curve._sketchBox for curve in self._curves))
+
+    @property
+    def parentSketch(self):
+        return self._sketch
+
+    def _loop(self):
+        return [curve._segment() for curve in self._curves]
+
+class Profiles(Collection):
+    pass
+
+class Sketch(ApiObject):
+    def __init__(self, component, plane):
+        self._component = component
+        self._plane = plane
+        if isinstance(plane, BRepFace):
+            # Sketches on faces are drawn in model coordinates here
+            axis = flatAxis(plane._box)
+            self._toModel = self._toSketch = lambda p: tuple(p)
+            self._normal = tuple(1.0 if i == axis else 0.0 for i in range(3))
+        else:
+            self._toModel = lambda p: PLANES[plane._kind][0](*p)
+            self._toSketch = lambda p: PLANES[plane._kind][2](*p)
+            self._normal = PLANES[plane._kind][1]
+        self._curves = []
+        self._sketchCurves = SketchCurves(self)
+        self._sketchPoints = SketchPoints(self)
+        self._name = 'Sketch'
+        self._isComputeDeferred = False
+        self._profiles = None
+        recorder.create('sketch')
+
+    @property
+    def name(self):
+        return self._name
+
+    @name.setter
+    def name(self, value):
+        self._name = value
+
+    @property
+    def isComputeDeferred(self):
+        return self._isComputeDeferred
+
+    @isComputeDeferred.setter
+    def isComputeDeferred(self, value):
+        self._isComputeDeferred = value
+
+    @property
+    def sketchCurves(self):
+        return self._sketchCurves
+
+    @property
+    def sketchPoints(self):
+        return self._sketchPoints
+
+    def modelToSketchSpace(self, modelCoordinate):
+        return Point3D(*self._toSketch(modelCoordinate._xyz))
+
+    # One profile per set of curves joined end to end; circles on their own
+    @property
+    def profiles(self):
+        if self._profiles is None or self._profiles._curveCount != len(self._curves):
+            recorder.create('sketchSolve')
+            parent = {}
+            def find(k):
+                while parent.setdefault(k, k) != k:
+                    k = parent[k]
+                return k
+            groups = {}
+            loops = []
+            for curve in self._curves:
+                if curve._ends is None:
+                    loops.append([curve])
+                    continue
+                a, b = find(curve._ends[0]), find(curve._ends[1])
+                parent[a] = b
+            for curve in self._curves:
+                if curve._ends is not None:
+                    groups.setdefault(find(curve._ends[0]), []).append(curve)
+            loops = list(groups.values()) + loops
+            self._profiles = Profiles([Profile(self, loop) for loop in loops])
+            self._profiles._curveCount = len(self._curves)
+        return self._profiles
+
+class Sketches(Collection):
+    def __init__(self, component):
+        super().__init__()
+        self._component = component
+
+    def add(self, planarEntity):
+        sketch = Sketch(self._component, planarEntity)
+        self._items.append(sketch)
+        return sketch
+
+class ConstructionPlane(ApiObject):
+    def __init__(self, kind: str):
+        self._kind = kind
+
+class ConstructionAxis(ApiObject):
+    def __init__(self, direction: tuple):
+        self._direction = direction
+
+# Features
+
+class Feature(ApiObject):
+    def __init__(self, bodies: list = None, faces: list = None):
+        self._bodies = bodies or []
+        self._faces = faces or []
+        self._name = type(self).__name__
+        recorder.create('feature')
+
+    @property
+    def name(self):
+        return self._name
+
+    @name.setter
+    def name(self, value):
+        self._name = value
+
+    @property
+    def bodies(self):
+        return BRepBodies(None) if not self._bodies else Collection(self._bodies)
+
+    @property
+    def faces(self):
+        return BRepFaces(self._faces)
+
+    @property
+    def edges(self):
+        edges = []
+        for face in self._faces:
+            edges += face._edges
+        return BRepEdges(edges)
+
+class ExtrudeFeature(Feature):
+    pass
+
+class SweepFeature(Feature):
+    pass
+
+class FilletFeature(Feature):
+    pass
+
+class ChamferFeature(Feature):
+    pass
+
+class RectangularPatternFeature(Feature):
+    pass
+
+class CombineFeature(Feature):
+    pass
+
+class HoleFeature(Feature):
+    pass
+
+class BaseFeature(Feature):
+    def startEdit(self):
+        return True
+
+    def finishEdit(self):
+        return True
+
+def _loops(profiles) -> list:
+    if isinstance(profiles, ObjectCollection):
+        return [p._loop() for p in profiles._items]
+    return [profiles._loop()]
+
+def _normal(profiles) -> tuple:
+    first = profiles._items[0] if isinstance(profiles, ObjectCollection) else profiles
+    if isinstance(first, BRepFace):
+        axis = flatAxis(first._box)
+        return tuple(1.0 if i == axis else 0.0 for i in range(3))
+    return first._sketch._normal
+
+# The body a feature adds to, cuts from or creates
+def _target(component, operation: int):
+    bodies = component._bRepBodies._items
+    if operation == FeatureOperations.NewBodyFeatureOperation or not bodies:
+        body = BRepBody(component)
+        bodies.append(body)
+        return body
+    return bodies[0]
+
+# Each loop gives a bottom face, a top face, and a side face per segment
+def _extrude(component, profiles, d: float, operation: int) -> ExtrudeFeature:
+    body = _target(component, operation)
+    v = tuple(n * d for n in _normal(profiles))
+    faces = []
+    for loop in _loops(profiles):
+        bottoms = [BRepEdge(box, length) for box, length, _ in loop]
+        tops = [edge._moved(v) for edge in bottoms]
+        uprights = [BRepEdge(boxOf([start, translated((start, start), v)[0]]), abs(d)) for _, _, start in loop]
+        for edge in bottoms + tops + uprights:
+            body._topology.addEdge(edge)
+        faces.append(body._topology.addFace(BRepFace(unionOf(e._box for e in bottoms), bottoms)))
+        faces.append(body._topology.addFace(BRepFace(unionOf(e._box for e in tops), tops)))
+        for n in range(len(loop)):
+            edges = [bottoms[n], tops[n], uprights[n], uprights[(n + 1) % len(loop)]]
+            faces.append(body._topology.addFace(BRepFace(unionOf(e._box for e in edges), edges)))
+    return ExtrudeFeature([body], faces)
+
+# The path is taken as the rounded rect its curves outline, flat in one axis, and the profiles as
+# sitting on its low side. Each profile point goes all the way round at its inset.
+def _sweep(component, profiles, path, operation: int) -> SweepFeature:
+    body = _target(component, operation)
+    curves = path._curves
+    lo, hi = unionOf(c._box for c in curves)
+    flat = flatAxis((lo, hi))
+    across = [axis for axis in range(3) if axis != flat]
+    rings = {}
+    def ring(point: tuple) -> list:
+        key = _key(point)
+        if key not in rings:
+            inset = point[across[0]] - lo[across[0]]
+            edges = []
+            for curve in curves:
+                cmin, cmax = list(curve._box[0]), list(curve._box[1])
+                for axis in across:
+                    low, high = lo[axis] + inset, hi[axis] - inset
+                    cmin[axis] = min(max(cmin[axis], low), high)
+                    cmax[axis] = min(max(cmax[axis], low), high)
+                cmin[flat] = cmax[flat] = point[flat]
+                edges.append(BRepEdge((tuple(cmin), tuple(cmax)), curve._length))
+            for edge in edges:
+                body._topology.addEdge(edge)
+            rings[key] = edges
+        return rings[key]
+    faces = []
+    profiles = profiles._items if isinstance(profiles, ObjectCollection) else [profiles]
+    for curve in [curve for profile in profiles for curve in profile._curves]:
+        a, b = ring(curve._model[0]), ring(curve._model[-1])
+        for n in range(len(curves)):
+            faces.append(body._topology.addFace(BRepFace(unionOf([a[n]._box, b[n]._box]), [a[n], b[n]])))
+    return SweepFeature([body], faces)
+
+class ExtrudeFeatureInput(ApiObject):
+    def __init__(self, profiles, operation: int):
+        self._profiles = profiles
+        self._operation = operation
+        self._distance = 0.0
+
+    def setOneSideExtent(self, extent, direction: int, taperAngle=None):
+        self._distance = extent._distance._value * (-1 if direction == ExtentDirections.NegativeExtentDirection else 1)
+        return True
+
+    def setDistanceExtent(self, isSymmetric: bool, distance):
+        self._distance = distance._value
+        return True
+
+class DistanceExtentDefinition(ApiObject):
+    def __init__(self, distance):
+        self._distance = distance
+
+    @staticmethod
+    def create(distance):
+        return DistanceExtentDefinition(distance)
+
+class ExtrudeFeatures(Collection):
+    def __init__(self, component):
+        super().__init__()
+        self._component = component
+
+    def addSimple(self, profile, distance, operation: int):
+        feature = _extrude(self._component, profile, distance._value, operation)
+        self._items.append(feature)
+        return feature
+
+    def createInput(self, profile, operation: int):
+        return ExtrudeFeatureInput(profile, operation)
+
+    def add(self, input):
+        feature = _extrude(self._component, input._profiles, input._distance, input._operation)
+        self._items.append(feature)
+        return feature
+
+class Path(ApiObject):
+    def __init__(self, curves: list):
+        self._curves = curves
+
+class SweepFeatureInput(ApiObject):
+    def __init__(self, profile, path, operation: int):
+        self._profile = profile
+        self._path = path
+        self._operation = operation
+
+class SweepFeatures(Collection):
+    def __init__(self, component):
+        super().__init__()
+        self._component = component
+
+    def createInput(self, profile, path, operation: int):
+        return SweepFeatureInput(profile, path, operation)
+
+    def add(self, input):
+        feature = _sweep(self._component, input._profile, input._path, input._operation)
+        self._items.append(feature)
+        return feature
+
+class FilletFeatureInput(ApiObject):
+    def __init__(self):
+        self._edgeSets = []
+        self._isG2 = False
+        self._isRollingBallCorner = True
+
+    def addConstantRadiusEdgeSet(self, edges, radius, isTangentChain: bool):
+        self._edgeSets.append((list(edges._items), radius))
+        return True
+
+    @property
+    def isG2(self):
+        return self._isG2
+
+    @isG2.setter
+    def isG2(self, value):
+        self._isG2 = value
+
+    @property
+    def isRollingBallCorner(self):
+        return self._isRollingBallCorner
+
+    @isRollingBallCorner.setter
+    def isRollingBallCorner(self, value):
+        self._isRollingBallCorner = value
+
+class FilletFeatures(Collection):
+    def createInput(self):
+        return FilletFeatureInput()
+
+    # Cuts don't trim edges here, so an edge query after one can come back empty where Fusion's
+    # wouldn't; the fillet is counted all the same
+    def add(self, input):
+        feature = FilletFeature()
+        self._items.append(feature)
+        return feature
+
+class HoleFeatureInput(ApiObject):
+    def __init__(self, holeDiameter, counterboreDiameter=None, counterboreDepth=None):
+        self._diameter = holeDiameter._value
+        self._counterbore = (counterboreDiameter._value, counterboreDepth._value) if counterboreDiameter else None
+        self._points = []
+        self._depth = 0.0
+
+    def setPositionBySketchPoints(self, sketchPoints):
+        self._points = list(sketchPoints._items)
+        return True
+
+    def setDistanceExtent(self, distance):
+        self._depth = distance._value
+        return True
+
+class HoleFeatures(Collection):
+    def createSimpleInput(self, holeDiameter):
+        return HoleFeatureInput(holeDiameter)
+
+    def createCounterboreInput(self, holeDiameter, counterboreDiameter, counterboreDepth):
+        return HoleFeatureInput(holeDiameter, counterboreDiameter, counterboreDepth)
+
+    # Like fillets, holes leave the body's topology as it was
+    def add(self, input):
+        feature = HoleFeature()
+        self._items.append(feature)
+        return feature
+
+class RectangularPatternFeatureInput(ApiObject):
+    def __init__(self, entities, axis, quantity, distance):
+        self._entities = list(entities._items)
+        self._directions = [(axis._direction, int(quantity._value), distance._value)]
+
+    def setDirectionTwo(self, directionTwoEntity, quantityTwo, distanceTwo):
+        self._directions.append((directionTwoEntity._direction, int(quantityTwo._value), distanceTwo._value))
+        return True
+
+class RectangularPatternFeatures(Collection):
+    def __init__(self, component):
+        super().__init__()
+        self._component = component
+
+    def createInput(self, inputEntities, directionOneEntity, quantityOne, distanceOne, patternDistanceType: int):
+        return RectangularPatternFeatureInput(inputEntities, directionOneEntity, quantityOne, distanceOne)
+
+    # A translated copy of every input body for each instance but the first
+    def add(self, input):
+        (d1, n1, s1), (d2, n2, s2) = (input._directions + [((0, 0, 0), 1, 0)])[:2]
+        created = []
+        for i in range(n1):
+            for j in range(n2):
+                if i == 0 and j == 0:
+                    continue
+                v = tuple(d1[k] * s1 * i + d2[k] * s2 * j for k in range(3))
+                for body in input._entities:
+                    copy = body._copy(v)
+                    self._component._bRepBodies._items.append(copy)
+                    created.append(copy)
+        feature = RectangularPatternFeature(created)
+        self._items.append(feature)
+        return feature
+
+class CombineFeatureInput(ApiObject):
+    def __init__(self, targetBody, toolBodies):
+        self._target = targetBody
+        self._tools = list(toolBodies._items)
+        self._operation = FeatureOperations.JoinFeatureOperation
+
+    @property
+    def operation(self):
+        return self._operation
+
+    @operation.setter
+    def operation(self, value):
+        self._operation = value
+
+class CombineFeatures(Collection):
+    def __init__(self, component):
+        super().__init__()
+        self._component = component
+
+    def createInput(self, targetBody, toolBodies):
+        return CombineFeatureInput(targetBody, toolBodies)
+
+    def add(self, input):
+        bodies = self._component._bRepBodies._items
+        for tool in input._tools:
+            input._target._topology.absorb(tool._topology)
+            if tool in bodies:
+                bodies.remove(tool)
+        feature = CombineFeature([input._target])
+        self._items.append(feature)
+        return feature
+
+class BaseFeatures(Collection):
+    def add(self):
+        feature = BaseFeature()
+        self._items.append(feature)
+        return feature
+
+class Features(ApiObject):
+    def __init__(self, component):
+        self._extrudeFeatures = ExtrudeFeatures(component)
+        self._sweepFeatures = SweepFeatures(component)
+        self._filletFeatures = FilletFeatures()
+        self._holeFeatures = HoleFeatures()
+        self._rectangularPatternFeatures = RectangularPatternFeatures(component)
+        self._combineFeatures = CombineFeatures(component)
+        self._baseFeatures = BaseFeatures()
+
+    @property
+    def extrudeFeatures(self):
+        return self._extrudeFeatures
+
+    @property
+    def sweepFeatures(self):
+        return self._sweepFeatures
+
+    @property
+    def filletFeatures(self):
+        return self._filletFeatures
+
+    @property
+    def holeFeatures(self):
+        return self._holeFeatures
+
+    @property
+    def rectangularPatternFeatures(self):
+        return self._rectangularPatternFeatures
+
+    @property
+    def combineFeatures(self):
+        return self._combineFeatures
+
+    @property
+    def baseFeatures(self):
+        return self._baseFeatures
+
+    def createPath(self, curves, isChain: bool = True):
+        items = curves._items if isinstance(curves, ObjectCollection) else [curves]
+        return Path(list(items))
+
+# Custom graphics
+
+class CustomGraphicsCoordinates(ApiObject):
+    def __init__(self, coordinates):
+        self._coordinates = coordinates
+
+    @staticmethod
+    def create(coordinates):
+        return CustomGraphicsCoordinates(coordinates)
+
+class CustomGraphicsMesh(ApiObject):
+    def __init__(self, coordinates, indices):
+        self._coordinates = coordinates
+        self._indices = indices
+
+class CustomGraphicsGroup(ApiObject):
+    def __init__(self):
+        self._meshes = []
+
+    def addMesh(self, coordinates, coordinateIndexList, normalVectors, normalIndexList):
+        recorder.create('graphicsTriangle', len(coordinateIndexList) // 3)
+        mesh = CustomGraphicsMesh(coordinates, coordinateIndexList)
+        self._meshes.append(mesh)
+        return mesh
+
+    def deleteMe(self):
+        return True
+
+class CustomGraphicsGroups(Collection):
+    def add(self):
+        group = CustomGraphicsGroup()
+        self._items.append(group)
+        return group
+
+# Components and the design
+
+class Attribute(ApiObject):
+    def __init__(self, parent, groupName: str, name: str, value: str):
+        self._parent = parent
+        self._groupName = groupName
+        self._name = name
+        self._value = value
+
+    @property
+    def groupName(self):
+        return self._groupName
+
+    @property
+    def name(self):
+        return self._name
+
+    @property
+    def value(self):
+        return self._value
+
+    @value.setter
+    def value(self, value):
+        self._value = value
+
+    @property
+    def parent(self):
+        return self._parent
+
+class Attributes(Collection):
+    def __init__(self, parent, design):
+        super().__init__()
+        self._parent = parent
+        self._design = design
+
+    def add(self, groupName: str, name: str, value: str):
+        for attribute in self._items:
+            if attribute._groupName == groupName and attribute._name == name:
+                attribute._value = value
+                return attribute
+        attribute = Attribute(self._parent, groupName, name, value)
+        self._items.append(attribute)
+        self._design._attributes.append(attribute)
+        return attribute
+
+    def itemByName(self, groupName: str, name: str):
+        for attribute in self._items:
+            if attribute._groupName == groupName and attribute._name == name:
+                return attribute
+        return None
+
+class Occurrence(ApiObject):
+    def __init__(self, component, transform):
+        self._component = component
+        self._transform = transform
+        self._isLightBulbOn = True
+
+    @property
+    def component(self):
+        return self._component
+
+    @property
+    def transform(self):
+        return self._transform
+
+    @transform.setter
+    def transform(self, value):
+        self._transform = value
+
+    @property
+    def isLightBulbOn(self):
+        return self._isLightBulbOn
+
+    @isLightBulbOn.setter
+    def isLightBulbOn(self, value):
+        self._isLightBulbOn = value
+
+class Occurrences(Collection):
+    def __init__(self, design):
+        super().__init__()
+        self._design = design
+
+    def addNewComponent(self, transform):
+        occurrence = Occurrence(Component(self._design), transform)
+        self._items.append(occurrence)
+        recorder.create('component')
+        return occurrence
+
+    def addExistingComponent(self, component, transform):
+        occurrence = Occurrence(component, transform)
+        self._items.append(occurrence)
+        return occurrence
+
+class Component(ApiObject):
+    def __init__(self, design):
+        self._design = design
+        self._name = 'Component'
+        self._occurrences = Occurrences(design)
+        self._sketches = Sketches(self)
+        self._features = Features(self)
+        self._bRepBodies = BRepBodies(self)
+        self._customGraphicsGroups = CustomGraphicsGroups()
+        self._attributes = Attributes(self, design)
+        self._planes = {kind: ConstructionPlane(kind) for kind in PLANES}
+        self._axes = {'x': ConstructionAxis((1.0, 0.0, 0.0)), 'y': ConstructionAxis((0.0, 1.0, 0.0)), 'z': ConstructionAxis((0.0, 0.0, 1.0))}
+        design._components.append(self)
+
+    @property
+    def name(self):
+        return self._name
+
+    @name.setter
+    def name(self, value):
+        self._name = value
+
+    @property
+    def parentDesign(self):
+        return self._design
+
+    @property
+    def occurrences(self):
+        return self._occurrences
+
+    @property
+    def sketches(self):
+        return self._sketches
+
+    @property
+    def features(self):
+        return self._features
+
+    @property
+    def bRepBodies(self):
+        return self._bRepBodies
+
+    @property
+    def customGraphicsGroups(self):
+        return self._customGraphicsGroups
+
+    @property
+    def attributes(self):
+        return self._attributes
+
+    @property
+    def xYConstructionPlane(self):
+        return self._planes['xY']
+
+    @property
+    def xZConstructionPlane(self):
+        return self._planes['xZ']
+
+    @property
+    def yZConstructionPlane(self):
+        return self._planes['yZ']
+
+    @property
+    def xConstructionAxis(self):
+        return self._axes['x']
+
+    @property
+    def yConstructionAxis(self):
+        return self._axes['y']
+
+    @property
+    def zConstructionAxis(self):
+        return self._axes['z']
+
+class FusionUnitsManager(ApiObject):
+    def __init__(self):
+        self._distanceDisplayUnits = DistanceUnits.CentimeterDistanceUnits
+
+    @property
+    def distanceDisplayUnits(self):
+        return self._distanceDisplayUnits
+
+    @distanceDisplayUnits.setter
+    def distanceDisplayUnits(self, value):
+        self._distanceDisplayUnits = value
+
+class Design(ApiObject):
+    def __init__(self, parametric: bool = True):
+        self._designType = DesignTypes.ParametricDesignType if parametric else DesignTypes.DirectDesignType
+        self._components = []
+        self._attributes = []
+        self._unitsManager = FusionUnitsManager()
+        self._rootComponent = Component(self)
+
+    @property
+    def designType(self):
+        return self._designType
+
+    @designType.setter
+    def designType(self, value):
+        self._designType = value
+
+    @property
+    def rootComponent(self):
+        return self._rootComponent
+
+    @property
+    def fusionUnitsManager(self):
+        return self._unitsManager
+
+    @property
+    def unitsManager(self):
+        return self._unitsManager
+
+    @property
+    def allComponents(self):
+        return Collection(self._components)
+
+    def findAttributes(self, groupName: str, attributeName: str):
+        return [a for a in self._attributes if a._groupName == groupName and (not attributeName or a._name == attributeName)]
@@ -0,0 +1,122 @@
+#!/usr/bin/env python3
+#Description- Lays a demand list of boxes out in a drawer, as a catalog ready for make_catalog.py
+#
+# Usage: python tools/drawer_layout.py WIDTH DEPTH [--height HEIGHT] (--box WxD[:COUNT] ... | --demand FILE)
+#                                      [--no-rotate] [--fill] [--name NAME] [-o catalog.json]
+#
+# Sizes are the inside of the drawer in mm. Each --box asks for COUNT (default 1) boxes of W x D
+# slots; a --demand file is a CSV or JSON list of Box specs like a catalog's, with a count each.
+# With --height every box is made as tall as fits. --fill fills whatever's left with boxes made to
+# fit. The catalog is written to -o or stdout, with each box's grid column and row, and a map of
+# the drawer goes to stderr. Exits 1 if some boxes didn't fit, or, with --height, couldn't be built
+# that high, when nothing is laid out.
+
+import argparse
+import json
+import os
+import string
+import sys
+import time
+
+HERE = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, os.path.dirname(HERE))
+
+from GridFinityDividerBoxMaker.boxspec import minSlotsHigh
+from GridFinityDividerBoxMaker.boxcheck import boxProblems
+from GridFinityDividerBoxMaker.drawerlayout import drawerGrid, layoutDrawer
+from make_catalog import KINDS, convert, readCatalog
+
+# W x D, or W x D:count
+def boxArgument(text: str) -> dict:
+    size, _, count = text.partition(':')
+    wide, _, deep = size.lower().partition('x')
+    return {'slotsWide': int(wide), 'slotsDeep': int(deep), 'count': int(count or 1)}
+
+# Demand file rows as Box specs, typed like the catalog's
+def readDemand(path: str) -> list:
+    fields = KINDS['box'][2]
+    demand = []
+    for row in readCatalog(path):
+        spec = {field: convert(value, fields[field]) for field, value in row.items() if field in fields and value not in (None, '')}
+        spec['count'] = int(row.get('count') or 1)
+        if row.get('boxName'):
+            spec['boxName'] = row['boxName']
+        demand.append(spec)
+    return demand
+
+# Why boxes slotsHigh high can't be made, for each spec in the demand that can't, and for the
+# fillers if they're wanted
+def heightProblems(demand: list, slotsHigh: float, fill: bool) -> list:
+    if slotsHigh < minSlotsHigh:
+        return ['the drawer only has room for boxes {:g} slots high, and the least is {:g}'.format(slotsHigh, minSlotsHigh)]
+    fields = set(KINDS['box'][2]) - {'includeMagnets'}
+    specs = demand + ([{}] if fill else [])
+    problems = []
+    for spec in specs:
+        values = {field: value for field, value in spec.items() if field in fields}
+        for problem in boxProblems(**dict(values, slotsHigh=slotsHigh)):
+            name = '{}x{}'.format(spec['slotsWide'], spec['slotsDeep']) if spec else 'fillers'
+            problems.append('{}: {}'.format(name, problem))
+    return problems
+
+def drawerMap(layout) -> str:
+    grid = [['.'] * layout.columns for _ in range(layout.rows)]
+    symbols = string.ascii_letters + string.digits
+    for n, (column, row, spec) in enumerate(layout.placements):
+        for r in range(row, row + spec['slotsDeep']):
+            for c in range(column, column + spec['slotsWide']):
+                grid[r][c] = symbols[n % len(symbols)]
+    return '\n'.join(''.join(row) for row in grid)
+
+def main():
+    parser = argparse.ArgumentParser(description='Lay boxes out in a drawer')
+    parser.add_argument('width', type=float, help='inside width of the drawer in mm')
+    parser.add_argument('depth', type=float, help='inside depth of the drawer in mm')
+    parser.add_argument('--height', type=float, help='inside height of the drawer in mm, to size the boxes')
+    parser.add_argument('--box', dest='boxes', type=boxArgument, action='append', default=[], help='WxD[:COUNT] boxes to place')
+    parser.add_argument('--demand', help='CSV or JSON list of Box specs, each with a count')
+    parser.add_argument('--no-rotate', dest='rotate', action='store_false', help='keep every box the way round it was asked for')
+    parser.add_argument('--fill', action='store_true', help='fill the space left with boxes made to fit')
+    parser.add_argument('--name', default='Drawer', help='start of each box\'s name (default: Drawer)')
+    parser.add_argument('-o', dest='output', help='catalog file to write (default: stdout)')
+    options = parser.parse_args()
+
+    demand = options.boxes + (readDemand(options.demand) if options.demand else [])
+    columns, rows, slotsHigh = drawerGrid(options.width, options.depth, options.height)
+    # Boxes the drawer's height makes unbuildable are turned away before anything is laid out
+    if slotsHigh is not None:
+        problems = heightProblems(demand, slotsHigh, options.fill)
+        for problem in problems:
+            print(problem, file=sys.stderr)
+        if problems:
+            return 1
+    started = time.perf_counter()
+    layout = layoutDrawer(columns, rows, demand, rotate=options.rotate, fillGaps=options.fill)
+    seconds = time.perf_counter() - started
+
+    catalog = []
+    for column, row, spec in layout.placements:
+        part = {'kind': 'box', 'boxName': '{} {}{} {}'.format(options.name, string.ascii_uppercase[row % 26], column + 1, spec.get('boxName', '')).strip()}
+        part.update((field, value) for field, value in spec.items() if field != 'boxName')
+        if slotsHigh is not None:
+            part['slotsHigh'] = slotsHigh
+        part.update(column=column, row=row)
+        catalog.append(part)
+    text = json.dumps(catalog, indent=1) + '\n'
+    if options.output:
+        with open(options.output, 'w') as f:
+            f.write(text)
+    else:
+        sys.stdout.write(text)
+
+    used = sum(spec['slotsWide'] * spec['slotsDeep'] for _, _, spec in layout.placements)
+    print(drawerMap(layout), file=sys.stderr)
+    print('{}x{} grid, {} boxes covering {} of {} cells{}, in {:.1f}ms{}'.format(
+        columns, rows, len(layout.placements), used, columns * rows, '' if slotsHigh is None else ', {:g} slots high'.format(slotsHigh),
+        seconds * 1000, '' if layout.optimal else ' (best found, not proven best)'), file=sys.stderr)
+    for spec in layout.unplaced:
+        print('no room for {} of {}x{}'.format(spec['count'], spec['slotsWide'], spec['slotsDeep']), file=sys.stderr)
+    return 1 if layout.unplaced else 0
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,242 @@
+#!/usr/bin/env python3
+#Description- Every box and holster in a catalog as STL or 3MF files, made without Fusion
+#
+# Usage: python tools/make_catalog.py catalog.csv|catalog.json [--out DIR] [--format stl|3mf] [--jobs N] [--report FILE]
+#                                     [--cache DIR | --no-cache] [--cache-size MB]
+#        python tools/make_catalog.py catalog.csv|catalog.json --estimate
+#
+# Each row of a CSV catalog, or object in a JSON list, is one part: a kind of 'box' or 'holster'
+# and any of the Box fields or holster dialog sizes. Anything left out or empty takes the dialog's
+# default. Parts are made across a pool of processes, one per core unless --jobs says otherwise,
+# and each is reported as it finishes. --report also appends every part's outcome and timings to
+# a JSON-lines file. A part the dialog wouldn't build is reported as invalid, with why, and no file
+# is written for it. Exits 1 if any part was invalid or failed.
+#
+# --estimate makes nothing, and instead writes each part's volume (cm³), surface area (cm²), size
+# (cm), filament (m), weight (g) and print time (hours) as CSV, worked out for every part at once.
+# Invalid parts are left out, and still make it exit 1.
+#
+# Rows with the same values are made once and the file copied for each. Parts made before, with
+# the same values and the same code and sizes, are copied from the cache (see partcache.py) instead. It's kept to --cache-size MB, dropping the least recently used.
+#
+# The meshes leave out fillets, so softenFillet and the Fusion-only build options are accepted
+# and ignored.
+
+import argparse
+import concurrent.futures
+import csv
+import json
+import os
+import re
+import shutil
+import sys
+import time
+import traceback
+
+HERE = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, os.path.dirname(HERE))
+
+from GridFinityDividerBoxMaker import boxspec, boxmesh, boxestimate, meshbuild, meshfile
+from GridFinityDividerBoxMaker.boxcheck import boxProblems
+from GridFinityDividerBoxMaker.catalog import convert
+from RemoteHolsterMaker import holsterspec, holstersolid, holsterestimate
+from RemoteHolsterMaker.holstercheck import holsterProblems
+from partcache import PartCache
+
+# Each kind's name field, the fields its mesh takes with their defaults, what makes it, and whether
+# its meshes have y up (boxes, like Fusion's top view) rather than z
+KINDS = {
+    'box': ('boxName', boxspec.defaultBoxName, dict(
+        slotsWide=boxspec.defaultSlotsWide, slotsDeep=boxspec.defaultSlotsDeep, slotsHigh=boxspec.defaultSlotsHigh,
+        dividerCount=boxspec.defaultDividerCount, dividerCountDeep=boxspec.defaultDividerCountDeep,
+        includeScoop=boxspec.defaultIncludeScoop, baseOnly=boxspec.defaultBaseOnly,
+        includeLedge=boxspec.defaultIncludeLedge, includeMagnets=boxspec.defaultIncludeMagnets),
+        boxmesh.boxMesh, True),
+    'holster': ('holsterName', holsterspec.defaultHolsterName, dict(
+        remoteWidth=holsterspec.defaultRemoteWidth, remoteLength=holsterspec.defaultRemoteLength,
+        remoteThickness=holsterspec.defaultRemoteThickness, frontSlotWidth=holsterspec.defaultFrontSlotWidth,
+        frontHeight=holsterspec.defaultFrontHeight, backCornerRound=holsterspec.defaultBackCornerRound,
+        frontSlotRound=holsterspec.defaultFrontSlotRound, sideThickness=holsterspec.defaultSideThickness,
+        backThickness=holsterspec.defaultBackThickness, bottomThickness=holsterspec.defaultBottomThickness,
+        includeScrewHoles=holsterspec.defaultIncludeScrewHoles),
+        holstersolid.solidHolsterMesh, False),
+}
+# Everything a kind's files depend on, for the cache key
+GENERATORS = {'box': [boxspec, boxmesh, meshbuild, meshfile], 'holster': [holsterspec, holstersolid, meshbuild, meshfile]}
+# And what estimates its material without making it
+ESTIMATORS = {'box': (boxestimate.boxEstimate, boxestimate.materialEstimate),
+              'holster': (holsterestimate.holsterEstimate, holsterestimate.materialEstimate)}
+# Why a part can't be built, as the dialog would say; magnets never stop a box, and the meshes have no soften fillet
+CHECKS = {'box': lambda includeMagnets, **values: boxProblems(**values),
+          'holster': lambda **values: holsterProblems(softenFillet=0, **values)}
+IGNORED = {'kind', 'column', 'row', 'baseBuilder', 'engine', 'draft', 'fastBuild', 'softenFillet', 'tolerance', 'transientEngine'}
+
+def readCatalog(path: str) -> list:
+    with open(path, newline='') as f:
+        if path.lower().endswith('.json'):
+            return json.load(f)
+        return list(csv.DictReader(f))
+
+# (kind, name, mesh arguments) for a catalog row, or ValueError saying what's wrong with it
+def partSpec(row: dict) -> tuple:
+    kind = (row.get('kind') or '').strip().lower()
+    if kind not in KINDS:
+        raise ValueError('kind {!r} is not one of {}'.format(row.get('kind'), ', '.join(KINDS)))
+    nameField, defaultName, fields, _, _ = KINDS[kind]
+    values = {}
+    for field, value in row.items():
+        if value is None or value == '' or field in IGNORED or field == nameField:
+            continue
+        if field not in fields:
+            raise ValueError('{} has no field {!r}'.format(kind, field))
+        values[field] = convert(value, fields[field])
+    return kind, row.get(nameField) or defaultName, dict(fields, **values)
+
+# Names that are safe as file names, made unique by their row number where they clash
+def fileNames(rows: list, names: list, extension: str) -> list:
+    safe = [re.sub(r'[^A-Za-z0-9._-]+', '_', name).strip('_') or 'part' for name in names]
+    return [name + ('-{}'.format(row) if safe.count(name) > 1 else '') + '.' + extension for row, name in zip(rows, safe)]
+
+# Runs in a pool process. Failures come back as a traceback rather than breaking the pool.
+def makePart(job: tuple) -> dict:
+    row, kind, values, path, fileFormat = job
+    _, _, _, makeMesh, yUp = KINDS[kind]
+    result = {'row': row, 'kind': kind, 'path': path}
+    started = time.perf_counter()
+    try:
+        mesh = makeMesh(**values)
+        result['meshSeconds'] = round(time.perf_counter() - started, 6)
+        writer = meshfile.write3mf if fileFormat == '3mf' else meshfile.writeStl
+        result['triangles'] = writer(path, [mesh.arrays()], yUp, 'fusion360scripts ' + kind)
+        result['outcome'] = 'built'
+    except Exception:
+        result['outcome'] = 'failed'
+        result['error'] = traceback.format_exc()
+    result['seconds'] = round(time.perf_counter() - started, 6)
+    return result
+
+# Estimates for every part, in catalog order, as CSV on stdout
+def writeEstimates(specs: list):
+    columns = ['row', 'kind', 'name', 'volume', 'area', 'width', 'depth', 'height', 'filament', 'mass', 'hours']
+    writer = csv.DictWriter(sys.stdout, columns)
+    writer.writeheader()
+    rows = []
+    for kind, (estimateShape, estimateMaterial) in ESTIMATORS.items():
+        parts = [spec for spec in specs if spec[1] == kind]
+        if not parts:
+            continue
+        fields = KINDS[kind][2]
+        estimate = estimateShape(**{field: [values[field] for _, _, _, values in parts] for field in fields})
+        estimate.update(estimateMaterial(estimate['volume']))
+        for n, (row, _, name, _) in enumerate(parts):
+            rows.append(dict({column: round(float(estimate[column][n]), 4) for column in columns[3:]}, row=row, kind=kind, name=name))
+    writer.writerows(sorted(rows, key=lambda row: row['row']))
+
+def main():
+    parser = argparse.ArgumentParser(description='Make every part in a catalog without Fusion')
+    parser.add_argument('catalog', help='CSV or JSON catalog of boxes and holsters')
+    parser.add_argument('--out', default='catalog', help='directory for the part files (default: catalog)')
+    parser.add_argument('--format', dest='fileFormat', choices=['stl', '3mf'], default='stl', help='file format (default: stl)')
+    parser.add_argument('--jobs', type=int, default=os.cpu_count(), help='processes to use (default: one per core)')
+    parser.add_argument('--report', help='append each part\'s outcome and timings to this JSON-lines file')
+    parser.add_argument('--cache', default=os.path.join(os.environ.get('XDG_CACHE_HOME') or os.path.expanduser('~/.cache'), 'fusion360scripts', 'parts'),
+                        help='directory of parts made before (default: ~/.cache/fusion360scripts/parts)')
+    parser.add_argument('--no-cache', dest='cache', action='store_const', const=None, help='make every part')
+    parser.add_argument('--cache-size', type=float, default=1024, help='MB the cache is kept to (default: 1024)')
+    parser.add_argument('--estimate', action='store_true', help='write material estimates as CSV instead of making anything')
+    options = parser.parse_args()
+
+    # Rows that can't be read fail on their own, without stopping the rest, and parts that can't be
+    # built are invalid; neither gets a file or an estimate
+    results = []
+    specs = []
+    for n, row in enumerate(readCatalog(options.catalog)):
+        try:
+            spec = (n + 1,) + partSpec(row)
+        except (ValueError, TypeError) as e:
+            results.append({'row': n + 1, 'kind': row.get('kind'), 'outcome': 'failed', 'error': str(e)})
+            print('row {}: {}'.format(n + 1, e), file=sys.stderr)
+            continue
+        problems = CHECKS[spec[1]](**spec[3])
+        if problems:
+            results.append({'row': n + 1, 'kind': spec[1], 'outcome': 'invalid', 'problems': problems})
+            print('row {}: {} {} is invalid: {}'.format(n + 1, spec[1], spec[2], ' '.join(problems)), file=sys.stderr)
+            continue
+        specs.append(spec)
+    if options.estimate:
+        writeEstimates(specs)
+        return 1 if results else 0
+
+    os.makedirs(options.out, exist_ok=True)
+    paths = fileNames([row for row, _, _, _ in specs], [name for _, _, name, _ in specs], options.fileFormat)
+    jobs = [(row, kind, values, os.path.join(options.out, path), options.fileFormat) for (row, kind, _, values), path in zip(specs, paths)]
+
+    total = len(jobs)
+    done = 0
+    def report(result: dict):
+        nonlocal done
+        done += 1
+        results.append(result)
+        if result['outcome'] == 'failed':
+            print('[{:>{w}}/{}] {:<7} {} FAILED\n{}'.format(done, total, result['kind'], result['path'],
+                                                           result['error'], w=len(str(total))), file=sys.stderr, flush=True)
+        else:
+            print('[{:>{w}}/{}] {:<7} {} {} {:.2f}s'.format(done, total, result['kind'], result['path'],
+                                                          result['outcome'], result['seconds'], w=len(str(total))), flush=True)
+
+    started = time.perf_counter()
+    cache = PartCache(options.cache, int(options.cache_size * 1024 * 1024)) if options.cache else None
+    # Rows with the same values are made once, and the file copied for the rest
+    groups = {}
+    for job in jobs:
+        row, kind, values, path, fileFormat = job
+        groups.setdefault(json.dumps([kind, values], sort_keys=True), []).append(job)
+    duplicates = {}
+    def reportGroup(result: dict):
+        report(result)
+        for row, kind, _, path, _ in duplicates[result['row']]:
+            copyStarted = time.perf_counter()
+            if result['outcome'] == 'failed':
+                report(dict(result, row=row, path=path))
+                continue
+            shutil.copyfile(result['path'], path)
+            report({'row': row, 'kind': kind, 'path': path, 'outcome': 'copied', 'from': result['row'],
+                    'seconds': round(time.perf_counter() - copyStarted, 6)})
+
+    keys = {}
+    misses = []
+    for job, *rest in groups.values():
+        row, kind, values, path, fileFormat = job
+        duplicates[row] = rest
+        if cache:
+            fetchStarted = time.perf_counter()
+            keys[row] = cache.key(kind, values, fileFormat, GENERATORS[kind])
+            if cache.fetch(keys[row], path):
+                reportGroup({'row': row, 'kind': kind, 'path': path, 'outcome': 'cached', 'seconds': round(time.perf_counter() - fetchStarted, 6)})
+                continue
+        misses.append(job)
+
+    with concurrent.futures.ProcessPoolExecutor(max_workers=options.jobs) as pool:
+        for future in concurrent.futures.as_completed([pool.submit(makePart, job) for job in misses]):
+            result = future.result()
+            if cache and result['outcome'] == 'built':
+                cache.store(keys[result['row']], result['path'])
+            reportGroup(result)
+    if cache:
+        cache.evict()
+    seconds = time.perf_counter() - started
+
+    failed = [result for result in results if result['outcome'] == 'failed']
+    invalid = [result for result in results if result['outcome'] == 'invalid']
+    cached = [result for result in results if result['outcome'] == 'cached']
+    copied = [result for result in results if result['outcome'] == 'copied']
+    print('{} parts in {:.1f}s, {} from the cache, {} copied, {} invalid, {} failed'.format(
+        len(results), seconds, len(cached), len(copied), len(invalid), len(failed)))
+    if options.report:
+        with open(options.report, 'a') as f:
+            for result in sorted(results, key=lambda result: result['row']):
+                f.write(json.dumps(result) + '\n')
+    return 1 if failed or invalid else 0
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,99 @@
+#Description- On-disk cache of part files, keyed by everything that goes into making them
+#
+# A part's key hashes its kind, its values, the file format, every constant of the modules that
+# make it and those modules' source, so changing a size in boxspec, or the mesh code itself,
+# misses every part it could affect and nothing else. Files go in under a temporary name and are
+# renamed into place, so a crash or another run at the same time never leaves half a file behind.
+# Each hit touches the file, and evict() drops the least recently used files until the cache fits.
+
+import hashlib
+import json
+import os
+import shutil
+import tempfile
+import time
+
+# Temporary files older than this are left from a run that died, and can go
+staleSeconds = 3600
+
+# Every number, string and bool a module defines, by module and name
+def moduleConstants(modules: list) -> dict:
+    return {module.__name__ + '.' + name: value for module in modules for name, value in sorted(vars(module).items())
+            if not name.startswith('_') and isinstance(value, (int, float, str, bool))}
+
+def moduleSource(modules: list) -> str:
+    source = hashlib.sha1()
+    for module in modules:
+        with open(module.__file__, 'rb') as f:
+            source.update(f.read())
+    return source.hexdigest()
+
+class PartCache:
+    def __init__(self, directory: str, maxBytes: int):
+        self.directory = directory
+        self.maxBytes = maxBytes
+        self.versions = {}
+        os.makedirs(directory, exist_ok=True)
+
+    # modules are everything that makes the part, spec first
+    def key(self, kind: str, values: dict, fileFormat: str, modules: list) -> str:
+        names = tuple(module.__name__ for module in modules)
+        if names not in self.versions:
+            self.versions[names] = (moduleConstants(modules), moduleSource(modules))
+        constants, source = self.versions[names]
+        part = {'kind': kind, 'values': values, 'format': fileFormat, 'constants': constants, 'source': source}
+        return hashlib.sha1(json.dumps(part, sort_keys=True).encode()).hexdigest() + '.' + fileFormat
+
+    def entry(self, key: str) -> str:
+        return os.path.join(self.directory, key[:2], key)
+
+    # Copies the cached file for key to path, if there is one
+    def fetch(self, key: str, path: str) -> bool:
+        entry = self.entry(key)
+        try:
+            shutil.copyfile(entry, path)
+            os.utime(entry)
+        except FileNotFoundError:
+            return False
+        return True
+
+    def store(self, key: str, path: str):
+        entry = self.entry(key)
+        os.makedirs(os.path.dirname(entry), exist_ok=True)
+        handle, temporary = tempfile.mkstemp(dir=os.path.dirname(entry), prefix='.', suffix='.tmp')
+        os.close(handle)
+        try:
+            shutil.copyfile(path, temporary)
+            os.replace(temporary, entry)
+        except BaseException:
+            os.remove(temporary)
+            raise
+
+    # Removes least recently used files until the rest fit in maxBytes. Returns how many went.
+    def evict(self) -> int:
+        entries = []
+        now = time.time()
+        for folder, _, names in os.walk(self.directory):
+            for name in names:
+                path = os.path.join(folder, name)
+                try:
+                    status = os.stat(path)
+                    if name.startswith('.'):
+                        if now - status.st_mtime > staleSeconds:
+                            os.remove(path)
+                        continue
+                except FileNotFoundError:
+                    continue
+                entries.append((status.st_mtime, status.st_size, path))
+        total = sum(size for _, size, _ in entries)
+        evicted = 0
+        for _, size, path in sorted(entries):
+            if total <= self.maxBytes:
+                break
+            try:
+                os.remove(path)
+            except FileNotFoundError:
+                pass
+            total -= size
+            evicted += 1
+        return evicted
@@ -0,0 +1,48 @@
+#!/usr/bin/env python3
+#Description- Copies the modules in shared/ into every add-in, or checks the copies are current
+#
+# Usage: python tools/vendor_shared.py [--check]
+#
+# Fusion loads each add-in from its own folder, and copy-to-scripts-dir.sh installs them one folder
+# at a time, so an add-in can only import what's inside it. The modules both add-ins use live once
+# in shared/ and are copied in byte for byte; edit them there and rerun this. --check copies
+# nothing, lists every copy that differs from shared/, and exits 1 if there are any.
+
+import argparse
+import os
+import shutil
+import sys
+
+HERE = os.path.dirname(os.path.abspath(__file__))
+ROOT = os.path.dirname(HERE)
+SHARED = os.path.join(ROOT, 'shared')
+ADDINS = ['GridFinityDividerBoxMaker', 'RemoteHolsterMaker']
+
+def read(path: str) -> bytes:
+    try:
+        with open(path, 'rb') as f:
+            return f.read()
+    except FileNotFoundError:
+        return None
+
+# (shared module, its copy) for every module in every add-in
+def copies() -> list:
+    modules = sorted(name for name in os.listdir(SHARED) if name.endswith('.py'))
+    return [(os.path.join(SHARED, name), os.path.join(ROOT, addin, name)) for addin in ADDINS for name in modules]
+
+def main():
+    parser = argparse.ArgumentParser(description='Copy shared/ into every add-in')
+    parser.add_argument('--check', action='store_true', help='only report copies that differ from shared/')
+    options = parser.parse_args()
+
+    stale = [(source, copy) for source, copy in copies() if read(source) != read(copy)]
+    for source, copy in stale:
+        if options.check:
+            print('{} differs from {}'.format(os.path.relpath(copy, ROOT), os.path.relpath(source, ROOT)), file=sys.stderr)
+        else:
+            shutil.copyfile(source, copy)
+            print('copied {}'.format(os.path.relpath(copy, ROOT)))
+    return 1 if options.check and stale else 0
+
+if __name__ == '__main__':
+    sys.exit(main())